@@ -32,39 +32,52 @@ def health_check():
     """Health check endpoint."""
     return jsonify({"status": "ok", "message": "Saudi AI Contracts system is running"})
 
-@app.route('/api/analyze', methods=['POST'])
-def analyze_contract():
+def _save_uploaded_file():
     """
-    Analyze a contract document.
+    Validate and save the contract file of the current request.
     
-    Expects a multipart/form-data request with:
-    - file: The contract document file
-    - contract_type: (Optional) The type of contract
+    Returns:
+        tuple: (file_path, None) on success, or (None, error_response)
     """
     # Check if file is present in request
     if 'file' not in request.files:
-        return jsonify({"error": "No file provided"}), 400
+        return None, (jsonify({"error": "No file provided"}), 400)
     
     file = request.files['file']
     
     # Check if filename is empty
     if file.filename == '':
-        return jsonify({"error": "No file selected"}), 400
+        return None, (jsonify({"error": "No file selected"}), 400)
     
     # Check file extension
     allowed_extensions = API_SETTINGS["allowed_file_types"]
     file_extension = os.path.splitext(file.filename)[1].lower()[1:]  # Remove the dot
     
     if file_extension not in allowed_extensions:
-        return jsonify({
+        return None, (jsonify({
             "error": f"File type not supported. Allowed types: {', '.join(allowed_extensions)}"
-        }), 400
+        }), 400)
     
     # Save the file
     filename = secure_filename(file.filename)
     file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     file.save(file_path)
     
+    return file_path, None
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze_contract():
+    """
+    Analyze a contract document.
+    
+    Expects a multipart/form-data request with:
+    - file: The contract document file
+    - contract_type: (Optional) The type of contract
+    """
+    file_path, error = _save_uploaded_file()
+    if error:
+        return error
+    
     # Get contract type if provided
     contract_type = request.form.get('contract_type')
     
@@ -92,6 +105,31 @@ def analyze_contract():
         if os.path.exists(file_path):
             os.remove(file_path)
 
+@app.route('/api/triage', methods=['POST'])
+def triage_contract():
+    """
+    Detect the type and language of a contract without a full analysis.
+    
+    Expects a multipart/form-data request with:
+    - file: The contract document file
+    """
+    file_path, error = _save_uploaded_file()
+    if error:
+        return error
+    
+    try:
+        results = system.triage_contract(file_path)
+        return jsonify({"success": True, **results})
+    
+    except Exception as e:
+        logger.error(f"Error triaging contract: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+    
+    finally:
+        # Clean up the uploaded file
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
 @app.route('/api/reports/<filename>', methods=['GET'])
 def get_report(filename):
     """
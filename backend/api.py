@@ -2,6 +2,7 @@ from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 import os
 import shutil
@@ -12,11 +13,13 @@ from contract_analyzer import ContractAnalyzer
 # إنشاء مجلدات للملفات المرفوعة والتقارير إذا لم تكن موجودة
 UPLOAD_DIR = "uploads"
 REPORTS_DIR = "reports"
+# ذاكرة التخزين المؤقت في مجلد الواجهة الخلفية مهما كان مجلد التشغيل
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
 # إنشاء محلل العقود
-analyzer = ContractAnalyzer(upload_dir=UPLOAD_DIR)
+analyzer = ContractAnalyzer(upload_dir=UPLOAD_DIR, cache_dir=CACHE_DIR)
 
 app = FastAPI(
     title="Saudi AI Contracts API",
@@ -80,8 +83,10 @@ async def upload_contract(
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
         
-        # تحليل العقد مباشرة
-        analysis_result = analyzer.analyze_contract(file_id, contract_type.value)
+        # تسجيل الملف في فهرس المحلل ثم تحليله مباشرة
+        analyzer.register_file(file_id, file_path)
+        # التحليل في مجموعة خيوط منفصلة حتى لا تتعطل حلقة الأحداث أثناء الاستخراج
+        analysis_result = await run_in_threadpool(analyzer.analyze_contract, file_id, contract_type.value)
         
         # إرجاع نتائج التحليل
         return {
@@ -111,7 +116,7 @@ async def get_analysis_result(file_id: str, contract_type: Optional[ContractType
     try:
         # تحليل العقد
         contract_type_value = contract_type.value if contract_type else None
-        analysis_result = analyzer.analyze_contract(file_id, contract_type_value)
+        analysis_result = await run_in_threadpool(analyzer.analyze_contract, file_id, contract_type_value)
         
         return analysis_result
     
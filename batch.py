@@ -0,0 +1,273 @@
+"""
+Batch analysis module for the Saudi AI Contracts system.
+
+Compliance sweeps analyze thousands of archived contracts against the same
+rules. analyze_batch() compiles the rule packs once in the parent process
+and maps the legal knowledge base before the worker pool starts, so forked
+workers inherit them, and each worker builds one parser and one validator
+that it reuses for every contract it is given. Results are streamed to a
+JSONL file, one line per contract, as they complete; only a bounded number
+of contracts is in flight at a time, so memory use does not grow with the
+size of the batch.
+"""
+
+import os
+import json
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+from src.config import CONTRACT_TYPES, EXTRACTION_SETTINGS, BATCH_SETTINGS
+from src.contract_parser import ContractParser
+from src.validator import ContractValidator
+from src.normalization import PreparedText
+from src.rule_packs import current_rule_packs
+from src.legal_kb import load_legal_kb
+from src.extraction import supported_extensions
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def evaluate_contract(parser, validator, contract_path, contract_type=None, top_types=1):
+    """
+    Parse and validate one contract.
+    
+    A contract whose type is detected is scanned once for the evidence of
+    every type, and validated from the same keyword hits.
+    
+    Args:
+        parser (ContractParser): Contract parser
+        validator (ContractValidator): Contract validator
+        contract_path (str): Path to the contract document
+        contract_type (str, optional): Type of contract. If None, will be auto-detected.
+        top_types (int): Number of types to validate when the detected type is
+            ambiguous; the runner-ups are returned as "alternatives"
+            
+    Returns:
+        tuple: (contract_data, contract_type, analysis_results)
+        
+    Raises:
+        FileNotFoundError: If the contract file does not exist
+        ValueError: If the contract type is not supported
+    """
+    # Check if file exists
+    if not os.path.exists(contract_path):
+        logger.error(f"Contract file not found: {contract_path}")
+        raise FileNotFoundError(f"Contract file not found: {contract_path}")
+    
+    # Parse the contract
+    contract_data = parser.parse(contract_path)
+    
+    # Prepared once, so type detection and validation share one keyword scan
+    prepared_text = PreparedText(contract_data["text"])
+    rule_packs = current_rule_packs()
+    
+    # Auto-detect contract type if not provided, validating from the same scan
+    if contract_type is None:
+        ranking = parser.rank_contract_types(contract_data, prepared_text=prepared_text, rule_packs=rule_packs)
+        contract_type = ranking[0][0]
+        logger.info(f"Auto-detected contract type: {contract_type}")
+        analysis_results = validator.validate_ranked(contract_data, ranking, prepared_text, rule_packs, top_types)
+        return contract_data, contract_type, analysis_results
+    
+    # Validate contract type
+    if contract_type not in CONTRACT_TYPES:
+        logger.error(f"Invalid contract type: {contract_type}")
+        raise ValueError(f"Invalid contract type: {contract_type}. Supported types: {list(CONTRACT_TYPES.keys())}")
+    
+    # Validate the contract
+    analysis_results = validator.validate(contract_data, contract_type, prepared_text, rule_packs)
+    
+    return contract_data, contract_type, analysis_results
+
+def iter_contract_paths(paths):
+    """
+    Expand the paths of a batch into contract files.
+    
+    Args:
+        paths (iterable): Contract files and directories; directories are
+            searched recursively for files with a supported extension
+            
+    Yields:
+        str: Path of each contract file, directories in sorted order
+    """
+    extensions = tuple(supported_extensions())
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.join(directory, name)
+
+# Parser and validator of the current worker process, built by _init_worker
+_worker = None
+
+def _init_worker(parallel_pdf=True):
+    """
+    Build the parser and validator reused for every contract of this process.
+    
+    Args:
+        parallel_pdf (bool): Whether PDF pages may be extracted across a
+            process pool; batch workers already use every core
+    """
+    global _worker
+    if not parallel_pdf:
+        EXTRACTION_SETTINGS["pdf_workers"] = 1
+    _worker = (ContractParser(), ContractValidator())
+
+def _analyze_one(contract_path, contract_type=None, top_types=1):
+    """
+    Analyze one contract of a batch in the current worker process.
+    
+    Args:
+        contract_path (str): Path to the contract document
+        contract_type (str, optional): Type of contract. If None, will be auto-detected.
+        top_types (int): Number of types to validate for ambiguous contracts
+        
+    Returns:
+        dict: JSON-serializable batch record; failures are recorded, not raised
+    """
+    parser, validator = _worker
+    started = time.perf_counter()
+    
+    try:
+        size = os.path.getsize(contract_path)
+        _, contract_type, analysis_results = evaluate_contract(parser, validator, contract_path, contract_type, top_types)
+    except Exception as e:
+        logger.error(f"Error analyzing contract {contract_path}: {str(e)}")
+        return {
+            "path": contract_path,
+            "status": "failed",
+            "error": str(e),
+            "seconds": round(time.perf_counter() - started, 6)
+        }
+    
+    return {
+        "path": contract_path,
+        "status": "completed",
+        "contract_type": contract_type,
+        "bytes": size,
+        "seconds": round(time.perf_counter() - started, 6),
+        "analysis_results": analysis_results
+    }
+
+class BatchStats:
+    """
+    Throughput statistics of a batch, aggregated as records arrive.
+    """
+    
+    def __init__(self, workers, rules_version):
+        """
+        Start the batch clock.
+        
+        Args:
+            workers (int): Number of worker processes
+            rules_version (str): Version of the rule packs the batch started with
+        """
+        self.workers = workers
+        self.rules_version = rules_version
+        self.contracts = 0
+        self.completed = 0
+        self.failed = 0
+        self.bytes = 0
+        self.analysis_seconds = 0.0
+        self.contract_types = {}
+        self._started = time.perf_counter()
+    
+    def add(self, record):
+        """
+        Count one batch record.
+        
+        Args:
+            record (dict): Record returned by a worker
+        """
+        self.contracts += 1
+        self.analysis_seconds += record["seconds"]
+        if record["status"] == "completed":
+            self.completed += 1
+            self.bytes += record["bytes"]
+            self.contract_types[record["contract_type"]] = self.contract_types.get(record["contract_type"], 0) + 1
+        else:
+            self.failed += 1
+    
+    def to_dict(self):
+        """
+        Summarize the batch so far.
+        
+        Returns:
+            dict: Counts, elapsed time and throughput
+        """
+        elapsed = time.perf_counter() - self._started
+        return {
+            "contracts": self.contracts,
+            "completed": self.completed,
+            "failed": self.failed,
+            "contract_types": dict(self.contract_types),
+            "bytes": self.bytes,
+            "workers": self.workers,
+            "rules_version": self.rules_version,
+            "elapsed_seconds": round(elapsed, 3),
+            "contracts_per_second": round(self.contracts / elapsed, 3) if elapsed > 0 else 0.0,
+            "megabytes_per_second": round(self.bytes / (1024 * 1024) / elapsed, 3) if elapsed > 0 else 0.0,
+            "mean_contract_seconds": round(self.analysis_seconds / self.contracts, 6) if self.contracts else 0.0
+        }
+
+def analyze_batch(paths, output_path, workers=None, contract_type=None, top_types=1):
+    """
+    Analyze many contracts across a process pool, streaming results to JSONL.
+    
+    Args:
+        paths (iterable): Contract files and directories of contracts
+        output_path (str): JSONL file written with one record per contract,
+            in completion order
+        workers (int, optional): Number of worker processes; defaults to
+            BATCH_SETTINGS["workers"]
+        contract_type (str, optional): Type of every contract. If None, each
+            type is auto-detected.
+        top_types (int): Number of types to validate for ambiguous contracts
+        
+    Returns:
+        dict: Throughput statistics of the batch
+    """
+    workers = max(1, workers or BATCH_SETTINGS["workers"])
+    
+    # Compiled before the pool starts, so forked workers inherit the compiled
+    # packs and the mapping of the legal knowledge base, built here if stale
+    rule_packs = current_rule_packs()
+    load_legal_kb()
+    stats = BatchStats(workers, rule_packs.version)
+    logger.info(f"Analyzing batch with {workers} workers (rules version {rule_packs.version})")
+    
+    with open(output_path, 'w', encoding='utf-8') as output:
+        def write(record):
+            output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            stats.add(record)
+        
+        # A single worker is not worth the process pool start-up cost
+        if workers == 1:
+            _init_worker()
+            for contract_path in iter_contract_paths(paths):
+                write(_analyze_one(contract_path, contract_type, top_types))
+        else:
+            max_pending = workers * BATCH_SETTINGS["pending_per_worker"]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(False,)) as executor:
+                pending = set()
+                for contract_path in iter_contract_paths(paths):
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            write(future.result())
+                    pending.add(executor.submit(_analyze_one, contract_path, contract_type, top_types))
+                
+                for future in as_completed(pending):
+                    write(future.result())
+    
+    summary = stats.to_dict()
+    logger.info(
+        f"Batch completed: {summary['completed']} of {summary['contracts']} contracts in "
+        f"{summary['elapsed_seconds']}s ({summary['contracts_per_second']} contracts/s)"
+    )
+    return summary
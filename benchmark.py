@@ -0,0 +1,163 @@
+"""
+Benchmarks for the Saudi AI Contracts system.
+
+Run with: python -m src.benchmark [--size-mb N]
+"""
+
+import sys
+import time
+import logging
+import argparse
+import tracemalloc
+
+from src.normalization import PreparedText
+from src.rule_packs import current_rule_packs
+from src.validation_rules import ValidationRules
+from src.analyzer import ContractAnalyzer
+from src.sections import segment_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Full-text copies PreparedText may make: the normalized and casefolded views
+MAX_PREPARED_ALLOCATIONS = 2
+
+# Peak traced memory allowed while validating, in multiples of the text size
+MAX_PEAK_RATIO = 4
+
+SAMPLE_CLAUSES = [
+    "المادة {n}: يلتزم صاحب العمل بدفع الراتب الشهري للموظف وقدره ١٠٠٠٠ ريال.\n",
+    "Article {n}: The employee shall work 8 hours per day and is entitled to 21 days of annual leave.\n",
+    "تُحدَّد فترة التجربة بتسعين يوماً، ويلتزم الطرفان بفترة الإشعار عند إنهاء العقد.\n",
+    "The landlord shall register this lease on the Ejar platform; the security deposit is 5%.\n"
+]
+
+def build_sample_contract(size_bytes):
+    """
+    Build a synthetic bilingual contract of about size_bytes UTF-8 bytes.
+    
+    Args:
+        size_bytes (int): Target size
+        
+    Returns:
+        str: Contract text
+    """
+    clauses = []
+    size = 0
+    n = 1
+    while size < size_bytes:
+        clause = SAMPLE_CLAUSES[n % len(SAMPLE_CLAUSES)].format(n=n)
+        clauses.append(clause)
+        size += len(clause.encode('utf-8'))
+        n += 1
+    return "".join(clauses)
+
+def benchmark_prepared_text(size_bytes):
+    """
+    Validate a synthetic contract as every contract type and check allocations.
+    
+    Every rule of every contract type reads the same PreparedText, so the
+    normalized and casefolded views must each be built only once.
+    
+    Args:
+        size_bytes (int): Size of the synthetic contract
+        
+    Returns:
+        dict: Timing, allocation and peak memory figures
+    """
+    contract_text = build_sample_contract(size_bytes)
+    contract_sections = segment_text(contract_text)
+    analyzer = ContractAnalyzer()
+    contract_data = {"text": contract_text, "sections": contract_sections}
+    
+    def validate_all():
+        prepared_text = PreparedText(contract_text)
+        # The analyzer runs every rule of the type; without legal rules, run them directly
+        for contract_type in ("employment", "rental", "sales", "partnership"):
+            if contract_type in analyzer.legal_rules:
+                analyzer.analyze(contract_data, contract_type, prepared_text)
+            else:
+                ValidationRules.validate(contract_type, prepared_text, contract_sections)
+        return prepared_text
+    
+    # Timed without tracing: tracemalloc slows every allocation, e.g. the
+    # per-character loop of the keyword scan, by an order of magnitude
+    start = time.perf_counter()
+    validate_all()
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    prepared_text = validate_all()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    text_bytes = sys.getsizeof(contract_text)
+    results = {
+        "size_bytes": size_bytes,
+        "seconds": round(elapsed, 3),
+        "prepared_allocations": prepared_text.allocations,
+        "peak_bytes": peak,
+        "peak_ratio": round(peak / text_bytes, 2)
+    }
+    
+    assert prepared_text.allocations <= MAX_PREPARED_ALLOCATIONS, results
+    assert peak <= MAX_PEAK_RATIO * text_bytes, results
+    
+    return results
+
+def _find_all(keywords, text):
+    """Offsets of every occurrence of every keyword, found with one str.find() loop per keyword."""
+    offsets = {}
+    for keyword in keywords:
+        position = text.find(keyword)
+        while position != -1:
+            offsets.setdefault(keyword, []).append(position)
+            position = text.find(keyword, position + 1)
+    return offsets
+
+def benchmark_keyword_scan(size_bytes):
+    """
+    Time one keyword index scan against a str.find() loop per keyword.
+    
+    Both report every occurrence of every keyword of the rule packs. The scan
+    walks the text once, while the loops walk it once per keyword.
+    
+    Args:
+        size_bytes (int): Size of the synthetic contract
+        
+    Returns:
+        dict: Timing figures
+    """
+    index = current_rule_packs().index
+    text = PreparedText(build_sample_contract(size_bytes)).casefolded
+    
+    start = time.perf_counter()
+    hits = index.scan(text)
+    scan_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    offsets = _find_all(index.keywords, text)
+    find_seconds = time.perf_counter() - start
+    
+    assert all(list(hits.offsets(keyword)) == offsets.get(keyword, []) for keyword in index.keywords)
+    
+    return {
+        "keywords": len(index),
+        "keyword_scan_seconds": round(scan_seconds, 3),
+        "keyword_find_seconds": round(find_seconds, 3),
+        "keyword_scan_speedup": round(find_seconds / scan_seconds, 2)
+    }
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Saudi AI Contracts - Benchmarks")
+    parser.add_argument("--size-mb", type=float, default=1.0, help="Size of the synthetic contract in MB")
+    args = parser.parse_args()
+    
+    size_bytes = int(args.size_mb * 1024 * 1024)
+    results = {**benchmark_prepared_text(size_bytes), **benchmark_keyword_scan(size_bytes)}
+    for name, value in results.items():
+        print(f"{name}: {value}")
+
+if __name__ == "__main__":
+    main()
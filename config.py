@@ -56,9 +56,52 @@ NLP_SETTINGS = {
     "section_markers": {
         "arabic": ["المادة", "البند", "الفقرة", "الفصل"],
         "english": ["article", "section", "clause", "chapter"]
+    },
+    "type_detection": {
+        # A runner-up type scoring at least this fraction of the best score makes a document ambiguous
+        "ambiguity_ratio": 0.75
+    },
+    "quantities": {
+        # Maximum characters between a threshold rule's anchor term and the quantity it governs
+        "anchor_window": 200
     }
 }
 
+# Text extraction settings
+EXTRACTION_SETTINGS = {
+    "pdf_workers": os.cpu_count() or 1,  # Process pool size for PDF page extraction
+    "parallel_min_pages": 32,  # PDFs with fewer pages are extracted serially
+    "txt_mmap_threshold": 64 * 1024 * 1024,  # TXT files this large are decoded from a memory map
+    "triage_pages": 3  # Pages read when only the contract type and language are needed
+}
+
+# Sandboxed extraction settings (the sandbox extracts PDF pages serially)
+SANDBOX_SETTINGS = {
+    "enabled": False,
+    "timeout_seconds": 60,
+    "max_pages": 1000,
+    "max_memory_bytes": 1024 * 1024 * 1024
+}
+
+# Extraction cache settings
+CACHE_SETTINGS = {
+    "enabled": True,
+    "directory": os.path.join(BASE_DIR, "cache", "extraction"),
+    "max_size_bytes": 512 * 1024 * 1024
+}
+
+# Legal knowledge base settings
+LEGAL_KB_SETTINGS = {
+    # Compiled from LEGAL_REFERENCES by python -m src.legal_kb, or on first use
+    "path": os.path.join(BASE_DIR, "cache", "legal_kb.bin")
+}
+
+# Batch analysis settings
+BATCH_SETTINGS = {
+    "workers": os.cpu_count() or 1,  # Process pool size for batch analysis
+    "pending_per_worker": 4  # Contracts queued per worker; bounds memory on large batches
+}
+
 # Report settings
 REPORT_SETTINGS = {
     "output_format": "html",  # Options: pdf, html, txt
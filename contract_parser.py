@@ -3,21 +3,193 @@ Modified contract parser module for the Saudi AI Contracts system.
 """
 
 import os
-import re
 import logging
-import PyPDF2
-from datetime import datetime
-import langdetect
-from langdetect import detect
+import difflib
+from bisect import bisect_left
+from collections.abc import Mapping
 import nltk
-from nltk.tokenize import word_tokenize
 
-from src.config import CONTRACT_TYPES, NLP_SETTINGS
+from src.config import CONTRACT_TYPES, EXTRACTION_SETTINGS, CACHE_SETTINGS, SANDBOX_SETTINGS
+from src.extraction import (
+    ExtractionCache,
+    SandboxedExtraction,
+    iter_text,
+    open_text_source,
+    text_fingerprint,
+    page_fingerprints,
+    extract_pages
+)
+from src.sections import SectionTree, iter_section_spans, segment_text
+from src.metadata import extract_metadata
+from src.language_detector import detect_language, detect_section_languages
+from src.normalization import PreparedText
+from src.rule_packs import current_rule_packs
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Version of the parser output; bump to invalidate cached extraction results
+PARSER_VERSION = "8"
+
+# Number of leading characters used for language detection before the whole text is read
+LANGUAGE_SAMPLE_SIZE = 1000
+
+class ParsedContract(Mapping):
+    """
+    Parsed contract whose fields are computed on first access.
+    
+    Behaves as a read-only dict with the same keys as ContractParser.parse()
+    results. Pages are pulled from the extractor only as far as needed, so
+    language and contract type detection on the first pages do not pay for
+    extracting the whole document.
+    """
+    
+    FIELDS = ("file_path", "text", "language", "metadata", "sections", "section_languages", "truncated", "page_index")
+    
+    def __init__(self, parser, file_path, pages, values=None):
+        """
+        Initialize the lazy parse result.
+        
+        Args:
+            parser (ContractParser): Parser providing the analysis stages
+            file_path (str): Path to the contract document
+            pages (iterable): Page texts, e.g. a SandboxedExtraction
+            values (dict, optional): Fields that are already known
+        """
+        self._parser = parser
+        self._source = pages
+        self._pages_iter = iter(pages)
+        self._pages = []
+        self._values = {"file_path": file_path}
+        if values:
+            self._values.update(values)
+    
+    def _read_pages(self, count=None):
+        """Pull pages from the extractor until count pages are available, or all of them."""
+        while self._pages_iter is not None and (count is None or len(self._pages) < count):
+            page_text = next(self._pages_iter, None)
+            if page_text is None:
+                self._pages_iter = None
+            else:
+                self._pages.append(page_text)
+    
+    def head(self, max_pages):
+        """
+        Get the text of the first pages without extracting the rest.
+        
+        Args:
+            max_pages (int): Number of pages
+            
+        Returns:
+            str: Text of up to max_pages pages
+        """
+        self._read_pages(max_pages)
+        return "".join(self._pages[:max_pages])
+    
+    def _sample(self, size):
+        """Get the first size characters, reading as few pages as possible."""
+        if "text" in self._values:
+            return self._values["text"][:size]
+        
+        sample = ""
+        index = 0
+        while len(sample) < size:
+            self._read_pages(index + 1)
+            if index >= len(self._pages):
+                break
+            sample += self._pages[index][:size - len(sample)]
+            index += 1
+        return sample
+    
+    @property
+    def file_path(self):
+        return self._values["file_path"]
+    
+    @property
+    def text(self):
+        if "text" not in self._values:
+            self._read_pages()
+            self._values["text"] = "".join(self._pages)
+        return self._values["text"]
+    
+    @property
+    def page_index(self):
+        """List of [fingerprint, end offset] pairs, one per page, used by ContractParser.reparse()."""
+        if "page_index" not in self._values:
+            text = self.text
+            page_texts = self._pages if self._pages else [text]
+            
+            # Content-stream fingerprints let a revision be compared before extracting it
+            fingerprints = page_fingerprints(self.file_path) if not self.truncated else None
+            if fingerprints is None or len(fingerprints) != len(page_texts):
+                fingerprints = [text_fingerprint(page_text) for page_text in page_texts]
+            
+            page_index = []
+            end = 0
+            for fingerprint, page_text in zip(fingerprints, page_texts):
+                end += len(page_text)
+                page_index.append([fingerprint, end])
+            self._values["page_index"] = page_index
+        return self._values["page_index"]
+    
+    @property
+    def language(self):
+        if "language" not in self._values:
+            # Sample the whole document once it has been read, otherwise only its first pages
+            if "text" in self._values:
+                sample = self._values["text"]
+            else:
+                sample = self._sample(LANGUAGE_SAMPLE_SIZE)
+            self._values["language"] = self._parser._detect_language(sample)
+        return self._values["language"]
+    
+    @property
+    def metadata(self):
+        if "metadata" not in self._values:
+            self._values["metadata"] = self._parser._extract_metadata(self.text, self.language)
+        return self._values["metadata"]
+    
+    @property
+    def sections(self):
+        if "sections" not in self._values:
+            self._values["sections"] = self._parser._segment_text(self.text)
+        return self._values["sections"]
+    
+    @property
+    def section_languages(self):
+        if "section_languages" not in self._values:
+            self._values["section_languages"] = self._parser._detect_section_languages(self.text, self.sections)
+        return self._values["section_languages"]
+    
+    @property
+    def truncated(self):
+        if "truncated" not in self._values:
+            # Only known once the extractor has been drained
+            self.text
+            self._values["truncated"] = getattr(self._source, "truncated", False)
+        return self._values["truncated"]
+    
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(self.FIELDS)
+    
+    def __len__(self):
+        return len(self.FIELDS)
+    
+    def to_dict(self):
+        """
+        Compute every field and return them as a plain dict.
+        
+        Returns:
+            dict: Parsed contract data
+        """
+        return {field: self[field] for field in self.FIELDS}
+
 class ContractParser:
     """
     Parser for extracting and analyzing contract text.
@@ -32,6 +204,14 @@ class ContractParser:
             nltk.data.find('tokenizers/punkt')
         except LookupError:
             nltk.download('punkt')
+        
+        self.cache = None
+        if CACHE_SETTINGS["enabled"]:
+            self.cache = ExtractionCache(
+                CACHE_SETTINGS["directory"],
+                CACHE_SETTINGS["max_size_bytes"],
+                f"parser{PARSER_VERSION}"
+            )
     
     def parse(self, file_path):
         """
@@ -50,106 +230,269 @@ class ContractParser:
             logger.error(f"File not found: {file_path}")
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        # Extract text based on file type
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        if file_extension == '.pdf':
-            contract_text = self._extract_text_from_pdf(file_path)
-        elif file_extension == '.docx':
-            contract_text = self._extract_text_from_docx(file_path)
-        elif file_extension == '.txt':
-            contract_text = self._extract_text_from_txt(file_path)
+        # Reuse a previous parse of the same document bytes
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(file_path)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached extraction for: {file_path}")
+                return {"file_path": file_path, **self._from_cache(cached)}
+        
+        text_source = self.open_text_source(file_path)
+        
+        if text_source is not None:
+            # Large text files are decoded in full, straight from the memory map,
+            # and every stage runs over the decoded text
+            with text_source:
+                contract_text = text_source.decode()
+                language = self._detect_language(contract_text)
+                metadata = self._extract_metadata(contract_text, language)
+                sections = self._segment_text(contract_text)
+                section_languages = self._detect_section_languages(contract_text, sections)
+                truncated = False
+                page_index = []
         else:
-            logger.error(f"Unsupported file type: {file_extension}")
-            raise ValueError(f"Unsupported file type: {file_extension}")
+            # Consume the page stream once and run every stage over the result
+            parsed_contract = ParsedContract(self, file_path, self._open_pages(file_path))
+            contract_text = parsed_contract.text
+            language = parsed_contract.language
+            metadata = parsed_contract.metadata
+            sections = parsed_contract.sections
+            section_languages = parsed_contract.section_languages
+            truncated = parsed_contract.truncated
+            page_index = parsed_contract.page_index
+        
+        parsed = {
+            "text": contract_text,
+            "language": language,
+            "metadata": metadata,
+            "sections": sections,
+            "section_languages": section_languages,
+            "truncated": truncated,
+            "page_index": page_index
+        }
         
-        # Detect language
-        language = self._detect_language(contract_text)
+        # Partial extractions may succeed next time, so they are not cached
+        if cache_key is not None and not truncated:
+            self.cache.put(cache_key, {**parsed, "sections": sections.to_list()})
+        
+        # Return parsed data
+        return {"file_path": file_path, **parsed}
+    
+    def reparse(self, file_path, previous):
+        """
+        Parse a revised version of a contract, reusing a previous parse.
         
-        # Extract metadata
-        metadata = self._extract_metadata(contract_text, language)
+        Pages are compared by fingerprint, so for PDF files only new or edited
+        pages are extracted. Sections are re-segmented only in the window of
+        the text that changed, widened to the boundaries of the sections it
+        touches; sections outside it are carried over from the previous parse.
         
-        # Segment sections
-        sections = self._segment_text(contract_text)
+        Args:
+            file_path (str): Path to the revised contract document
+            previous (dict): Previous parse result, with its page_index
+            
+        Returns:
+            dict: Parsed contract data
+        """
+        logger.info(f"Re-parsing revised contract: {file_path}")
+        
+        old_text = previous["text"]
+        old_index = previous.get("page_index")
+        if not old_index:
+            return self.parse(file_path)
+        
+        # Cut the previous text into pages by their recorded end offsets
+        old_fingerprints = [fingerprint for fingerprint, _ in old_index]
+        old_starts = [0] + [end for _, end in old_index[:-1]]
+        old_pages = {}
+        for fingerprint, start, (_, end) in zip(old_fingerprints, old_starts, old_index):
+            old_pages.setdefault(fingerprint, old_text[start:end])
+        
+        new_fingerprints = page_fingerprints(file_path)
+        if new_fingerprints is not None:
+            # Extract only the pages that do not appear in the previous version
+            changed = [i for i, fingerprint in enumerate(new_fingerprints) if fingerprint not in old_pages]
+            extracted = extract_pages(file_path, changed) if changed else {}
+            page_texts = [
+                extracted[i] if i in extracted else old_pages[fingerprint]
+                for i, fingerprint in enumerate(new_fingerprints)
+            ]
+            logger.info(f"Re-extracted {len(changed)} of {len(new_fingerprints)} pages")
+        else:
+            page_texts = list(self.iter_pages(file_path))
+            new_fingerprints = [text_fingerprint(page_text) for page_text in page_texts]
+        
+        contract_text = "".join(page_texts)
+        page_index = []
+        end = 0
+        for fingerprint, page_text in zip(new_fingerprints, page_texts):
+            end += len(page_text)
+            page_index.append([fingerprint, end])
+        
+        # Character range of the edit, in old and new offsets
+        old_ends = [end for _, end in old_index]
+        new_ends = [end for _, end in page_index]
+        old_change = None
+        new_change = None
+        matcher = difflib.SequenceMatcher(None, old_fingerprints, new_fingerprints, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            old_span = (old_ends[i1 - 1] if i1 else 0, old_ends[i2 - 1] if i2 else 0)
+            new_span = (new_ends[j1 - 1] if j1 else 0, new_ends[j2 - 1] if j2 else 0)
+            if old_change is None:
+                old_change, new_change = old_span, new_span
+            else:
+                old_change = (old_change[0], old_span[1])
+                new_change = (new_change[0], new_span[1])
         
-        # Return parsed data
-        return {
+        parsed = {
             "file_path": file_path,
             "text": contract_text,
-            "language": language,
-            "metadata": metadata,
-            "sections": sections
+            "language": previous["language"],
+            "metadata": previous["metadata"],
+            "sections": SectionTree(contract_text, previous["sections"].headers()),
+            "section_languages": previous["section_languages"],
+            "truncated": False,
+            "page_index": page_index
         }
+        
+        if old_change is None:
+            return parsed
+        
+        parsed["language"] = self._detect_language(contract_text)
+        parsed["metadata"] = self._extract_metadata(contract_text, parsed["language"])
+        parsed["sections"] = self._resegment(previous["sections"], contract_text, old_change)
+        parsed["section_languages"] = self._detect_section_languages(contract_text, parsed["sections"])
+        
+        return parsed
     
-    def _extract_text_from_pdf(self, file_path):
+    def _resegment(self, old_sections, new_text, old_change):
         """
-        Extract text from a PDF file.
+        Update a section tree after an edit, re-segmenting only the affected window.
+        
+        The window runs from the header of the section the edit starts in, or
+        of the section that ends where the edit starts, since appending to a
+        section moves its body end, to the first header after the edit;
+        headers outside it are kept, shifted by the change in length.
         
         Args:
-            file_path (str): Path to the PDF file
+            old_sections (SectionTree): Sections of the previous text
+            new_text (str): Revised contract text
+            old_change (tuple): (start, end) of the edited range in the previous text
             
         Returns:
-            str: Extracted text
+            SectionTree: Sections of the revised text
         """
-        try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {str(e)}")
-            raise
+        headers = old_sections.headers()
+        starts = [header[3] for header in headers]
+        change_start, change_end = old_change
+        
+        # An edit starting right at a header may change the body end of the section before it
+        first = bisect_left(starts, change_start) - 1
+        last = bisect_left(starts, change_end)
+        window_start = starts[first] if first >= 0 else 0
+        window_end = starts[last] if last < len(starts) else len(old_sections.text)
+        delta = len(new_text) - len(old_sections.text)
+        
+        kept_before = headers[:max(first, 0)]
+        resegmented = list(iter_section_spans(new_text, window_start, window_end + delta))
+        shifted_after = [
+            (level, title_start + delta, title_end + delta, start + delta, body_end + delta)
+            for level, title_start, title_end, start, body_end in headers[last:]
+        ]
+        
+        return SectionTree(new_text, kept_before + resegmented + shifted_after)
+    
+    def _from_cache(self, cached):
+        """Rebuild parse results read from the extraction cache."""
+        return {**cached, "sections": SectionTree.from_list(cached["text"], cached["sections"])}
     
-    def _extract_text_from_docx(self, file_path):
+    def parse_lazy(self, file_path):
         """
-        Extract text from a DOCX file.
+        Parse a contract document lazily.
+        
+        Nothing is extracted until a field is accessed, and language or type
+        detection only reads the first pages of the document.
         
         Args:
-            file_path (str): Path to the DOCX file
+            file_path (str): Path to the contract document
             
         Returns:
-            str: Extracted text
+            ParsedContract: Lazily computed parsed contract data
         """
-        try:
-            import docx
-            doc = docx.Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
-        except Exception as e:
-            logger.error(f"Error extracting text from DOCX: {str(e)}")
-            raise
+        logger.info(f"Lazily parsing contract: {file_path}")
+        
+        # Check if file exists
+        if not os.path.exists(file_path):
+            logger.error(f"File not found: {file_path}")
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        if self.cache is not None:
+            cached = self.cache.get(self.cache.key_for(file_path))
+            if cached is not None:
+                logger.info(f"Using cached extraction for: {file_path}")
+                cached = self._from_cache(cached)
+                return ParsedContract(self, file_path, iter([cached["text"]]), cached)
+        
+        return ParsedContract(self, file_path, self._open_pages(file_path))
     
-    def _extract_text_from_txt(self, file_path):
+    def _open_pages(self, file_path):
         """
-        Extract text from a TXT file.
+        Open the page stream of a document, sandboxed if configured.
         
         Args:
-            file_path (str): Path to the TXT file
+            file_path (str): Path to the contract document
             
         Returns:
-            str: Extracted text
+            iterable: Page texts; a SandboxedExtraction reports truncation
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-            return text
-        except UnicodeDecodeError:
-            # Try with different encodings
-            encodings = ['latin-1', 'cp1256', 'utf-16']
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as file:
-                        text = file.read()
-                    return text
-                except UnicodeDecodeError:
-                    continue
+        if SANDBOX_SETTINGS["enabled"]:
+            return SandboxedExtraction(
+                file_path,
+                SANDBOX_SETTINGS["timeout_seconds"],
+                SANDBOX_SETTINGS["max_pages"],
+                SANDBOX_SETTINGS["max_memory_bytes"],
+                EXTRACTION_SETTINGS
+            )
+        return self.iter_pages(file_path)
+    
+    def open_text_source(self, file_path):
+        """
+        Memory-map a large UTF-8 text file so it is decoded without a bytes copy.
+        
+        Args:
+            file_path (str): Path to the contract document
             
-            logger.error("Failed to decode text file with multiple encodings")
+        Returns:
+            MappedText: Mapped text source, or None if the file should be
+            extracted normally (not TXT, below the size threshold, or not UTF-8)
+        """
+        return open_text_source(file_path, EXTRACTION_SETTINGS)
+    
+    def iter_pages(self, file_path):
+        """
+        Stream the text of a contract document page by page.
+        
+        PDF files are yielded one page at a time as they are read, so callers
+        only hold a window of pages in memory. DOCX files are yielded one
+        paragraph or table row at a time, and TXT files as a single block.
+        
+        Args:
+            file_path (str): Path to the contract document
+            
+        Yields:
+            str: Text of each page
+        """
+        try:
+            yield from iter_text(file_path, EXTRACTION_SETTINGS)
+        except ValueError as e:
+            logger.error(str(e))
             raise
         except Exception as e:
-            logger.error(f"Error extracting text from TXT: {str(e)}")
+            logger.error(f"Error extracting text from {file_path}: {str(e)}")
             raise
     
     def _detect_language(self, text):
@@ -160,23 +503,22 @@ class ContractParser:
             text (str): Contract text
             
         Returns:
-            str: Detected language code
+            str: Detected language code ("ar", "en" or "mixed")
         """
-        try:
-            # Use a sample of the text for faster detection
-            sample = text[:1000]
-            lang = detect(sample)
+        return detect_language(text)
+    
+    def _detect_section_languages(self, text, sections):
+        """
+        Detect the language of each section.
+        
+        Args:
+            text (str): Contract text
+            sections (SectionTree): Sections of the contract
             
-            # Map to our supported languages
-            if lang in NLP_SETTINGS["language_detection"]["arabic"]:
-                return "ar"
-            elif lang in NLP_SETTINGS["language_detection"]["english"]:
-                return "en"
-            else:
-                return lang
-        except langdetect.LangDetectException:
-            logger.warning("Language detection failed, defaulting to English")
-            return "en"
+        Returns:
+            list: Language code of each section, in document order
+        """
+        return detect_section_languages(text, [(start, body_end) for _, _, _, start, body_end in sections.headers()])
     
     def _extract_metadata(self, text, language):
         """
@@ -189,42 +531,7 @@ class ContractParser:
         Returns:
             dict: Extracted metadata
         """
-        metadata = {
-            "date": None,
-            "parties": [],
-            "contract_type": None
-        }
-        
-        # Extract date
-        date_patterns = [
-            r'\d{2}/\d{2}/\d{4}',  # DD/MM/YYYY
-            r'\d{2}-\d{2}-\d{4}',  # DD-MM-YYYY
-            r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}',  # DD Month YYYY
-            r'\d{1,2}\s+(?:يناير|فبراير|مارس|أبريل|مايو|يونيو|يوليو|أغسطس|سبتمبر|أكتوبر|نوفمبر|ديسمبر)\s+\d{4}'  # DD Arabic Month YYYY
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
-            if match:
-                metadata["date"] = match.group(0)
-                break
-        
-        # Extract parties
-        party_patterns = [
-            r'(?:between|بين)\s+(.+?)\s+(?:and|و)\s+(.+?)\s+(?:hereinafter|فيما يلي)',
-            r'(?:FIRST PARTY|الطرف الأول)[:\s]+(.+?)(?:\n|$)',
-            r'(?:SECOND PARTY|الطرف الثاني)[:\s]+(.+?)(?:\n|$)'
-        ]
-        
-        for pattern in party_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    metadata["parties"].extend(list(matches[0]))
-                else:
-                    metadata["parties"].extend(matches)
-        
-        return metadata
+        return extract_metadata(text)
     
     def _segment_text(self, text):
         """
@@ -234,83 +541,65 @@ class ContractParser:
             text (str): Contract text
             
         Returns:
-            dict: Segmented sections
+            SectionTree: Hierarchical section index with character offsets
         """
-        sections = {}
+        return segment_text(text)
+    
+    def rank_contract_types(self, contract_data, max_pages=None, prepared_text=None, rule_packs=None):
+        """
+        Score the evidence for every contract type from one keyword scan.
         
-        # Simple section detection based on numbering patterns
-        section_patterns = [
-            r'(\d+\.\s+.+?)(?=\n\d+\.\s+|\Z)',  # 1. Section title
-            r'(Article\s+\d+.+?)(?=Article\s+\d+|\Z)',  # Article 1: title
-            r'(المادة\s+\d+.+?)(?=المادة\s+\d+|\Z)',  # Arabic Article
-            r'(ARTICLE\s+\d+.+?)(?=ARTICLE\s+\d+|\Z)'  # ARTICLE 1: title
+        Args:
+            contract_data (dict): Parsed contract data
+            max_pages (int, optional): Only look at the first pages of a
+                ParsedContract instead of extracting the whole document
+            prepared_text (PreparedText, optional): Prepared full text, so the
+                keyword scan is shared with the validation rules
+            rule_packs (RulePacks, optional): Rule packs to score with; defaults
+                to the current ones
+            
+        Returns:
+            list: (contract_type, score) pairs, best first; ties keep the
+            order of CONTRACT_TYPES
+        """
+        if max_pages is not None and isinstance(contract_data, ParsedContract):
+            prepared_text = PreparedText(contract_data.head(max_pages))
+        elif prepared_text is None:
+            prepared_text = PreparedText(contract_data["text"])
+        rule_packs = rule_packs or current_rule_packs()
+        hits = rule_packs.keyword_hits(prepared_text)
+        
+        # Count the keywords of each type present in the text
+        scores = [
+            (contract_type, hits.count(rule_packs.section(contract_type, "detection_keywords")))
+            for contract_type in CONTRACT_TYPES
         ]
         
-        for pattern in section_patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-            if matches:
-                for i, section_text in enumerate(matches):
-                    section_title = section_text.split('\n')[0].strip()
-                    sections[section_title] = section_text.strip()
-                break
-        
-        # If no sections were found, try to split by newlines and create sections
-        if not sections:
-            lines = text.split('\n')
-            current_section = None
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Check if this looks like a section header
-                if re.match(r'^\d+\.|\bARTICLE\b|\bالمادة\b', line, re.IGNORECASE):
-                    current_section = line
-                    sections[current_section] = line
-                elif current_section:
-                    sections[current_section] += '\n' + line
-        
-        return sections
-    
-    def detect_contract_type(self, contract_data):
+        return sorted(scores, key=lambda item: item[1], reverse=True)
+    
+    def detect_contract_type(self, contract_data, max_pages=None, prepared_text=None, rule_packs=None):
         """
         Detect the type of contract.
         
         Args:
             contract_data (dict): Parsed contract data
+            max_pages (int, optional): Only look at the first pages of a
+                ParsedContract instead of extracting the whole document
+            prepared_text (PreparedText, optional): Prepared full text, so the
+                keyword scan is shared with the validation rules
+            rule_packs (RulePacks, optional): Rule packs to score with; defaults
+                to the current ones
             
         Returns:
             str: Detected contract type
         """
-        text = contract_data["text"].lower()
-        
-        # Keywords for each contract type
-        keywords = {
-            "employment": ["employment", "employee", "employer", "salary", "wage", "working hours", "عمل", "موظف", "راتب", "أجر", "ساعات العمل"],
-            "rental": ["rental", "lease", "tenant", "landlord", "property", "premises", "إيجار", "مستأجر", "مؤجر", "عقار", "مبنى"],
-            "sales": ["sales", "purchase", "buyer", "seller", "goods", "price", "بيع", "شراء", "مشتري", "بائع", "بضائع", "سعر"],
-            "partnership": ["partnership", "partner", "company", "capital", "profit", "شراكة", "شريك", "شركة", "رأس مال", "ربح"]
-        }
-        
-        # Count keyword occurrences for each type
-        scores = {contract_type: 0 for contract_type in keywords}
-        
-        for contract_type, type_keywords in keywords.items():
-            for keyword in type_keywords:
-                if keyword in text:
-                    scores[contract_type] += 1
+        ranking = self.rank_contract_types(contract_data, max_pages, prepared_text, rule_packs)
         
         # Get the contract type with the highest score
-        max_score = 0
-        detected_type = None
-        
-        for contract_type, score in scores.items():
-            if score > max_score:
-                max_score = score
-                detected_type = contract_type
+        detected_type, max_score = ranking[0]
         
         # If no clear type is detected, default to the first type
-        if not detected_type or max_score == 0:
+        if max_score == 0:
             logger.warning("Could not detect contract type, defaulting to employment")
             return "employment"
         
@@ -0,0 +1,22 @@
+"""
+Shared text extraction package for the Saudi AI Contracts system.
+"""
+
+from .registry import (
+    MIME_PDF,
+    MIME_DOCX,
+    MIME_TEXT,
+    DEFAULT_SETTINGS,
+    register_extractor,
+    supported_extensions,
+    detect_mime_type,
+    iter_text,
+    extract_text,
+    text_fingerprint,
+    page_fingerprints,
+    extract_pages,
+    open_text_source
+)
+from .cache import ExtractionCache
+from .mapped_text import MappedText
+from .sandbox import SandboxedExtraction, extract_text_sandboxed
@@ -0,0 +1,185 @@
+"""
+Extraction cache module for the Saudi AI Contracts system.
+
+Stores the results of text extraction on disk, keyed by the SHA-256 of the
+file bytes and the version of the extractor that produced them, so that a
+document that has already been seen is never decoded twice.
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import logging
+import tempfile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Size of the blocks read while hashing a file
+HASH_BLOCK_SIZE = 1024 * 1024
+
+class ExtractionCache:
+    """
+    Size-bounded, least-recently-used on-disk cache of extraction results.
+    
+    Entries are zlib-compressed JSON documents. An entry's modification time
+    is refreshed on every hit, and the oldest entries are evicted once the
+    cache directory grows beyond its size limit. The total size is tracked
+    as entries are written, so the directory is only scanned when the limit
+    is exceeded; each scan also picks up entries written by other processes.
+    """
+    
+    def __init__(self, cache_dir, max_size_bytes, version):
+        """
+        Initialize the extraction cache.
+        
+        Args:
+            cache_dir (str): Directory holding the cache entries
+            max_size_bytes (int): Maximum total size of the cache entries
+            version (str): Version of the extractor whose output is cached
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.version = version
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Total size of the entries, measured by the first eviction scan
+        self._total_size = None
+    
+    @staticmethod
+    def hash_file(file_path):
+        """
+        Compute the SHA-256 digest of a file's bytes.
+        
+        Args:
+            file_path (str): Path to the file
+        
+        Returns:
+            str: Hex digest of the file contents
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def key_for(self, file_path):
+        """
+        Build the cache key of a file for the current extractor version.
+        
+        Args:
+            file_path (str): Path to the file
+        
+        Returns:
+            str: Cache key
+        """
+        return f"{self.version}-{self.hash_file(file_path)}"
+    
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json.z")
+    
+    def get(self, key):
+        """
+        Look up a cached extraction result.
+        
+        Args:
+            key (str): Cache key returned by key_for()
+        
+        Returns:
+            dict: Cached data, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as file:
+                data = json.loads(zlib.decompress(file.read()).decode('utf-8'))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Discarding unreadable cache entry {entry_path}: {str(e)}")
+            self._remove(entry_path)
+            return None
+        
+        # Refresh the entry's position in the LRU order
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        
+        return data
+    
+    def put(self, key, data):
+        """
+        Store an extraction result and evict old entries if needed.
+        
+        Args:
+            key (str): Cache key returned by key_for()
+            data (dict): JSON-serializable extraction result
+        """
+        payload = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        
+        if len(payload) > self.max_size_bytes:
+            logger.info(f"Not caching {key}: entry larger than the cache limit")
+            return
+        
+        if self._total_size is None:
+            self._evict()
+        
+        # Write atomically so concurrent readers never see a partial entry
+        entry_path = self._entry_path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(payload)
+            replaced_size = self._size(entry_path)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {key}: {str(e)}")
+            self._remove(tmp_path)
+            return
+        
+        self._total_size += len(payload) - replaced_size
+        if self._total_size > self.max_size_bytes:
+            self._evict()
+    
+    def _evict(self):
+        """
+        Measure the cache directory and remove least recently used entries
+        until it fits its size limit.
+        """
+        entries = []
+        total_size = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json.z"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        
+        if total_size > self.max_size_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                self._remove(path)
+                total_size -= size
+        
+        self._total_size = total_size
+    
+    @staticmethod
+    def _size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+    
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,141 @@
+"""
+Streaming DOCX text extraction for the Saudi AI Contracts system.
+
+Reads the WordprocessingML parts straight out of the DOCX zip archive with
+iterparse instead of building the python-docx object model, and includes
+table cells, headers and footers in the extracted text.
+"""
+
+import re
+import zipfile
+import logging
+import xml.etree.ElementTree as ET
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# WordprocessingML namespace
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Tags handled by the extractor
+TAG_PARAGRAPH = W_NS + "p"
+TAG_TEXT = W_NS + "t"
+TAG_TAB = W_NS + "tab"
+TAG_TAB_STOPS = W_NS + "tabs"
+TAG_BREAK = W_NS + "br"
+TAG_CARRIAGE_RETURN = W_NS + "cr"
+TAG_TABLE = W_NS + "tbl"
+TAG_ROW = W_NS + "tr"
+TAG_CELL = W_NS + "tc"
+
+# Parts of the archive holding document text
+DOCUMENT_PART = "word/document.xml"
+HEADER_PART_PATTERN = re.compile(r'^word/header\d*\.xml$')
+FOOTER_PART_PATTERN = re.compile(r'^word/footer\d*\.xml$')
+
+# Errors that mean the file is not a DOCX archive we can stream
+DOCX_ERRORS = (zipfile.BadZipFile, KeyError, ET.ParseError)
+
+def is_docx(file_path):
+    """
+    Check that a zip archive is a DOCX document, not just any zip file.
+    
+    Args:
+        file_path (str): Path to a file starting with the zip magic bytes
+    
+    Returns:
+        bool: True if the archive has a document body part
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            archive.getinfo(DOCUMENT_PART)
+    except (OSError, zipfile.BadZipFile, KeyError):
+        return False
+    return True
+
+def iter_docx_text(file_path):
+    """
+    Stream the text of a DOCX file block by block.
+    
+    Headers are yielded first, then the document body, then footers. Each
+    paragraph is one block; each table row is one block with its cells
+    separated by tabs.
+    
+    Args:
+        file_path (str): Path to the DOCX file
+    
+    Yields:
+        str: Text of each paragraph or table row
+    
+    Raises:
+        zipfile.BadZipFile, KeyError, ET.ParseError: If the file is not a readable DOCX archive
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        names = archive.namelist()
+        headers = sorted(name for name in names if HEADER_PART_PATTERN.match(name))
+        footers = sorted(name for name in names if FOOTER_PART_PATTERN.match(name))
+        
+        for part in headers + [DOCUMENT_PART] + footers:
+            with archive.open(part) as stream:
+                yield from _iter_part_text(stream)
+
+def _iter_part_text(stream):
+    """
+    Incrementally parse one WordprocessingML part.
+    
+    Args:
+        stream: Binary file object of the XML part
+    
+    Yields:
+        str: Text of each paragraph or table row
+    """
+    # Text runs of the paragraph being read
+    runs = []
+    # Tab stop definitions in paragraph properties also use <w:tab>
+    in_tab_stops = False
+    # One entry per open table: cells of the current row, and paragraphs of the current cell
+    tables = []
+    
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        
+        if event == "start":
+            if tag == TAG_TAB_STOPS:
+                in_tab_stops = True
+            elif tag == TAG_TABLE:
+                tables.append({"cells": [], "paragraphs": []})
+            elif tag == TAG_ROW and tables:
+                tables[-1]["cells"] = []
+            elif tag == TAG_CELL and tables:
+                tables[-1]["paragraphs"] = []
+            continue
+        
+        if tag == TAG_TEXT:
+            runs.append(elem.text or "")
+        elif tag == TAG_TAB_STOPS:
+            in_tab_stops = False
+        elif tag == TAG_TAB and not in_tab_stops:
+            runs.append("\t")
+        elif tag in (TAG_BREAK, TAG_CARRIAGE_RETURN):
+            runs.append("\n")
+        elif tag == TAG_PARAGRAPH:
+            paragraph = "".join(runs)
+            runs = []
+            if tables:
+                tables[-1]["paragraphs"].append(paragraph)
+            else:
+                yield paragraph
+                elem.clear()
+        elif tag == TAG_CELL and tables:
+            tables[-1]["cells"].append(" ".join(p for p in tables[-1]["paragraphs"] if p))
+        elif tag == TAG_ROW and tables:
+            row = "\t".join(tables[-1]["cells"])
+            if len(tables) > 1:
+                # A nested table becomes part of the enclosing cell's text
+                tables[-2]["paragraphs"].append(row)
+            else:
+                yield row
+        elif tag == TAG_TABLE and tables:
+            tables.pop()
+            if not tables:
+                elem.clear()
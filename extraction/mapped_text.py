@@ -0,0 +1,71 @@
+"""
+Memory-mapped text sources for the Saudi AI Contracts system.
+
+Large UTF-8 text files (regulation dumps, bulk contract exports) are mapped
+read-only and decoded straight from the mapping, so reading them never
+holds a bytes copy of the file next to the decoded text.
+"""
+
+import mmap
+import codecs
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ENCODING = 'utf-8'
+
+class MappedText:
+    """
+    Read-only, memory-mapped view of a UTF-8 text file.
+    
+    Use as a context manager so the mapping and file are closed promptly.
+    """
+    
+    def __init__(self, file_path):
+        """
+        Map a UTF-8 text file into memory.
+        
+        Args:
+            file_path (str): Path to the text file
+        """
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        
+        # Skip a UTF-8 byte order mark
+        self._start = len(codecs.BOM_UTF8) if self._map[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __len__(self):
+        return len(self._map) - self._start
+    
+    def close(self):
+        """Release the memory map and the underlying file."""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+    
+    def decode(self, start=None, end=None):
+        """
+        Decode a byte range of the file.
+        
+        Args:
+            start (int): Byte offset of the range start (defaults to the text start)
+            end (int): Byte offset of the range end (defaults to the end of file)
+        
+        Returns:
+            str: Decoded text
+        """
+        start = self._start if start is None else start
+        with memoryview(self._map) as view:
+            return str(view[start:end], ENCODING, 'replace')
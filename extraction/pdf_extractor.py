@@ -0,0 +1,148 @@
+"""
+PDF text extraction for the Saudi AI Contracts system.
+
+Pages are streamed one at a time. Large documents are split into contiguous
+page ranges and extracted across a process pool, then handed back in page
+order.
+"""
+
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def _extract_pdf_page_range(file_path, start, stop):
+    """
+    Extract the text of a contiguous page range from a PDF file.
+    
+    Runs inside a worker process, so the file is reopened by path.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        start (int): Index of the first page
+        stop (int): Index one past the last page
+    
+    Returns:
+        list: Text of each page in the range, terminated by a newline
+    """
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [(reader.pages[i].extract_text() or "") + "\n" for i in range(start, stop)]
+
+def _split_page_range(page_count, workers):
+    """
+    Split a page count into contiguous, ordered ranges for the worker pool.
+    
+    Args:
+        page_count (int): Number of pages in the document
+        workers (int): Number of worker processes
+    
+    Returns:
+        list: (start, stop) tuples covering every page in order
+    """
+    chunk_size = -(-page_count // workers)
+    return [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+def iter_pdf_pages(file_path, workers=1, parallel_min_pages=32):
+    """
+    Lazily extract text from a PDF file, one page at a time.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        workers (int): Maximum number of worker processes
+        parallel_min_pages (int): PDFs with fewer pages are extracted serially
+    
+    Yields:
+        str: Text of each page, terminated by a newline
+    """
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        page_count = len(reader.pages)
+        workers = min(workers, page_count)
+        
+        # Short contracts are not worth the process pool start-up cost
+        if workers <= 1 or page_count < parallel_min_pages:
+            for page in reader.pages:
+                yield (page.extract_text() or "") + "\n"
+            return
+    
+    yield from _iter_pdf_pages_parallel(file_path, page_count, workers)
+
+def _iter_pdf_pages_parallel(file_path, page_count, workers):
+    """
+    Extract PDF pages across a process pool, yielding them in page order.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        page_count (int): Number of pages in the document
+        workers (int): Number of worker processes
+    
+    Yields:
+        str: Text of each page, terminated by a newline
+    """
+    ranges = _split_page_range(page_count, workers)
+    logger.info(f"Extracting {page_count} PDF pages with {len(ranges)} workers")
+    
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        chunks = executor.map(
+            _extract_pdf_page_range,
+            [file_path] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges]
+        )
+        for chunk in chunks:
+            yield from chunk
+
+def pdf_page_count(file_path):
+    """
+    Count the pages of a PDF file without extracting any text.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        
+    Returns:
+        int: Number of pages
+    """
+    with open(file_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+def pdf_page_fingerprints(file_path):
+    """
+    Hash the raw content stream of every page without extracting any text.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        
+    Returns:
+        list: Hex digest of each page's content stream, in page order
+    """
+    fingerprints = []
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            contents = page.get_contents()
+            data = contents.get_data() if contents is not None else b""
+            fingerprints.append(hashlib.sha1(data).hexdigest())
+    return fingerprints
+
+def extract_pdf_pages(file_path, indices):
+    """
+    Extract the text of selected pages only.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        indices (list): Page indices to extract
+        
+    Returns:
+        dict: Text of each requested page by index, terminated by a newline
+    """
+    pages = {}
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        for index in indices:
+            pages[index] = (reader.pages[index].extract_text() or "") + "\n"
+    return pages
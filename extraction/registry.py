@@ -0,0 +1,227 @@
+"""
+Extractor registry for the Saudi AI Contracts system.
+
+Each supported format registers one extractor under its MIME type, together
+with the magic bytes and file extensions that identify it. Both the Flask
+parser and the FastAPI analyzer extract text through this registry, so every
+format has a single implementation.
+"""
+
+import os
+import hashlib
+import logging
+
+from .pdf_extractor import iter_pdf_pages, pdf_page_fingerprints, extract_pdf_pages
+from .docx_extractor import iter_docx_text, is_docx, DOCX_ERRORS
+from .text_encoding import read_text_file, detect_encoding, MMAP_THRESHOLD, SAMPLE_SIZE
+from .mapped_text import MappedText
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MIME_PDF = "application/pdf"
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+MIME_TEXT = "text/plain"
+
+# Number of leading bytes read to sniff the file format
+MAGIC_SIZE = 8
+
+# Settings used when a caller does not override them
+DEFAULT_SETTINGS = {
+    "pdf_workers": 1,
+    "parallel_min_pages": 32,
+    "txt_mmap_threshold": MMAP_THRESHOLD
+}
+
+# Registered extractors by MIME type
+_EXTRACTORS = {}
+
+def register_extractor(mime_type, extensions, magic=None, confirm=None):
+    """
+    Register a text extractor for a file format.
+    
+    The decorated function receives the file path and the merged extraction
+    settings, and yields chunks of text whose concatenation is the document.
+    
+    Args:
+        mime_type (str): MIME type of the format
+        extensions (list): File extensions of the format, with the dot
+        magic (bytes, optional): Leading bytes identifying the format
+        confirm (function, optional): Called with the file path when the
+            magic bytes match, for formats whose magic bytes are shared with
+            other formats; the file is of the format only if it returns True
+    
+    Returns:
+        function: Decorator registering the extractor
+    """
+    def decorator(func):
+        _EXTRACTORS[mime_type] = {
+            "extensions": tuple(extensions),
+            "magic": magic,
+            "confirm": confirm,
+            "iter_text": func
+        }
+        return func
+    return decorator
+
+def supported_extensions():
+    """
+    List the file extensions that have a registered extractor.
+    
+    Returns:
+        list: Extensions, with the dot
+    """
+    return [extension for extractor in _EXTRACTORS.values() for extension in extractor["extensions"]]
+
+def detect_mime_type(file_path):
+    """
+    Identify the format of a file from its magic bytes, then its extension.
+    
+    Args:
+        file_path (str): Path to the file
+    
+    Returns:
+        str: MIME type of a registered extractor, or None
+    """
+    with open(file_path, 'rb') as file:
+        head = file.read(MAGIC_SIZE)
+    
+    # Formats whose magic bytes matched but which the file turned out not to be
+    rejected = set()
+    for mime_type, extractor in _EXTRACTORS.items():
+        if extractor["magic"] and head.startswith(extractor["magic"]):
+            if extractor["confirm"] is None or extractor["confirm"](file_path):
+                return mime_type
+            rejected.add(mime_type)
+    
+    file_extension = os.path.splitext(file_path)[1].lower()
+    for mime_type, extractor in _EXTRACTORS.items():
+        if file_extension in extractor["extensions"] and mime_type not in rejected:
+            return mime_type
+    
+    return None
+
+def iter_text(file_path, settings=None):
+    """
+    Stream the text of a document through its registered extractor.
+    
+    Args:
+        file_path (str): Path to the document
+        settings (dict, optional): Overrides for DEFAULT_SETTINGS
+    
+    Yields:
+        str: Chunks of text (pages for PDF files)
+    
+    Raises:
+        ValueError: If no extractor handles the file
+    """
+    mime_type = detect_mime_type(file_path)
+    if mime_type is None:
+        file_extension = os.path.splitext(file_path)[1].lower()
+        raise ValueError(f"Unsupported file type: {file_extension}")
+    
+    merged_settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    yield from _EXTRACTORS[mime_type]["iter_text"](file_path, merged_settings)
+
+def extract_text(file_path, settings=None):
+    """
+    Extract the full text of a document.
+    
+    Args:
+        file_path (str): Path to the document
+        settings (dict, optional): Overrides for DEFAULT_SETTINGS
+    
+    Returns:
+        str: Extracted text
+    """
+    return "".join(iter_text(file_path, settings))
+
+def text_fingerprint(text):
+    """
+    Hash a chunk of extracted text.
+    
+    Args:
+        text (str): Page or block text
+        
+    Returns:
+        str: Hex digest of the text
+    """
+    return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+def page_fingerprints(file_path):
+    """
+    Fingerprint the pages of a document without extracting their text.
+    
+    Only paged formats (PDF) can be fingerprinted this way; for other
+    formats the caller hashes the extracted chunks with text_fingerprint().
+    
+    Args:
+        file_path (str): Path to the document
+        
+    Returns:
+        list: Fingerprint of each page, or None if the format has no pages
+    """
+    if detect_mime_type(file_path) != MIME_PDF:
+        return None
+    return pdf_page_fingerprints(file_path)
+
+def extract_pages(file_path, indices):
+    """
+    Extract the text of selected pages of a paged document (PDF).
+    
+    Args:
+        file_path (str): Path to the document
+        indices (list): Page indices to extract
+        
+    Returns:
+        dict: Text of each requested page by index
+    """
+    return extract_pdf_pages(file_path, indices)
+
+def open_text_source(file_path, settings=None):
+    """
+    Memory-map a large UTF-8 text file so it is decoded without a bytes copy.
+    
+    Args:
+        file_path (str): Path to the document
+        settings (dict, optional): Overrides for DEFAULT_SETTINGS
+    
+    Returns:
+        MappedText: Mapped text source, or None if the file should be
+        extracted normally (not text, below the size threshold, or not UTF-8)
+    """
+    merged_settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    
+    if os.path.getsize(file_path) < merged_settings["txt_mmap_threshold"]:
+        return None
+    if detect_mime_type(file_path) != MIME_TEXT:
+        return None
+    
+    with open(file_path, 'rb') as file:
+        sample = file.read(SAMPLE_SIZE)
+    if detect_encoding(sample) not in ('utf-8', 'utf-8-sig'):
+        return None
+    
+    logger.info(f"Memory-mapping large text document: {file_path}")
+    return MappedText(file_path)
+
+@register_extractor(MIME_PDF, ['.pdf'], magic=b'%PDF-')
+def _iter_pdf_text(file_path, settings):
+    yield from iter_pdf_pages(file_path, settings["pdf_workers"], settings["parallel_min_pages"])
+
+# Every zip archive starts with the same magic bytes as DOCX
+@register_extractor(MIME_DOCX, ['.docx'], magic=b'PK\x03\x04', confirm=is_docx)
+def _iter_docx_text(file_path, settings):
+    try:
+        # Read the whole part before yielding so a fallback never repeats text
+        blocks = [block + "\n" for block in iter_docx_text(file_path)]
+    except DOCX_ERRORS as e:
+        logger.warning(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+        import docx
+        document = docx.Document(file_path)
+        blocks = [paragraph.text + "\n" for paragraph in document.paragraphs]
+    yield from blocks
+
+@register_extractor(MIME_TEXT, ['.txt'])
+def _iter_plain_text(file_path, settings):
+    yield read_text_file(file_path, settings["txt_mmap_threshold"])
@@ -0,0 +1,163 @@
+"""
+Sandboxed text extraction for the Saudi AI Contracts system.
+
+Runs an extractor in a child process with a wall-clock timeout, a page limit
+and an address-space limit, so a malformed or adversarial document cannot
+hold a web worker hostage. Text is streamed back as it is extracted; when a
+limit is hit the pages read so far are kept and the result is flagged as
+truncated.
+"""
+
+import time
+import logging
+import itertools
+import multiprocessing
+
+from .registry import iter_text, detect_mime_type, MIME_PDF
+from .pdf_extractor import pdf_page_count
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Reasons reported when extraction stops early
+REASON_TIMEOUT = "timeout"
+REASON_PAGE_LIMIT = "page_limit"
+REASON_MEMORY_LIMIT = "memory_limit"
+REASON_CRASHED = "crashed"
+
+def _sandbox_worker(conn, file_path, settings, max_pages, max_memory_bytes):
+    """
+    Extract a document inside the sandbox process and stream it to the parent.
+    
+    Messages are (kind, payload) tuples: ("chunk", text), ("done", None),
+    ("truncated", reason) or ("error", message).
+    """
+    if max_memory_bytes:
+        try:
+            import resource
+            resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning(f"Could not limit sandbox memory: {str(e)}")
+    
+    try:
+        page_limit = max_pages if detect_mime_type(file_path) == MIME_PDF else None
+        chunks = iter_text(file_path, settings)
+        if page_limit is not None:
+            # Stop before extracting the first page past the limit
+            chunks = itertools.islice(chunks, page_limit)
+        pages = 0
+        for chunk in chunks:
+            conn.send(("chunk", chunk))
+            pages += 1
+        if pages == page_limit and pdf_page_count(file_path) > page_limit:
+            conn.send(("truncated", REASON_PAGE_LIMIT))
+            return
+        conn.send(("done", None))
+    except MemoryError:
+        conn.send(("truncated", REASON_MEMORY_LIMIT))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {str(e)}"))
+    finally:
+        conn.close()
+
+class SandboxedExtraction:
+    """
+    Iterable over the text chunks of a document extracted in a sandbox.
+    
+    After iteration, truncated and reason describe whether a limit was hit.
+    """
+    
+    def __init__(self, file_path, timeout_seconds, max_pages, max_memory_bytes, settings=None):
+        """
+        Prepare a sandboxed extraction.
+        
+        Args:
+            file_path (str): Path to the document
+            timeout_seconds (float): Wall-clock limit for the whole extraction
+            max_pages (int): Maximum number of PDF pages to extract
+            max_memory_bytes (int): Address-space limit of the sandbox process
+            settings (dict, optional): Extraction settings overrides
+        """
+        self.file_path = file_path
+        self.timeout_seconds = timeout_seconds
+        self.max_pages = max_pages
+        self.max_memory_bytes = max_memory_bytes
+        
+        # A process pool cannot be started from inside the sandbox process
+        self.settings = {**(settings or {}), "pdf_workers": 1}
+        
+        self.truncated = False
+        self.reason = None
+        self.pages = 0
+    
+    def _truncate(self, reason):
+        logger.warning(f"Extraction of {self.file_path} truncated after {self.pages} pages: {reason}")
+        self.truncated = True
+        self.reason = reason
+    
+    def __iter__(self):
+        if detect_mime_type(self.file_path) is None:
+            raise ValueError(f"Unsupported file type: {self.file_path}")
+        
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_sandbox_worker,
+            args=(child_conn, self.file_path, self.settings, self.max_pages, self.max_memory_bytes),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        
+        deadline = time.monotonic() + self.timeout_seconds
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not parent_conn.poll(remaining):
+                    self._truncate(REASON_TIMEOUT)
+                    return
+                
+                try:
+                    kind, payload = parent_conn.recv()
+                except EOFError:
+                    # The sandbox died without reporting, e.g. killed by the OOM killer
+                    self._truncate(REASON_CRASHED)
+                    return
+                
+                if kind == "chunk":
+                    self.pages += 1
+                    yield payload
+                elif kind == "done":
+                    return
+                elif kind == "truncated":
+                    self._truncate(payload)
+                    return
+                else:
+                    raise RuntimeError(f"Sandboxed extraction of {self.file_path} failed: {payload}")
+        finally:
+            parent_conn.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+def extract_text_sandboxed(file_path, timeout_seconds, max_pages, max_memory_bytes, settings=None):
+    """
+    Extract the text of a document in a sandbox process.
+    
+    Args:
+        file_path (str): Path to the document
+        timeout_seconds (float): Wall-clock limit for the whole extraction
+        max_pages (int): Maximum number of PDF pages to extract
+        max_memory_bytes (int): Address-space limit of the sandbox process
+        settings (dict, optional): Extraction settings overrides
+    
+    Returns:
+        dict: Extracted (possibly partial) text, truncated flag, reason and page count
+    """
+    extraction = SandboxedExtraction(file_path, timeout_seconds, max_pages, max_memory_bytes, settings)
+    text = "".join(extraction)
+    return {
+        "text": text,
+        "truncated": extraction.truncated,
+        "reason": extraction.reason,
+        "pages": extraction.pages
+    }
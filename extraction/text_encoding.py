@@ -0,0 +1,120 @@
+"""
+Encoding detection for plain-text contracts in the Saudi AI Contracts system.
+
+Text files are read once into memory (or memory-mapped when large), the
+encoding is picked from the byte order mark and a byte histogram of a
+leading sample, and the text is decoded straight from that buffer.
+"""
+
+import os
+import mmap
+import codecs
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Files at least this large are decoded from a memory map instead of a bytes copy
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+# Number of leading bytes inspected by the detector
+SAMPLE_SIZE = 64 * 1024
+
+# High bytes of UTF-16 code units for Latin (U+00xx) and Arabic (U+06xx) text
+UTF16_HIGH_BYTES = (0x00, 0x06)
+
+# Share of one byte lane taken by UTF16_HIGH_BYTES above which BOM-less
+# text is taken as UTF-16
+UTF16_HIGH_BYTE_RATIO = 0.6
+
+# Byte order marks, longest first
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+]
+
+def _count_high_bytes(lane):
+    """Count the bytes of one byte lane that are UTF-16 high bytes."""
+    return sum(lane.count(value) for value in UTF16_HIGH_BYTES)
+
+def detect_encoding(sample):
+    """
+    Pick the encoding of a text file from a leading sample of its bytes.
+    
+    Only the encodings contracts actually arrive in are considered: UTF-8,
+    UTF-16 and Windows Arabic (CP1256).
+    
+    Args:
+        sample (bytes): Leading bytes of the file
+    
+    Returns:
+        str: Python codec name
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    
+    # BOM-less UTF-16: the high byte of every code unit is 0x00 for ASCII and
+    # 0x06 for Arabic, so one byte lane is almost nothing but those two values.
+    # Neither byte occurs in UTF-8 or CP1256 text.
+    if len(sample) >= 2:
+        half = len(sample) // 2
+        even_high = _count_high_bytes(sample[0::2])
+        odd_high = _count_high_bytes(sample[1::2])
+        if odd_high > half * UTF16_HIGH_BYTE_RATIO and odd_high > even_high:
+            return 'utf-16-le'
+        if even_high > half * UTF16_HIGH_BYTE_RATIO and even_high > odd_high:
+            return 'utf-16-be'
+    
+    # Valid UTF-8 (ignoring a multi-byte sequence cut by the sample boundary)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    # Legacy Windows exports of Arabic contracts
+    return 'cp1256'
+
+def decode_buffer(buffer):
+    """
+    Decode a bytes-like buffer of a text file, detecting its encoding.
+    
+    Args:
+        buffer: bytes, memoryview or mmap holding the whole file
+    
+    Returns:
+        str: Decoded text
+    """
+    encoding = detect_encoding(bytes(buffer[:SAMPLE_SIZE]))
+    
+    try:
+        return str(buffer, encoding)
+    except UnicodeDecodeError:
+        # The sample looked like UTF-8 but the rest of the file does not
+        logger.warning(f"Failed to decode text as {encoding}, falling back to cp1256")
+        return str(buffer, 'cp1256', 'replace')
+
+def read_text_file(file_path, mmap_threshold=MMAP_THRESHOLD):
+    """
+    Read and decode a text file with a single pass over the disk.
+    
+    Args:
+        file_path (str): Path to the text file
+        mmap_threshold (int): Size from which the file is memory-mapped
+    
+    Returns:
+        str: Decoded text
+    """
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return ""
+        
+        if size < mmap_threshold:
+            return decode_buffer(file.read())
+        
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return decode_buffer(view)
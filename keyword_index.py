@@ -0,0 +1,187 @@
+"""
+Multi-keyword index for the Saudi AI Contracts system.
+
+Every keyword list used for clause presence checks and contract type
+detection is compiled once into an Aho-Corasick automaton. Scanning a
+document walks it once, whatever the number of keywords, and reports every
+occurrence of every keyword with its offset.
+"""
+
+from array import array
+from collections import deque
+
+# Arabic conjunctions, prepositions and the article, written joined to the
+# word they precede, longest first
+ARABIC_PROCLITICS = ("وال", "فال", "بال", "كال", "لل", "ال", "و", "ف", "ب", "ك", "ل")
+
+def _is_word_character(character):
+    """Whether a character is part of a word, as matched by \\w."""
+    return character.isalnum() or character == "_"
+
+def _is_arabic_letter(character):
+    """Whether a character is an Arabic letter, hamza to yaa."""
+    return "\u0621" <= character <= "\u064A"
+
+class KeywordHits:
+    """
+    Keyword occurrences found by one scan of a text.
+    
+    Lookups take keywords as written in the rules; they are folded with the
+    index's fold function before lookup. Occurrences are substrings of the
+    text, e.g. "trial" occurs in "industrial"; word_offsets() only reports
+    occurrences that are whole words.
+    """
+    
+    __slots__ = ("_offsets", "_fold", "_text")
+    
+    def __init__(self, offsets, fold, text):
+        self._offsets = offsets
+        self._fold = fold
+        self._text = text
+    
+    def __contains__(self, keyword):
+        return self._fold(keyword) in self._offsets
+    
+    def offsets(self, keyword):
+        """
+        Start offsets of every occurrence of a keyword.
+        
+        Args:
+            keyword (str): Keyword as written in a rule
+            
+        Returns:
+            array: Offsets into the scanned text, in order
+        """
+        return self._offsets.get(self._fold(keyword), ())
+    
+    def word_offsets(self, keyword):
+        """
+        Start offsets of the occurrences of a keyword that are whole words.
+        
+        An occurrence is a whole word if no word character touches it. An
+        Arabic keyword may also be preceded by a proclitic, e.g. "بالدوام"
+        contains the word "الدوام".
+        
+        Args:
+            keyword (str): Keyword as written in a rule
+            
+        Returns:
+            array: Offsets into the scanned text, in order
+        """
+        folded = self._fold(keyword)
+        offsets = self._offsets.get(folded, ())
+        if not offsets:
+            return array('q')
+        
+        text = self._text
+        length = len(folded)
+        arabic = _is_arabic_letter(folded[0])
+        words = array('q')
+        for offset in offsets:
+            end = offset + length
+            if end < len(text) and _is_word_character(text[end]):
+                continue
+            if offset and _is_word_character(text[offset - 1]):
+                if not arabic or not any(
+                    text.startswith(proclitic, offset - len(proclitic), offset)
+                    and (offset == len(proclitic) or not _is_word_character(text[offset - len(proclitic) - 1]))
+                    for proclitic in ARABIC_PROCLITICS
+                ):
+                    continue
+            words.append(offset)
+        return words
+    
+    def first(self, keyword):
+        """Offset of the first occurrence of a keyword, or None."""
+        offsets = self.offsets(keyword)
+        return offsets[0] if offsets else None
+    
+    def any(self, keywords):
+        """Whether at least one of the keywords occurs."""
+        return any(keyword in self for keyword in keywords)
+    
+    def count(self, keywords):
+        """Number of the keywords that occur at least once."""
+        return sum(1 for keyword in keywords if keyword in self)
+
+class KeywordIndex:
+    """
+    Aho-Corasick automaton over a set of keywords.
+    
+    The automaton is compiled into a deterministic transition table, so a
+    scan costs one dictionary lookup per character of the text.
+    """
+    
+    def __init__(self, keywords, fold=None):
+        """
+        Compile the automaton.
+        
+        Args:
+            keywords (iterable): Keywords to index
+            fold (callable, optional): Applied to every keyword, at compile
+                time and on lookup; the scanned text must be folded the same way
+        """
+        self._fold = fold or (lambda keyword: keyword)
+        self.keywords = sorted({self._fold(keyword) for keyword in keywords if keyword})
+        
+        # Trie: transitions and the keywords ending at each state
+        transitions = [{}]
+        outputs = [[]]
+        for keyword in self.keywords:
+            state = 0
+            for character in keyword:
+                next_state = transitions[state].get(character)
+                if next_state is None:
+                    next_state = len(transitions)
+                    transitions[state][character] = next_state
+                    transitions.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword)
+        
+        # Breadth-first, so a state's failure state (always shallower) is complete
+        # before the state inherits its transitions and outputs
+        failure = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = failure[state]
+            for character, next_state in transitions[state].items():
+                failure[next_state] = transitions[fallback].get(character, 0)
+                queue.append(next_state)
+            outputs[state] = outputs[state] + outputs[fallback]
+            for character, next_state in transitions[fallback].items():
+                transitions[state].setdefault(character, next_state)
+        
+        self._transitions = transitions
+        self._outputs = [tuple(output) for output in outputs]
+    
+    def __len__(self):
+        return len(self.keywords)
+    
+    def scan(self, text):
+        """
+        Find every occurrence of every keyword in one pass.
+        
+        Args:
+            text (str): Text, folded the same way as the keywords
+            
+        Returns:
+            KeywordHits: Occurrences by keyword
+        """
+        offsets = {}
+        transitions = self._transitions
+        outputs = self._outputs
+        
+        state = 0
+        for position, character in enumerate(text):
+            state = transitions[state].get(character, 0)
+            if outputs[state]:
+                for keyword in outputs[state]:
+                    # Typed arrays: common keywords occur thousands of times in a long contract
+                    occurrences = offsets.get(keyword)
+                    if occurrences is None:
+                        occurrences = offsets[keyword] = array('q')
+                    occurrences.append(position - len(keyword) + 1)
+        
+        return KeywordHits(offsets, self._fold, text)
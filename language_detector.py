@@ -0,0 +1,116 @@
+"""
+Language detection module for the Saudi AI Contracts system.
+
+Contracts are Arabic, English or bilingual, so the language is decided from
+Unicode script counts over a few sampled windows of the text instead of a
+statistical language model. When both scripts are present, common function
+words show whether each script is running text or just names, codes and
+abbreviations embedded in the other language.
+"""
+
+import re
+
+ARABIC = "ar"
+ENGLISH = "en"
+MIXED = "mixed"
+
+# Characters sampled from a document, split evenly between the windows
+SAMPLE_SIZE = 2000
+SAMPLE_WINDOWS = 4
+
+# Minimum number of letters needed to decide; below it the default is returned
+MIN_LETTERS = 20
+
+# Share of letters the minority script needs before a text may be bilingual
+MIXED_SHARE = 0.2
+
+# Arabic letters, excluding diacritics, tatweel and digits
+ARABIC_LETTER = re.compile('[\u0621-\u064A\u0671-\u06D3\u06FA-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFC]')
+LATIN_LETTER = re.compile('[A-Za-z\u00C0-\u024F]')
+
+WORD = re.compile(r'\w+')
+
+ARABIC_FUNCTION_WORDS = frozenset([
+    "في", "من", "على", "إلى", "الى", "عن", "مع", "أن", "ان", "التي", "الذي",
+    "هذا", "هذه", "ذلك", "أو", "او", "كما", "بين", "لا", "ما", "وفق", "حيث"
+])
+ENGLISH_FUNCTION_WORDS = frozenset([
+    "the", "of", "and", "to", "in", "is", "be", "shall", "by", "for", "with",
+    "this", "that", "or", "as", "on", "any", "such", "from", "which", "will"
+])
+
+def _sample(text, sample_size, start=0, end=None):
+    """Take evenly spaced windows from text[start:end], or the whole range if it is short."""
+    end = len(text) if end is None else end
+    if end - start <= sample_size:
+        return text[start:end]
+    window = sample_size // SAMPLE_WINDOWS
+    step = (end - start - window) // (SAMPLE_WINDOWS - 1)
+    return " ".join(
+        text[start + i * step:start + i * step + window]
+        for i in range(SAMPLE_WINDOWS)
+    )
+
+def _function_word_counts(sample):
+    arabic = 0
+    english = 0
+    for word in WORD.findall(sample.lower()):
+        if word in ARABIC_FUNCTION_WORDS:
+            arabic += 1
+        elif word in ENGLISH_FUNCTION_WORDS:
+            english += 1
+    return arabic, english
+
+def detect_language(text, default=ENGLISH, sample_size=SAMPLE_SIZE, use_function_words=True, start=0, end=None):
+    """
+    Detect whether a text is Arabic, English or bilingual.
+    
+    Args:
+        text (str): Text to classify
+        default (str): Language returned when the text has too few letters
+        sample_size (int): Number of characters sampled from the text
+        use_function_words (bool): Check function words when both scripts
+            are present instead of relying on script counts alone
+        start (int): Offset of the range to classify
+        end (int, optional): End of the range to classify
+        
+    Returns:
+        str: "ar", "en" or "mixed"
+    """
+    sample = _sample(text, sample_size, start, end)
+    arabic = len(ARABIC_LETTER.findall(sample))
+    latin = len(LATIN_LETTER.findall(sample))
+    letters = arabic + latin
+    
+    if letters < MIN_LETTERS:
+        return default
+    
+    arabic_share = arabic / letters
+    if arabic_share >= 1 - MIXED_SHARE:
+        return ARABIC
+    if arabic_share <= MIXED_SHARE:
+        return ENGLISH
+    
+    if use_function_words:
+        arabic_words, english_words = _function_word_counts(sample)
+        # A script without function words is only names or codes inside the other language
+        if arabic_words and not english_words:
+            return ARABIC
+        if english_words and not arabic_words:
+            return ENGLISH
+    
+    return MIXED
+
+def detect_section_languages(text, sections, default=ENGLISH):
+    """
+    Detect the language of each section of a contract.
+    
+    Args:
+        text (str): Contract text
+        sections (iterable): (start, end) character offsets of each section
+        default (str): Language of sections with too few letters
+        
+    Returns:
+        list: Language code of each section, in the order given
+    """
+    return [detect_language(text, default, start=start, end=end) for start, end in sections]
@@ -0,0 +1,474 @@
+"""
+Legal knowledge base module for the Saudi AI Contracts system.
+
+The legal rules are the bullet points of the markdown files listed in
+config.LEGAL_REFERENCES. Parsing and tokenizing them on every start, in
+every process, made start-up slow and gave each worker its own copy.
+build_legal_kb() compiles them once into a versioned binary artifact of
+rule metadata: section title, rule text and the articles the section cites.
+load_legal_kb() memory-maps the artifact read-only, so start-up only reads
+a small header and every process on a machine shares the same pages. The
+artifact is rebuilt when a source file changes. The analyzer counts the
+rules of a contract type and cites, for every finding, the rules of the
+articles its reference names.
+
+Build it ahead of deployment with:
+
+    python -m src.legal_kb
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+from array import array
+from collections.abc import Sequence
+
+from src.config import LEGAL_REFERENCES, LEGAL_KB_SETTINGS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SAKB"
+
+# Bumped whenever the layout of the artifact changes
+FORMAT_VERSION = 3
+
+# Magic, format version and metadata length
+_HEADER = struct.Struct("<4sIQ")
+
+# Blocks start at multiples of this many bytes
+_ALIGNMENT = 8
+
+# Stored for rules whose section cites no article
+NO_ARTICLE = -1
+
+def cited_articles(text):
+    """
+    Range of article numbers cited by a section title or a finding reference.
+    
+    "Working Hours (Article 77)" cites 77 to 77, "Articles 84-98" cites 84
+    to 98 and "المادة 53 من نظام العمل" cites 53 to 53.
+    
+    Args:
+        text (str): Section title or reference
+        
+    Returns:
+        tuple: First and last article number, or (NO_ARTICLE, NO_ARTICLE)
+    """
+    numbers = [int(number) for number in re.findall(r'\d+', text)]
+    if not numbers:
+        return NO_ARTICLE, NO_ARTICLE
+    return min(numbers), max(numbers)
+
+def extract_rules_from_content(content):
+    """
+    Extract rules from markdown content.
+    
+    Args:
+        content (str): Markdown content
+        
+    Returns:
+        list: Extracted rules, each with its section title and text
+    """
+    rules = []
+    
+    # Split content by headers
+    for section in re.split(r'##\s+', content):
+        if not section.strip():
+            continue
+        
+        # Extract section title and content
+        lines = section.strip().split('\n')
+        title = lines[0].strip()
+        section_content = '\n'.join(lines[1:]).strip()
+        
+        # Extract rules from bullet points
+        for point in re.findall(r'-\s+(.*?)(?:\n|$)', section_content):
+            rules.append({
+                "section": title,
+                "rule": point.strip()
+            })
+    
+    return rules
+
+def _source_stamps(references):
+    """[path, size, mtime_ns] of every source file, with None for missing files."""
+    stamps = []
+    for contract_type, sources in references.items():
+        for path in sources.values():
+            try:
+                stat = os.stat(path)
+                stamps.append([path, stat.st_size, stat.st_mtime_ns])
+            except OSError:
+                stamps.append([path, None, None])
+    return stamps
+
+def compile_legal_kb(references=LEGAL_REFERENCES):
+    """
+    Compile the legal rules into the binary knowledge base format.
+    
+    Args:
+        references (dict): Source markdown files by reference name, by
+            contract type; missing files are logged and skipped
+            
+    Returns:
+        bytes: Knowledge base artifact
+    """
+    stamps = _source_stamps(references)
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode('utf-8'))
+    
+    rules = []
+    reference_ranges = {}
+    for contract_type, sources in references.items():
+        reference_ranges[contract_type] = {}
+        for ref_name, ref_path in sources.items():
+            try:
+                with open(ref_path, 'r', encoding='utf-8') as file:
+                    content = file.read()
+            except Exception as e:
+                logger.error(f"Error loading legal rules from {ref_path}: {str(e)}")
+                continue
+            digest.update(f"{contract_type}\0{ref_name}\0{content}\0".encode('utf-8'))
+            
+            reference_rules = extract_rules_from_content(content)
+            reference_ranges[contract_type][ref_name] = [len(rules), len(reference_rules)]
+            rules.extend(reference_rules)
+    
+    # Rule texts and section titles, as byte ranges of one string block
+    strings = bytearray()
+    rule_fields = array('q')
+    rule_articles = array('q')
+    for rule in rules:
+        for text in (rule["section"], rule["rule"]):
+            rule_fields.append(len(strings))
+            strings.extend(text.encode('utf-8'))
+            rule_fields.append(len(strings))
+        
+        # Read when citing rules, without decoding any text
+        rule_articles.extend(cited_articles(rule["section"]))
+    
+    blocks = {
+        "strings": (bytes(strings), 'B'),
+        "rule_fields": (rule_fields.tobytes(), 'q'),
+        "rule_articles": (rule_articles.tobytes(), 'q')
+    }
+    
+    metadata = {
+        "version": digest.hexdigest()[:12],
+        "byteorder": sys.byteorder,
+        "sources": stamps,
+        "references": reference_ranges,
+        "blocks": {}
+    }
+    
+    # Block offsets are relative to the end of the metadata, so they do not depend on its length
+    data = bytearray()
+    for name, (content, typecode) in blocks.items():
+        data.extend(b"\0" * (-len(data) % _ALIGNMENT))
+        metadata["blocks"][name] = [len(data), len(content), typecode]
+        data.extend(content)
+    
+    encoded = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+    encoded += b" " * (-(_HEADER.size + len(encoded)) % _ALIGNMENT)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded)) + encoded + bytes(data)
+
+class LegalRules(Sequence):
+    """
+    Rules of one legal reference, decoded from the knowledge base on access.
+    """
+    
+    __slots__ = ("_kb", "_first", "_count")
+    
+    def __init__(self, kb, first, count):
+        self._kb = kb
+        self._first = first
+        self._count = count
+    
+    def __len__(self):
+        return self._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("legal rule index out of range")
+        return self._kb.rule(self._first + index)
+
+class LegalKB:
+    """
+    Read-only view of a compiled legal knowledge base.
+    
+    Behaves like the legal rules dictionary it replaces: kb[contract_type]
+    maps each reference name to its rules. Rules are decoded from the
+    underlying buffer, usually a memory map, only when they are read.
+    
+    Attributes:
+        version (str): Stamp derived from the source contents
+        sources (list): [path, size, mtime_ns] of each source at build time
+    """
+    
+    def __init__(self, buffer):
+        """
+        Open a knowledge base.
+        
+        Args:
+            buffer: Artifact bytes, or a read-only memory map of the artifact file
+            
+        Raises:
+            ValueError: If the buffer is not a knowledge base of this format
+        """
+        # Released before raising, so the caller can close a rejected memory map
+        with memoryview(buffer) as header:
+            if len(header) < _HEADER.size:
+                raise ValueError("Truncated legal knowledge base")
+            magic, format_version, metadata_length = _HEADER.unpack_from(header)
+            if magic != MAGIC or format_version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported legal knowledge base format {format_version}")
+            
+            data_start = _HEADER.size + metadata_length
+            metadata = json.loads(bytes(header[_HEADER.size:data_start]).decode('utf-8'))
+            if metadata["byteorder"] != sys.byteorder:
+                raise ValueError("Legal knowledge base was built on a machine of another byte order")
+        
+        self._buffer = buffer
+        self.version = metadata["version"]
+        self.sources = metadata["sources"]
+        self._references = metadata["references"]
+        
+        view = memoryview(buffer)
+        blocks = {}
+        for name, (offset, length, typecode) in metadata["blocks"].items():
+            start = data_start + offset
+            blocks[name] = view[start:start + length].cast(typecode)
+        self._strings = blocks["strings"]
+        self._rule_fields = blocks["rule_fields"]
+        self._rule_articles = blocks["rule_articles"]
+    
+    def __contains__(self, contract_type):
+        return contract_type in self._references
+    
+    def __getitem__(self, contract_type):
+        return {
+            ref_name: LegalRules(self, first, count)
+            for ref_name, (first, count) in self._references[contract_type].items()
+        }
+    
+    def __len__(self):
+        return len(self._rule_articles) // 2
+    
+    @property
+    def contract_types(self):
+        """Contract types with legal references."""
+        return tuple(self._references)
+    
+    def rule_count(self, contract_type):
+        """
+        Number of legal rules of a contract type, without decoding them.
+        
+        Args:
+            contract_type (str): Type of contract
+            
+        Returns:
+            int: Number of rules of every reference of the type
+        """
+        return sum(count for _, count in self._references.get(contract_type, {}).values())
+    
+    def _string(self, start, end):
+        return bytes(self._strings[start:end]).decode('utf-8')
+    
+    def rule(self, rule_id):
+        """
+        Decode one rule.
+        
+        Args:
+            rule_id (int): Rule index in the knowledge base
+            
+        Returns:
+            dict: Section title and rule text of the rule
+        """
+        section_start, section_end, rule_start, rule_end = self._rule_fields[4 * rule_id:4 * rule_id + 4]
+        return {
+            "section": self._string(section_start, section_end),
+            "rule": self._string(rule_start, rule_end)
+        }
+    
+    def cited_rules(self, contract_type, reference):
+        """
+        Rules of the articles a finding's reference cites.
+        
+        Rules are cited from the most specific sections covering an article
+        number of the reference, so "Article 77" cites the working hours
+        section rather than one spanning Articles 74-83. References naming a source ("Labor Law Article 77"
+        for labor_law) only cite rules of that source; others cite rules of
+        every source of the contract type.
+        
+        Args:
+            contract_type (str): Type of contract
+            reference (str): Legal reference of the finding, if any
+            
+        Returns:
+            list: Section title and rule text of every cited rule
+        """
+        if not reference:
+            return []
+        
+        first_article, last_article = cited_articles(reference)
+        if first_article == NO_ARTICLE:
+            return []
+        
+        sources = self._references.get(contract_type, {})
+        reference_name = reference.lower()
+        named = [ref_name for ref_name in sources if ref_name.replace('_', ' ') in reference_name]
+        
+        # Rule IDs of the covering sections, by how many articles the section spans
+        candidates = []
+        for ref_name in named or sources:
+            first, count = sources[ref_name]
+            for rule_id in range(first, first + count):
+                section_first, section_last = self._rule_articles[2 * rule_id:2 * rule_id + 2]
+                if section_first != NO_ARTICLE and section_first <= last_article and first_article <= section_last:
+                    candidates.append((section_last - section_first, rule_id))
+        
+        if not candidates:
+            return []
+        narrowest = min(span for span, _ in candidates)
+        return [self.rule(rule_id) for span, rule_id in candidates if span == narrowest]
+    
+    def close(self):
+        """Release the buffer; rules must not be read afterwards."""
+        for name in ("_strings", "_rule_fields", "_rule_articles"):
+            getattr(self, name).release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+def build_legal_kb(path=None, references=LEGAL_REFERENCES):
+    """
+    Compile the legal rules and write the knowledge base artifact.
+    
+    The artifact is written to a temporary file and renamed into place, so
+    processes reading the previous one are not affected.
+    
+    Args:
+        path (str, optional): Artifact path; defaults to LEGAL_KB_SETTINGS["path"]
+        references (dict): Source markdown files by reference name, by contract type
+        
+    Returns:
+        str: Version of the built knowledge base
+    """
+    path = path or LEGAL_KB_SETTINGS["path"]
+    content = compile_legal_kb(references)
+    
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(content)
+        # Readable by every worker, whichever user it runs as
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, path)
+    except Exception:
+        os.unlink(temporary_path)
+        raise
+    
+    version = LegalKB(content).version
+    logger.info(f"Built legal knowledge base {path} (version {version})")
+    return version
+
+def open_legal_kb(path):
+    """
+    Memory-map a knowledge base artifact read-only.
+    
+    Args:
+        path (str): Artifact path
+        
+    Returns:
+        LegalKB: Knowledge base backed by the shared pages of the file
+        
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a knowledge base of this format
+    """
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return LegalKB(buffer)
+    except Exception:
+        buffer.close()
+        raise
+
+# Knowledge bases opened by this process, by path
+_opened = {}
+_lock = threading.Lock()
+
+def load_legal_kb(path=None, references=LEGAL_REFERENCES):
+    """
+    Knowledge base of the legal references, built only if missing or stale.
+    
+    The artifact is opened once per process and shared by every analyzer;
+    processes forked afterwards inherit the mapping. It is rebuilt when a
+    source file was added, removed or changed since it was built. If the
+    artifact cannot be written, e.g. on a read-only file system, the
+    knowledge base is compiled in memory instead.
+    
+    Args:
+        path (str, optional): Artifact path; defaults to LEGAL_KB_SETTINGS["path"]
+        references (dict): Source markdown files by reference name, by contract type
+        
+    Returns:
+        LegalKB: Knowledge base
+    """
+    path = path or LEGAL_KB_SETTINGS["path"]
+    stamps = _source_stamps(references)
+    
+    with _lock:
+        # A stale knowledge base opened earlier stays mapped, as analyzers may still read it
+        kb = _opened.get(path)
+        if kb is not None and kb.sources == stamps:
+            return kb
+        
+        try:
+            kb = open_legal_kb(path)
+            if kb.sources != stamps:
+                logger.info(f"Legal knowledge base {path} is stale; rebuilding")
+                # Unmap it before the rebuilt artifact replaces the file
+                kb.close()
+                kb = None
+        except FileNotFoundError:
+            kb = None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot open legal knowledge base {path}: {str(e)}; rebuilding")
+            kb = None
+        
+        if kb is None:
+            try:
+                build_legal_kb(path, references)
+                kb = open_legal_kb(path)
+            except OSError as e:
+                logger.warning(f"Cannot write legal knowledge base {path}: {str(e)}; compiling it in memory")
+                kb = LegalKB(compile_legal_kb(references))
+        
+        _opened[path] = kb
+        return kb
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Saudi AI Contracts - Build the legal knowledge base")
+    parser.add_argument("--output", default=LEGAL_KB_SETTINGS["path"], help="Path of the knowledge base artifact")
+    args = parser.parse_args()
+    
+    version = build_legal_kb(args.output)
+    print(f"Built {args.output} (version {version})")
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,10 @@ from datetime import datetime
 # Add the project directory to the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.config import CONTRACT_TYPES, REPORT_SETTINGS
+from src.config import CONTRACT_TYPES, REPORT_SETTINGS, EXTRACTION_SETTINGS
 from src.contract_parser import ContractParser
 from src.validator import ContractValidator
-from src.report_generator import ReportGenerator
+from src.batch import evaluate_contract, analyze_batch
 
 # Configure logging
 logging.basicConfig(
@@ -34,44 +34,37 @@ class SaudiAIContracts:
     
     def __init__(self):
         """Initialize the Saudi AI Contracts system."""
+        # Imported here so the batch subcommand, which writes no reports, does not load it
+        from src.report_generator import ReportGenerator
+        
         logger.info("Initializing Saudi AI Contracts system")
         self.parser = ContractParser()
         self.validator = ContractValidator()
         self.report_generator = ReportGenerator()
     
-    def analyze_contract(self, contract_path, contract_type=None):
+    def analyze_contract(self, contract_path, contract_type=None, top_types=1):
         """
         Analyze a contract document and generate a report.
         
         Args:
             contract_path (str): Path to the contract document
             contract_type (str, optional): Type of contract. If None, will be auto-detected.
+            top_types (int): Number of types to validate if the detected type is
+                ambiguous; the runner-ups are returned in analysis_results["alternatives"]
             
         Returns:
             dict: Analysis results including risks and violations
         """
         logger.info(f"Analyzing contract: {contract_path}")
         
-        # Check if file exists
-        if not os.path.exists(contract_path):
-            logger.error(f"Contract file not found: {contract_path}")
-            raise FileNotFoundError(f"Contract file not found: {contract_path}")
-        
-        # Parse the contract
-        contract_data = self.parser.parse(contract_path)
-        
-        # Auto-detect contract type if not provided
-        if contract_type is None:
-            contract_type = self.parser.detect_contract_type(contract_data)
-            logger.info(f"Auto-detected contract type: {contract_type}")
-        
-        # Validate contract type
-        if contract_type not in CONTRACT_TYPES:
-            logger.error(f"Invalid contract type: {contract_type}")
-            raise ValueError(f"Invalid contract type: {contract_type}. Supported types: {list(CONTRACT_TYPES.keys())}")
-        
-        # Validate the contract
-        analysis_results = self.validator.validate(contract_data, contract_type)
+        # Parse, detect the type if needed and validate the contract
+        contract_data, contract_type, analysis_results = evaluate_contract(
+            self.parser,
+            self.validator,
+            contract_path,
+            contract_type,
+            top_types
+        )
         
         # Generate report
         report_path = self.report_generator.generate(
@@ -88,21 +81,104 @@ class SaudiAIContracts:
             "analysis_results": analysis_results,
             "report_path": report_path
         }
+    
+    def analyze_batch(self, paths, output_path, workers=None, contract_type=None, top_types=1):
+        """
+        Analyze many contracts across a process pool, without generating reports.
+        
+        Args:
+            paths (iterable): Contract files and directories of contracts
+            output_path (str): JSONL file written with one result per contract
+            workers (int, optional): Number of worker processes
+            contract_type (str, optional): Type of every contract. If None, each type is auto-detected.
+            top_types (int): Number of types to validate for ambiguous contracts
+            
+        Returns:
+            dict: Throughput statistics of the batch
+        """
+        logger.info(f"Analyzing contract batch into: {output_path}")
+        return analyze_batch(paths, output_path, workers=workers, contract_type=contract_type, top_types=top_types)
+    
+    def triage_contract(self, contract_path):
+        """
+        Detect the type and language of a contract from its first pages only.
+        
+        Args:
+            contract_path (str): Path to the contract document
+            
+        Returns:
+            dict: Detected contract type and language
+        """
+        logger.info(f"Triaging contract: {contract_path}")
+        
+        contract_data = self.parser.parse_lazy(contract_path)
+        contract_type = self.parser.detect_contract_type(
+            contract_data,
+            max_pages=EXTRACTION_SETTINGS["triage_pages"]
+        )
+        
+        return {
+            "contract_type": contract_type,
+            "language": contract_data.language
+        }
+
+def batch_main(argv):
+    """
+    Command line interface of the batch subcommand.
+    
+    Args:
+        argv (list): Arguments after "batch"
+    """
+    import json
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Saudi AI Contracts - Batch analysis of many contracts"
+    )
+    parser.add_argument("paths", nargs="+", help="Contract documents or directories of contracts")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL file for the results")
+    parser.add_argument("--workers", type=int, help="Number of worker processes")
+    parser.add_argument("--type", choices=CONTRACT_TYPES.keys(), help="Type of every contract")
+    parser.add_argument("--top-types", type=int, default=1, help="Types to validate for ambiguous contracts")
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        stats = analyze_batch(
+            args.paths,
+            args.output,
+            workers=args.workers,
+            contract_type=args.type,
+            top_types=args.top_types
+        )
+        print(json.dumps(stats, indent=2))
+        print(f"Batch completed. Results saved to: {args.output}")
+    except Exception as e:
+        logger.error(f"Error analyzing batch: {str(e)}")
+        print(f"Error: {str(e)}")
+        sys.exit(1)
 
 def main():
     """Main entry point for the command line interface."""
     import argparse
     
+    # "main.py batch ..." analyzes many contracts; any other first argument is a contract path
+    if sys.argv[1:2] == ["batch"]:
+        batch_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(description="Saudi AI Contracts - Contract Analysis System")
     parser.add_argument("contract_path", help="Path to the contract document")
     parser.add_argument("--type", choices=CONTRACT_TYPES.keys(), help="Type of contract")
+    parser.add_argument("--top-types", type=int, default=1, help="Types to validate if the detected type is ambiguous")
     parser.add_argument("--output", help="Output directory for the report")
     
     args = parser.parse_args()
     
     try:
         system = SaudiAIContracts()
-        results = system.analyze_contract(args.contract_path, args.type)
+        results = system.analyze_contract(args.contract_path, args.type, args.top_types)
         print(f"Analysis completed successfully. Report saved to: {results['report_path']}")
     except Exception as e:
         logger.error(f"Error analyzing contract: {str(e)}")
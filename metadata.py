@@ -0,0 +1,114 @@
+"""
+Contract metadata extraction module for the Saudi AI Contracts system.
+
+Every metadata field (Gregorian and Hijri dates, contracting parties) is
+matched by one precompiled pattern, an alternation of named groups, so the
+contract text is scanned once. Digits may be Western (0-9), Arabic-Indic
+(٠-٩) or Eastern Arabic-Indic (۰-۹).
+"""
+
+import re
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DIGIT = r'[0-9٠-٩۰-۹]'
+
+# Maps Arabic-Indic digits to ASCII so years can be compared
+DIGIT_TRANSLATION = str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹", "01234567890123456789")
+
+GREGORIAN_MONTHS = [
+    "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December",
+    "يناير", "فبراير", "مارس", "أبريل", "ابريل", "مايو", "يونيو", "يونيه",
+    "يوليو", "يوليه", "أغسطس", "اغسطس", "سبتمبر", "أكتوبر", "اكتوبر", "نوفمبر", "ديسمبر"
+]
+
+HIJRI_MONTHS = [
+    "محرم", "صفر", "ربيع الأول", "ربيع الاول", "ربيع الآخر", "ربيع الثاني",
+    "جمادى الأولى", "جمادى الاولى", "جمادى الآخرة", "جمادى الثانية",
+    "رجب", "شعبان", "رمضان", "شوال", "ذو القعدة", "ذي القعدة", "ذو الحجة", "ذي الحجة"
+]
+
+# Numeric dates with a year in this range are Hijri (the current Hijri year is in the 1440s)
+HIJRI_YEAR_RANGE = (1300, 1500)
+
+# Longest "between ... hereinafter" clause searched for the two parties
+PARTY_CLAUSE_MAX = 300
+
+PARTY_SEPARATOR = re.compile(r'\s+(?:and|و)\s+', re.IGNORECASE)
+
+def _alternation(words):
+    # Longest first, so no word is shadowed by one of its prefixes
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+METADATA_PATTERN = re.compile(
+    # 15/03/2024, 15-03-2024, 1445/09/01 هـ, ١٥/٠٣/١٤٤٥
+    rf'(?P<numeric_date>(?:{DIGIT}{{1,2}}(?P<sep>[/-]){DIGIT}{{1,2}}(?P=sep)(?P<year>{DIGIT}{{4}})'
+    rf'|(?P<year_first>{DIGIT}{{4}})(?P<sep2>[/-]){DIGIT}{{1,2}}(?P=sep2){DIGIT}{{1,2}})'
+    r'(?:\s*(?P<hijri_suffix>هـ|ه\b|AH\b))?)'
+    r'|'
+    # 12 رمضان 1445 هـ
+    rf'(?P<hijri_date>{DIGIT}{{1,2}}\s+(?:{_alternation(HIJRI_MONTHS)})\s+{DIGIT}{{4}}(?:\s*(?:هـ|ه\b))?)'
+    r'|'
+    # 15 March 2024, 15 مارس 2024
+    rf'(?P<gregorian_date>{DIGIT}{{1,2}}\s+(?:{_alternation(GREGORIAN_MONTHS)})\s+{DIGIT}{{4}})'
+    r'|'
+    # between X and Y hereinafter; the clause is captured without consuming it
+    rf'(?P<between>\b(?:between|بين)\b(?=\s+(?P<between_clause>[^\n]{{1,{PARTY_CLAUSE_MAX}}}?)\s+(?:hereinafter|فيما يلي)))'
+    r'|'
+    r'(?P<first_party>(?:FIRST PARTY|الطرف الأول)(?=[:\s]+(?P<first_party_name>[^\n]+)))'
+    r'|'
+    r'(?P<second_party>(?:SECOND PARTY|الطرف الثاني)(?=[:\s]+(?P<second_party_name>[^\n]+)))',
+    re.IGNORECASE
+)
+
+def _is_hijri_year(year):
+    return HIJRI_YEAR_RANGE[0] <= int(year.translate(DIGIT_TRANSLATION)) < HIJRI_YEAR_RANGE[1]
+
+def extract_metadata(text):
+    """
+    Extract contract metadata in a single scan of the text.
+    
+    Args:
+        text (str): Contract text
+        
+    Returns:
+        dict: First Gregorian date (or the first Hijri date if there is
+        none), first Hijri date, and the contracting parties
+    """
+    gregorian_date = None
+    hijri_date = None
+    between_parties = None
+    first_parties = []
+    second_parties = []
+    
+    for match in METADATA_PATTERN.finditer(text):
+        kind = match.lastgroup
+        
+        if kind == "numeric_date":
+            year = match.group("year") or match.group("year_first")
+            if match.group("hijri_suffix") or _is_hijri_year(year):
+                hijri_date = hijri_date or match.group(kind)
+            else:
+                gregorian_date = gregorian_date or match.group(kind)
+        elif kind == "hijri_date":
+            hijri_date = hijri_date or match.group(kind)
+        elif kind == "gregorian_date":
+            gregorian_date = gregorian_date or match.group(kind)
+        elif kind == "between" and between_parties is None:
+            parties = PARTY_SEPARATOR.split(match.group("between_clause"), maxsplit=1)
+            if len(parties) == 2:
+                between_parties = parties
+        elif kind == "first_party":
+            first_parties.append(match.group("first_party_name"))
+        elif kind == "second_party":
+            second_parties.append(match.group("second_party_name"))
+    
+    return {
+        "date": gregorian_date or hijri_date,
+        "hijri_date": hijri_date,
+        "parties": (between_parties or []) + first_parties + second_parties,
+        "contract_type": None
+    }
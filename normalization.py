@@ -0,0 +1,286 @@
+"""
+Arabic text normalization module for the Saudi AI Contracts system.
+
+Contract text is normalized once per document so that rules match every
+spelling variant of a keyword without listing the variants:
+
+- alef variants (أ إ آ ٱ) become bare alef (ا)
+- taa marbuta (ة) becomes haa (ه) and alef maksura (ى) becomes yaa (ي)
+- diacritics and tatweel are removed
+- Arabic-Indic digits become ASCII digits
+
+Keywords and patterns are normalized with the same function, so a rule
+written with any spelling matches text written with any other. Because
+removing characters shifts offsets, NormalizedText keeps an offset map back
+to the original text. PreparedText bundles the original, normalized and
+casefolded views of a document so that each is computed once per document.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+NORMALIZATION_TABLE = str.maketrans({
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ة": "ه",
+    "ى": "ي",
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},  # Arabic-Indic digits
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},  # Eastern Arabic-Indic digits
+    **{chr(code): None for code in range(0x064B, 0x0660)},  # Diacritics (harakat, shadda, sukun)
+    "ٰ": None,  # Superscript alef
+    "ـ": None  # Tatweel
+})
+
+# Runs of characters deleted by NORMALIZATION_TABLE
+REMOVED_CHARACTERS = re.compile('[\u064B-\u065F\u0670\u0640]+')
+
+def normalize_arabic(text):
+    """
+    Normalize Arabic spelling variants in a text.
+    
+    Args:
+        text (str): Text to normalize
+        
+    Returns:
+        str: Normalized text
+    """
+    return text.translate(NORMALIZATION_TABLE)
+
+@lru_cache(maxsize=4096)
+def normalize_literal(literal):
+    """
+    Normalize a keyword or regex pattern written in a rule.
+    
+    Rule literals are few and reused for every document, so results are cached.
+    
+    Args:
+        literal (str): Keyword or pattern
+        
+    Returns:
+        str: Normalized keyword or pattern
+    """
+    return normalize_arabic(literal)
+
+class NormalizedText:
+    """
+    Normalized view of a contract text with an offset map back to the original.
+    
+    The map only records where characters were removed, so it stays small:
+    one entry per run of diacritics or tatweel.
+    """
+    
+    __slots__ = ("original", "text", "_positions", "_shifts", "_original_ends")
+    
+    def __init__(self, original):
+        """
+        Normalize a text once.
+        
+        Args:
+            original (str): Original contract text
+        """
+        self.original = original
+        self.text = normalize_arabic(original)
+        
+        # Normalized positions after which the original is shifted by the given amount
+        self._positions = array('q')
+        self._shifts = array('q')
+        self._original_ends = None
+        if len(self.text) != len(original):
+            removed = 0
+            for match in REMOVED_CHARACTERS.finditer(original):
+                removed += match.end() - match.start()
+                self._positions.append(match.end() - removed)
+                self._shifts.append(removed)
+    
+    def __len__(self):
+        return len(self.text)
+    
+    def original_offset(self, offset):
+        """
+        Map an offset in the normalized text to the original text.
+        
+        Args:
+            offset (int): Offset into the normalized text
+            
+        Returns:
+            int: Corresponding offset into the original text
+        """
+        index = bisect_right(self._positions, offset) - 1
+        return offset + (self._shifts[index] if index >= 0 else 0)
+    
+    def normalized_offset(self, offset):
+        """
+        Map an offset in the original text to the normalized text.
+        
+        Args:
+            offset (int): Offset into the original text
+            
+        Returns:
+            int: Corresponding offset into the normalized text; an offset
+            inside a removed run maps to where the run was removed
+        """
+        if not self._positions:
+            return offset
+        if self._original_ends is None:
+            # Original offsets where each removed run ends
+            self._original_ends = array('q', (position + shift for position, shift in zip(self._positions, self._shifts)))
+        index = bisect_right(self._original_ends, offset) - 1
+        normalized = offset - (self._shifts[index] if index >= 0 else 0)
+        if index + 1 < len(self._positions):
+            normalized = min(normalized, self._positions[index + 1])
+        return normalized
+    
+    def original_span(self, start, end):
+        """
+        Map a span of the normalized text, e.g. a match, to the original text.
+        
+        Args:
+            start (int): Start offset into the normalized text
+            end (int): End offset into the normalized text
+            
+        Returns:
+            tuple: (start, end) offsets into the original text
+        """
+        if end <= start:
+            original_start = self.original_offset(start)
+            return original_start, original_start
+        # The end maps through the last character so trailing removed marks are excluded
+        return self.original_offset(start), self.original_offset(end - 1) + 1
+
+@lru_cache(maxsize=4096)
+def fold_keyword(keyword):
+    """
+    Normalize and casefold a plain keyword for matching against PreparedText.casefolded.
+    
+    Only for literal keywords: casefolding a regex pattern would turn escapes
+    such as \\S or \\D into different ones, so patterns use normalize_literal().
+    
+    Args:
+        keyword (str): Keyword
+        
+    Returns:
+        str: Normalized, casefolded keyword
+    """
+    return normalize_arabic(keyword).casefold()
+
+# Characters casefolded at a time; str.casefold() allocates a scratch buffer
+# of up to 12 bytes per character, so large texts are folded in chunks
+CASEFOLD_CHUNK_SIZE = 64 * 1024
+
+def _casefold(text):
+    """Casefold a text without a scratch buffer proportional to its whole length."""
+    if len(text) <= CASEFOLD_CHUNK_SIZE:
+        return text.casefold()
+    # Casefolding is context-free, so chunks can be folded independently
+    return "".join([
+        text[start:start + CASEFOLD_CHUNK_SIZE].casefold()
+        for start in range(0, len(text), CASEFOLD_CHUNK_SIZE)
+    ])
+
+class PreparedText:
+    """
+    Contract text prepared once per document for rule matching.
+    
+    Carries the original text and, computed on first use, the normalized
+    view (with its offset map) and the normalized, casefolded view that
+    keyword rules match against. Every view is built at most once, however
+    many rules read it; allocations counts the full-text copies made.
+    Keyword index scans of the casefolded view, and other results that rules
+    derive from the text, are cached the same way.
+    """
+    
+    __slots__ = ("original", "_normalized", "_casefolded", "_keyword_hits", "_derived", "allocations")
+    
+    def __init__(self, original):
+        """
+        Wrap a contract text.
+        
+        Args:
+            original (str): Original contract text
+        """
+        self.original = original
+        self._normalized = None
+        self._casefolded = None
+        self._keyword_hits = {}
+        self._derived = {}
+        self.allocations = 0
+    
+    def __len__(self):
+        return len(self.original)
+    
+    @property
+    def normalized_text(self):
+        """NormalizedText view, with the offset map back to the original."""
+        if self._normalized is None:
+            self._normalized = NormalizedText(self.original)
+            self.allocations += 1
+        return self._normalized
+    
+    @property
+    def normalized(self):
+        """Normalized text, for case-insensitive regex rules."""
+        return self.normalized_text.text
+    
+    @property
+    def casefolded(self):
+        """Normalized and casefolded text, for keyword rules."""
+        if self._casefolded is None:
+            self._casefolded = _casefold(self.normalized)
+            self.allocations += 1
+        return self._casefolded
+    
+    def keyword_hits(self, index):
+        """
+        Scan the casefolded view with a keyword index, once per index.
+        
+        Args:
+            index (KeywordIndex): Index compiled with fold_keyword
+            
+        Returns:
+            KeywordHits: Occurrences by keyword
+        """
+        hits = self._keyword_hits.get(index)
+        if hits is None:
+            hits = self._keyword_hits[index] = index.scan(self.casefolded)
+        return hits
+    
+    def derived(self, key, build):
+        """
+        Result derived from the text by a rule engine, built once per key.
+        
+        Args:
+            key (hashable): Identifies the result, e.g. a rule and its inputs
+            build (callable): Builds the result when it is not cached
+            
+        Returns:
+            The cached or newly built result
+        """
+        if key not in self._derived:
+            self._derived[key] = build()
+        return self._derived[key]
+    
+    def casefolded_span(self, start, end):
+        """
+        Locate a span of the original text, e.g. a section, in a casefolded view.
+        
+        The span is found in the casefolded view of the whole text without
+        copying it, unless casefolding changed the length of the text (e.g.
+        "ß" becoming "ss"); then only the span is prepared.
+        
+        Args:
+            start (int): Start offset into the original text
+            end (int): End offset into the original text
+            
+        Returns:
+            tuple: (text, start, end), the span being text[start:end]
+        """
+        normalized = self.normalized_text
+        if len(self.casefolded) == len(normalized):
+            return self.casefolded, normalized.normalized_offset(start), normalized.normalized_offset(end)
+        
+        casefolded = PreparedText(self.original[start:end]).casefolded
+        return casefolded, 0, len(casefolded)
@@ -0,0 +1,286 @@
+"""
+Quantity extraction module for the Saudi AI Contracts system.
+
+Numeric rules such as "working hours must not exceed 8 per day" or "the
+security deposit must not exceed 10%" used to run one regular expression
+each and read only its first match. Here a document is scanned once for
+every quantity, a number followed by a unit, with units normalized to days,
+hours, percent or SAR. The quantities are stored in NumPy arrays.
+
+Threshold rules are declared in the rule packs with the anchor terms that
+introduce what they limit, e.g. "probation" or "فترة التجربة". Each quantity
+is attributed to the nearest anchor term before it among the rules of its
+dimension, which yields one (number, unit, anchor term) triple per quantity.
+Every threshold of a contract type is then checked against every quantity
+with vectorized comparisons, so the second and later occurrences are caught
+as well as the first.
+"""
+
+import re
+from array import array
+
+import numpy as np
+
+from src.normalization import fold_keyword
+
+# Normalized dimensions of quantities
+DIMENSIONS = ("days", "hours", "percent", "SAR")
+
+# Units by dimension, with their size in the dimension's unit
+UNITS = {
+    "days": {
+        "day": 1, "days": 1, "يوم": 1, "يوما": 1, "أيام": 1,
+        "week": 7, "weeks": 7, "أسبوع": 7, "أسابيع": 7,
+        "month": 30, "months": 30, "شهر": 30, "شهرا": 30, "أشهر": 30, "شهور": 30,
+        "year": 365, "years": 365, "سنة": 365, "سنوات": 365, "سنين": 365, "عام": 365, "أعوام": 365
+    },
+    "hours": {
+        "hour": 1, "hours": 1, "ساعة": 1, "ساعات": 1
+    },
+    "percent": {
+        "%": 1, "٪": 1, "percent": 1, "per cent": 1, "بالمائة": 1, "في المائة": 1, "بالمئة": 1, "في المئة": 1
+    },
+    "SAR": {
+        "sar": 1, "riyal": 1, "riyals": 1, "ريال": 1, "ريالا": 1, "ريالات": 1, "ر.س": 1
+    }
+}
+
+# Period qualifiers that may follow a quantity, e.g. "8 hours per day"
+PERIODS = {
+    "day": ("per day", "a day", "each day", "daily", "يوميا", "في اليوم", "باليوم"),
+    "week": ("per week", "a week", "each week", "weekly", "أسبوعيا", "في الأسبوع", "بالأسبوع")
+}
+
+# Quantities without a period qualifier have period code 0
+PERIOD_CODES = {period: code for code, period in enumerate(PERIODS, 1)}
+
+# Folded unit -> (dimension code, factor)
+_UNIT_SIZES = {
+    fold_keyword(unit): (DIMENSIONS.index(dimension), factor)
+    for dimension, units in UNITS.items()
+    for unit, factor in units.items()
+}
+
+_NUMBER = r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?'
+_UNIT = "|".join(re.escape(unit) for unit in sorted(_UNIT_SIZES, key=len, reverse=True))
+
+# Folded qualifier -> period code
+_PERIOD_QUALIFIERS = {
+    fold_keyword(qualifier): PERIOD_CODES[period]
+    for period, qualifiers in PERIODS.items()
+    for qualifier in qualifiers
+}
+_PERIOD = "|".join(re.escape(qualifier) for qualifier in sorted(_PERIOD_QUALIFIERS, key=len, reverse=True))
+
+# A number followed by a unit and optionally a period, matched in the casefolded view of a document
+QUANTITY_PATTERN = re.compile(rf'(?<![\w.,])({_NUMBER})\s*({_UNIT})(?:\s+({_PERIOD}))?(?!\w)')
+
+class Quantities:
+    """
+    Every quantity of a document, as parallel arrays in document order.
+    
+    Attributes:
+        starts (ndarray): Start offsets into the casefolded text
+        ends (ndarray): End offsets into the casefolded text
+        values (ndarray): Values in the unit of their dimension
+        dimensions (ndarray): Indexes into DIMENSIONS
+        periods (ndarray): Codes from PERIOD_CODES, 0 if no period follows
+    """
+    
+    __slots__ = ("starts", "ends", "values", "dimensions", "periods")
+    
+    def __init__(self, starts, ends, values, dimensions, periods):
+        self.starts = np.frombuffer(starts, dtype=np.intc)
+        self.ends = np.frombuffer(ends, dtype=np.intc)
+        self.values = np.frombuffer(values, dtype=np.float64)
+        self.dimensions = np.frombuffer(dimensions, dtype=np.int8)
+        self.periods = np.frombuffer(periods, dtype=np.int8)
+    
+    def __len__(self):
+        return len(self.starts)
+
+def extract_quantities(text):
+    """
+    Find every quantity of a text in one pass.
+    
+    Args:
+        text (str): Normalized, casefolded text
+        
+    Returns:
+        Quantities: Quantities in document order
+    """
+    # Compact typed buffers, as a long contract holds many quantities
+    starts, ends, values, dimensions, periods = array('i'), array('i'), array('d'), array('b'), array('b')
+    for match in QUANTITY_PATTERN.finditer(text):
+        dimension, factor = _UNIT_SIZES[match.group(2)]
+        starts.append(match.start())
+        ends.append(match.end())
+        values.append(float(match.group(1).replace(",", "")) * factor)
+        dimensions.append(dimension)
+        periods.append(_PERIOD_QUALIFIERS[match.group(3)] if match.group(3) else 0)
+    return Quantities(starts, ends, values, dimensions, periods)
+
+def document_quantities(prepared_text):
+    """
+    Quantities of a document, extracted once however many rules read them.
+    
+    Args:
+        prepared_text (PreparedText): Contract text
+        
+    Returns:
+        Quantities: Quantities of the casefolded view
+    """
+    return prepared_text.derived("quantities", lambda: extract_quantities(prepared_text.casefolded))
+
+class ThresholdRules:
+    """
+    Threshold rules of one contract type, compiled for vectorized evaluation.
+    
+    A rule has an "id", the "anchor_keywords" introducing what it limits, the
+    "unit" (one of DIMENSIONS) it compares in, and a "min" and/or "max"
+    value; a quantity outside [min, max] violates it. A rule whose limit
+    depends on the period also has "periods", e.g. {"day": {"max": 8},
+    "week": {"max": 48}}: quantities qualified by one of these periods are
+    checked against its limits, quantities without a period against the
+    rule's own min and max, and quantities of other periods are not checked.
+    A rule without limits only claims the quantities after its anchor terms,
+    e.g. overtime hours mentioned after the working hours. An optional
+    "window" bounds the characters between the anchor term and the quantity.
+    Anchor terms only count as whole words, so "trial" is not found in
+    "industrial".
+    """
+    
+    def __init__(self, rules, window):
+        """
+        Compile threshold rules.
+        
+        Args:
+            rules (iterable): Threshold rule definitions from a rule pack
+            window (int): Default maximum characters between an anchor term
+                and its quantity
+                
+        Raises:
+            ValueError: If a rule has an unknown unit or period, or no anchor keywords
+        """
+        self.rules = tuple(rules)
+        for rule in self.rules:
+            if rule.get("unit") not in DIMENSIONS:
+                raise ValueError(f"Threshold rule {rule.get('id')} has an unknown unit: {rule.get('unit')}")
+            if not rule.get("anchor_keywords"):
+                raise ValueError(f"Threshold rule {rule.get('id')} has no anchor keywords")
+            for period in rule.get("periods", {}):
+                if period not in PERIOD_CODES:
+                    raise ValueError(f"Threshold rule {rule.get('id')} has an unknown period: {period}")
+        
+        self.dimensions = np.array([DIMENSIONS.index(rule["unit"]) for rule in self.rules], dtype=np.int8)
+        # Limits by rule and period code; unchecked periods get infinite limits
+        self.minimums = np.array([self._limits(rule, "min", -np.inf) for rule in self.rules], dtype=np.float64)
+        self.maximums = np.array([self._limits(rule, "max", np.inf) for rule in self.rules], dtype=np.float64)
+        self.windows = np.array([rule.get("window", window) for rule in self.rules], dtype=np.int32)
+        # Anchor keywords by the dimension of their rule
+        self.anchors = {}
+        for index, rule in enumerate(self.rules):
+            for keyword in rule["anchor_keywords"]:
+                self.anchors.setdefault(self.dimensions[index], []).append((keyword, len(fold_keyword(keyword)), index))
+    
+    @staticmethod
+    def _limits(rule, bound, unlimited):
+        """A rule's limit for every period code, quantities without a period first."""
+        default = rule.get(bound, unlimited)
+        periods = rule.get("periods")
+        if periods is None:
+            return [default] * (len(PERIOD_CODES) + 1)
+        return [default] + [periods.get(period, {}).get(bound, unlimited) for period in PERIOD_CODES]
+    
+    def _anchor_arrays(self, hits, anchors):
+        """(starts, ends, rule indexes) of every whole-word occurrence of some anchor keywords, sorted by start."""
+        starts, ends, rules = [], [], []
+        for keyword, length, index in anchors:
+            offsets = np.array(hits.word_offsets(keyword), dtype=np.int32)
+            starts.append(offsets)
+            ends.append(offsets + length)
+            rules.append(np.full(len(offsets), index, dtype=np.int16))
+        
+        starts = np.concatenate(starts)
+        order = np.argsort(starts, kind="stable")
+        return starts[order], np.concatenate(ends)[order], np.concatenate(rules)[order]
+    
+    def violations(self, prepared_text, hits, scopes=None):
+        """
+        Quantities of a document that violate a threshold rule.
+        
+        Args:
+            prepared_text (PreparedText): Contract text
+            hits (KeywordHits): Keyword occurrences, including every anchor keyword
+            scopes (dict, optional): (start, end) spans of the original text
+                a rule is limited to, in document order, by rule index
+                
+        Returns:
+            list: (rule, spans) for each violated rule in rule order, spans
+            being the (start, end) offsets of its violating quantities in the
+            casefolded text
+        """
+        quantities = document_quantities(prepared_text)
+        if not len(quantities):
+            return []
+        
+        # Each quantity is attributed to the nearest anchor term before it
+        # among the rules of its dimension, then compared with that rule
+        violating_positions, violating_rules = [], []
+        for dimension, anchors in self.anchors.items():
+            positions = np.flatnonzero(quantities.dimensions == dimension)
+            if not len(positions):
+                continue
+            anchor_starts, anchor_ends, anchor_rules = self._anchor_arrays(hits, anchors)
+            
+            nearest = np.searchsorted(anchor_starts, quantities.starts[positions], side="right") - 1
+            anchored = nearest >= 0
+            positions, nearest = positions[anchored], nearest[anchored]
+            rule_indexes = anchor_rules[nearest]
+            distances = quantities.starts[positions] - anchor_ends[nearest]
+            values = quantities.values[positions]
+            periods = quantities.periods[positions]
+            
+            violating = (
+                (distances >= 0)
+                & (distances <= self.windows[rule_indexes])
+                & (
+                    (values < self.minimums[rule_indexes, periods])
+                    | (values > self.maximums[rule_indexes, periods])
+                )
+            )
+            violating_positions.append(positions[violating])
+            violating_rules.append(rule_indexes[violating])
+        
+        if not violating_positions:
+            return []
+        positions = np.concatenate(violating_positions)
+        rule_indexes = np.concatenate(violating_rules)
+        
+        # Rules limited to some sections only count the quantities inside them;
+        # sections are located in the casefolded view when casefolding kept
+        # the length of the text, as it does but for rare characters
+        if scopes and len(positions) and len(prepared_text.casefolded) == len(prepared_text.normalized):
+            to_casefolded = prepared_text.normalized_text.normalized_offset
+            starts, ends = quantities.starts[positions], quantities.ends[positions]
+            inside_scope = np.ones(len(positions), dtype=bool)
+            for index, spans in scopes.items():
+                if not spans:
+                    continue
+                bounds = np.fromiter(
+                    (to_casefolded(offset) for span in spans for offset in span),
+                    dtype=np.int32,
+                    count=2 * len(spans)
+                )
+                span_starts, span_ends = bounds[0::2], bounds[1::2]
+                span = np.searchsorted(span_starts, starts, side="right") - 1
+                inside = (span >= 0) & (ends <= span_ends[np.maximum(span, 0)])
+                inside_scope &= (rule_indexes != index) | inside
+            positions, rule_indexes = positions[inside_scope], rule_indexes[inside_scope]
+        
+        results = []
+        for index in np.unique(rule_indexes):
+            rule_positions = np.sort(positions[rule_indexes == index])
+            spans = [(int(quantities.starts[position]), int(quantities.ends[position])) for position in rule_positions]
+            results.append((self.rules[index], spans))
+        return results
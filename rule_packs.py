@@ -0,0 +1,421 @@
+"""
+Rule packs module for the Saudi AI Contracts system.
+
+Requirements, keywords and violation patterns are data, not code: one rule
+pack file per contract type in the rules/ directory, in JSON (or YAML when
+PyYAML is installed). A pack holds the sections read by each engine:
+
+- detection_keywords: contract type detection (ContractParser)
+- required_clauses, required_elements, invoice_requirements: the rules
+  registered in validation_rules.RULES
+- thresholds: numeric limits checked against the quantities of a contract
+  (quantities.ThresholdRules)
+- mention_keywords, patterns: named keyword lists and regular expressions
+  the rules of validation_rules.RULES look for
+- section_types: section titles that scope those rules to sections
+- detection_keywords_by_language, requirements, compliance_reference and
+  violations: the FastAPI backend ContractAnalyzer
+
+All packs are compiled together into one immutable RulePacks: every keyword
+and every literal a violation pattern requires go into a single
+KeywordIndex, so adding a rule never adds another scan of the document.
+current_rule_packs() reloads the packs when a file changes; each RulePacks
+carries a version stamp derived from the pack contents.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from itertools import chain
+from types import MappingProxyType
+
+from src.rule_set import CompiledRuleSet
+from src.normalization import normalize_literal, fold_keyword
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+RULES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+
+RULE_PACK_EXTENSIONS = (".json", ".yaml", ".yml")
+
+# Seconds between checks of the rules directory for changed packs
+RELOAD_CHECK_INTERVAL = 1.0
+
+def load_rule_pack(path, content=None):
+    """
+    Read one rule pack file.
+    
+    Args:
+        path (str): Path to a .json, .yaml or .yml rule pack
+        content (bytes, optional): File content, if already read
+        
+    Returns:
+        dict: Rule pack
+        
+    Raises:
+        ValueError: If the file cannot be parsed or has no contract_type
+    """
+    if content is None:
+        with open(path, 'rb') as file:
+            content = file.read()
+    
+    if path.endswith(".json"):
+        try:
+            pack = json.loads(content.decode('utf-8'))
+        except ValueError as e:
+            raise ValueError(f"Invalid rule pack {path}: {str(e)}")
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"PyYAML is required to load the YAML rule pack {path}")
+        try:
+            pack = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid rule pack {path}: {str(e)}")
+    
+    if not isinstance(pack, dict) or not pack.get("contract_type"):
+        raise ValueError(f"Rule pack {path} has no contract_type")
+    
+    return pack
+
+def _freeze(value):
+    """Read-only copy of parsed pack data: mappings become mappingproxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _pack_keywords(value):
+    """Every keyword of a pack: strings under any key naming keywords, e.g. "detection_keywords_by_language"."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if "keywords" in key:
+                yield from _strings(item)
+            else:
+                yield from _pack_keywords(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _pack_keywords(item)
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+class RulePacks:
+    """
+    Immutable, compiled rule packs of every contract type.
+    
+    Attributes:
+        version (str): Stamp derived from the pack contents
+        packs (mappingproxy): Frozen pack data by contract type
+        violation_rules (CompiledRuleSet): Compiled violation patterns
+        index (KeywordIndex): Every keyword and violation literal of every pack
+    """
+    
+    __slots__ = ("version", "packs", "violation_rules", "index", "_compiled")
+    
+    def __init__(self, packs, version):
+        """
+        Compile rule packs.
+        
+        Args:
+            packs (dict): Parsed rule packs by contract type
+            version (str): Version stamp of this set of packs
+        """
+        self.version = version
+        self.packs = _freeze(packs)
+        self.violation_rules = CompiledRuleSet(
+            {contract_type: pack.get("violations", ()) for contract_type, pack in self.packs.items()},
+            keywords=chain.from_iterable(_pack_keywords(pack) for pack in packs.values())
+        )
+        self.index = self.violation_rules.index
+        self._compiled = {}
+    
+    def __contains__(self, contract_type):
+        return contract_type in self.packs
+    
+    def __getitem__(self, contract_type):
+        return self.packs[contract_type]
+    
+    @property
+    def contract_types(self):
+        """Contract types with a rule pack, in load order."""
+        return tuple(self.packs)
+    
+    def section(self, contract_type, name):
+        """
+        One section of a contract type's pack.
+        
+        Args:
+            contract_type (str): Contract type
+            name (str): Section name, e.g. "required_clauses"
+            
+        Returns:
+            Section data, or an empty tuple if the type or section is missing
+        """
+        pack = self.packs.get(contract_type)
+        return pack.get(name, ()) if pack is not None else ()
+    
+    def compiled(self, key, build):
+        """
+        Pack data compiled by a rule engine, built once per key.
+        
+        Args:
+            key (hashable): Identifies the result, e.g. an engine and a contract type
+            build (callable): Compiles the result when it is not cached
+            
+        Returns:
+            The cached or newly compiled result
+        """
+        if key not in self._compiled:
+            self._compiled[key] = build()
+        return self._compiled[key]
+    
+    def keyword_hits(self, prepared_text):
+        """
+        Occurrences of every rule keyword in a document, scanned once.
+        
+        Args:
+            prepared_text (PreparedText): Contract text
+            
+        Returns:
+            KeywordHits: Occurrences by keyword
+        """
+        return prepared_text.keyword_hits(self.index)
+    
+    def unmatched(self, prepared_text, requirements):
+        """
+        Requirements none of whose keywords occur in a document.
+        
+        Args:
+            prepared_text (PreparedText): Contract text
+            requirements (iterable): Requirements, each with a "keywords" list
+            
+        Returns:
+            list: Requirements that are missing, in the order given
+        """
+        hits = self.keyword_hits(prepared_text)
+        return [requirement for requirement in requirements if not hits.any(requirement["keywords"])]
+    
+    def section_spans(self, prepared_text, contract_sections, contract_type, section_type):
+        """
+        Sections of a type, found by the title keywords in its pack.
+        
+        Titles are matched in the casefolded view of the contract, and the
+        spans are computed once per document and section type.
+        
+        Args:
+            prepared_text (PreparedText): Contract text
+            contract_sections (SectionTree): Sections of the contract text
+            contract_type (str): Contract type
+            section_type (str): Section type, e.g. "probation"
+            
+        Returns:
+            list: (start, end) offsets of the matching sections in document
+            order; a matching subsection of a matching section is not listed
+            again
+        """
+        section_types = self.section(contract_type, "section_types") or {}
+        keywords = section_types.get(section_type, ())
+        if not keywords or contract_sections is None or contract_sections.text != prepared_text.original:
+            return []
+        
+        def find_spans():
+            title_pattern = re.compile("|".join(re.escape(fold_keyword(keyword)) for keyword in keywords))
+            spans = []
+            for section in contract_sections:
+                if spans and section.start < spans[-1][1]:
+                    continue
+                text, title_start, title_end = prepared_text.casefolded_span(*section.title_span)
+                if title_pattern.search(text, title_start, title_end):
+                    spans.append((section.start, section.end))
+            return spans
+        
+        return prepared_text.derived((self, contract_sections, contract_type, section_type), find_spans)
+    
+    def _pattern(self, pattern):
+        """A rule pattern, normalized and compiled once per pack version."""
+        return self.compiled(("section_pattern", pattern), lambda: re.compile(normalize_literal(pattern)))
+    
+    def search_text(self, pattern, prepared_text):
+        """
+        Search a whole document for a rule pattern.
+        
+        Args:
+            pattern (str): Regular expression, normalized and compiled once
+            prepared_text (PreparedText): Contract text
+            
+        Returns:
+            re.Match: First match in the casefolded text, or None
+        """
+        return self._pattern(pattern).search(prepared_text.casefolded)
+    
+    def search_section(self, pattern, prepared_text, contract_sections, contract_type, section_type):
+        """
+        Search the sections of a type for a rule pattern.
+        
+        The pattern runs over the casefolded text of each section of the type
+        in turn, so it neither scans the rest of the contract nor picks up
+        numbers from unrelated clauses. A contract without a section of the
+        type is searched whole.
+        
+        Args:
+            pattern (str): Regular expression, normalized and compiled once
+            prepared_text (PreparedText): Contract text
+            contract_sections (SectionTree): Sections of the contract text
+            contract_type (str): Contract type
+            section_type (str): Section type the rule targets
+            
+        Returns:
+            re.Match: First match, or None
+        """
+        spans = self.section_spans(prepared_text, contract_sections, contract_type, section_type)
+        if not spans:
+            return self.search_text(pattern, prepared_text)
+        
+        regex = self._pattern(pattern)
+        
+        for start, end in spans:
+            text, text_start, text_end = prepared_text.casefolded_span(start, end)
+            match = regex.search(text, text_start, text_end)
+            if match:
+                return match
+        return None
+    
+    def violations(self, prepared_text, contract_type):
+        """
+        Violation rules of a contract type that match a document.
+        
+        Args:
+            prepared_text (PreparedText): Contract text
+            contract_type (str): Contract type
+            
+        Returns:
+            list: Matching violation rules, in pack order
+        """
+        return self.violation_rules.matches(prepared_text, contract_type)
+
+def _pack_files(directory):
+    """(path, mtime_ns, size) of every rule pack file, sorted by name."""
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(RULE_PACK_EXTENSIONS):
+                stat = entry.stat()
+                files.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    return sorted(files)
+
+def load_rule_packs(directory=RULES_DIRECTORY):
+    """
+    Load and compile every rule pack in a directory.
+    
+    Args:
+        directory (str): Rules directory
+        
+    Returns:
+        RulePacks: Compiled rule packs
+        
+    Raises:
+        ValueError: If a pack is invalid or two packs share a contract type
+    """
+    packs = {}
+    digest = hashlib.sha256()
+    
+    for path, _, _ in _pack_files(directory):
+        with open(path, 'rb') as file:
+            content = file.read()
+        digest.update(os.path.basename(path).encode('utf-8') + b"\0" + content + b"\0")
+        
+        pack = load_rule_pack(path, content)
+        contract_type = pack["contract_type"]
+        if contract_type in packs:
+            raise ValueError(f"Duplicate rule pack for contract type {contract_type}: {path}")
+        packs[contract_type] = pack
+    
+    try:
+        rule_packs = RulePacks(packs, digest.hexdigest()[:12])
+    except Exception as e:
+        raise ValueError(f"Invalid rule packs in {directory}: {str(e)}")
+    
+    logger.info(f"Loaded {len(packs)} rule packs from {directory} (version {rule_packs.version})")
+    return rule_packs
+
+class RulePackLoader:
+    """
+    Serves the current rule packs of a directory, reloading them when a pack
+    file is added, removed or changed.
+    
+    A reload that fails keeps serving the previous packs. Callers take one
+    RulePacks per document, which stays consistent even if the packs are
+    reloaded meanwhile.
+    """
+    
+    def __init__(self, directory=RULES_DIRECTORY, check_interval=RELOAD_CHECK_INTERVAL):
+        """
+        Initialize the loader; packs are loaded on first use.
+        
+        Args:
+            directory (str): Rules directory
+            check_interval (float): Minimum seconds between directory checks
+        """
+        self.directory = directory
+        self.check_interval = check_interval
+        self._rule_packs = None
+        self._files = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def current(self):
+        """
+        Current rule packs.
+        
+        Returns:
+            RulePacks: Compiled rule packs
+            
+        Raises:
+            ValueError: If the packs cannot be loaded and none were loaded before
+        """
+        now = time.monotonic()
+        if self._rule_packs is not None and now - self._checked_at < self.check_interval:
+            return self._rule_packs
+        
+        with self._lock:
+            if self._rule_packs is not None and now - self._checked_at < self.check_interval:
+                return self._rule_packs
+            self._checked_at = now
+            
+            files = _pack_files(self.directory)
+            if files != self._files:
+                try:
+                    self._rule_packs = load_rule_packs(self.directory)
+                    self._files = files
+                except (OSError, ValueError) as e:
+                    if self._rule_packs is None:
+                        raise
+                    logger.error(f"Keeping rule packs version {self._rule_packs.version}: {str(e)}")
+            
+            return self._rule_packs
+
+_default_loader = RulePackLoader()
+
+def current_rule_packs():
+    """
+    Current rule packs of the default rules directory, reloaded when changed.
+    
+    Returns:
+        RulePacks: Compiled rule packs
+    """
+    return _default_loader.current()
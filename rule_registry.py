@@ -0,0 +1,193 @@
+"""
+Rule registry module for the Saudi AI Contracts system.
+
+Every contract check is registered once, under a stable ID, for the contract
+types it applies to. Running the rules of a contract type executes each check
+exactly once and returns its findings keyed by finding ID
+("<contract type>.<rule ID>", or "<contract type>.<rule ID>.<key>" for rules
+that report several findings, e.g. one per missing clause). Results from
+different stages can therefore be merged by ID in one pass, and the same
+finding can never be reported twice.
+"""
+
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Finding categories and the analysis results list each one is reported in
+CATEGORIES = {
+    "violation": "violations",
+    "risk": "risks",
+    "missing_clause": "missing_clauses"
+}
+
+def finding(category, name, description, risk_level, reference=None, recommendation=None, key=None):
+    """
+    Build a finding reported by a rule.
+    
+    Args:
+        category (str): One of CATEGORIES
+        name (str): Rule or clause name shown in reports
+        description (str): Description of the finding
+        risk_level (str): "high", "medium" or "low"
+        reference (str, optional): Legal reference
+        recommendation (str, optional): Recommended change to the contract
+        key (str, optional): Distinguishes the findings of a rule that
+            reports several, e.g. the name of a missing clause
+            
+    Returns:
+        dict: Finding; its "id" is set by RuleRegistry.run()
+    """
+    if category not in CATEGORIES:
+        raise ValueError(f"Unknown finding category: {category}")
+    return {
+        "id": key,
+        "category": category,
+        "name": name,
+        "description": description,
+        "risk_level": risk_level,
+        "reference": reference,
+        "recommendation": recommendation
+    }
+
+class RuleContext:
+    """
+    Inputs shared by every rule run on one contract.
+    """
+    
+    __slots__ = ("contract_type", "prepared_text", "contract_sections", "rule_packs")
+    
+    def __init__(self, contract_type, prepared_text, contract_sections, rule_packs):
+        """
+        Bundle the inputs of a rule run.
+        
+        Args:
+            contract_type (str): Type of contract
+            prepared_text (PreparedText): Contract text
+            contract_sections (SectionTree): Contract sections
+            rule_packs (RulePacks): Rule packs to apply
+        """
+        self.contract_type = contract_type
+        self.prepared_text = prepared_text
+        self.contract_sections = contract_sections
+        self.rule_packs = rule_packs
+    
+    @property
+    def text(self):
+        """Normalized, casefolded contract text."""
+        return self.prepared_text.casefolded
+    
+    def mentions(self, name):
+        """
+        Whether any keyword of a named list occurs in the contract.
+        
+        Args:
+            name (str): Keyword list in the "mention_keywords" section of the
+                contract type's rule pack
+                
+        Returns:
+            bool: True if at least one keyword occurs
+        """
+        keywords = (self.section("mention_keywords") or {}).get(name, ())
+        return self.rule_packs.keyword_hits(self.prepared_text).any(keywords)
+    
+    def search(self, name):
+        """
+        Search the contract for a named pattern.
+        
+        A pattern with a "section_type" searches the sections of that type,
+        or the whole contract if it has no such section; any other pattern
+        searches the whole contract.
+        
+        Args:
+            name (str): Pattern in the "patterns" section of the contract
+                type's rule pack
+                
+        Returns:
+            re.Match: First match, or None
+        """
+        rule = (self.section("patterns") or {}).get(name)
+        if rule is None:
+            return None
+        if rule.get("section_type") is None:
+            return self.rule_packs.search_text(rule["pattern"], self.prepared_text)
+        return self.rule_packs.search_section(
+            rule["pattern"],
+            self.prepared_text,
+            self.contract_sections,
+            self.contract_type,
+            rule["section_type"]
+        )
+    
+    def section(self, name):
+        """Section of the contract type's rule pack, e.g. "required_clauses"."""
+        return self.rule_packs.section(self.contract_type, name)
+
+class RuleRegistry:
+    """
+    Contract checks by contract type, each under a stable rule ID.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._rules = {}
+    
+    def rule(self, rule_id, *contract_types):
+        """
+        Register a check for contract types.
+        
+        The check is called with a RuleContext and returns the findings it
+        reports, built with finding().
+        
+        Args:
+            rule_id (str): Stable rule ID, unique within each contract type
+            *contract_types (str): Contract types the check applies to
+            
+        Returns:
+            callable: Decorator registering the check
+            
+        Raises:
+            ValueError: If the rule ID is already registered for a type
+        """
+        def register(check):
+            for contract_type in contract_types:
+                rules = self._rules.setdefault(contract_type, {})
+                if rule_id in rules:
+                    raise ValueError(f"Duplicate rule {rule_id} for contract type {contract_type}")
+                rules[rule_id] = check
+            return check
+        return register
+    
+    def rule_ids(self, contract_type):
+        """
+        IDs of the rules of a contract type, in registration order.
+        
+        Args:
+            contract_type (str): Type of contract
+            
+        Returns:
+            tuple: Rule IDs
+        """
+        return tuple(self._rules.get(contract_type, ()))
+    
+    def run(self, context):
+        """
+        Run every rule of the context's contract type once.
+        
+        Args:
+            context (RuleContext): Contract to check
+            
+        Returns:
+            dict: Findings by finding ID, in rule order
+        """
+        findings = {}
+        for rule_id, check in self._rules.get(context.contract_type, {}).items():
+            prefix = f"{context.contract_type}.{rule_id}"
+            for result in check(context) or ():
+                finding_id = prefix if result["id"] is None else f"{prefix}.{result['id']}"
+                if finding_id in findings:
+                    logger.warning(f"Rule {prefix} reported {finding_id} more than once; keeping the first")
+                    continue
+                findings[finding_id] = {**result, "id": finding_id}
+        return findings
@@ -0,0 +1,181 @@
+"""
+Compiled rule set module for the Saudi AI Contracts system.
+
+Violation rules are regular expressions such as
+(يتحمل).{0,50}(شريك|طرف).{0,50}(جميع|كل|كامل).{0,50}(الخسائر). Running each
+of them over a whole contract backtracks through every bounded gap at every
+position. CompiledRuleSet compiles the rules once and extracts from each
+pattern the literals a match must contain: one literal, or one of a few
+alternatives, for each literal part of the pattern. A document is scanned
+once for all of these literals with a KeywordIndex. A rule whose literals do
+not all occur is skipped, and a rule that starts with a literal is only tried
+at the offsets where that literal occurs.
+"""
+
+import re
+from itertools import chain
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from src.keyword_index import KeywordIndex
+from src.normalization import normalize_literal, fold_keyword
+
+# Literal parts with more alternatives than this are not used to prefilter
+MAX_ALTERNATIVES = 64
+
+def _literal_strings(items):
+    """Strings a parsed sub-pattern can match, or None if it is not a small set of literals."""
+    strings = {""}
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            options = {chr(av)}
+        elif op is sre_constants.SUBPATTERN:
+            options = _literal_strings(av[-1])
+        elif op is sre_constants.BRANCH:
+            branches = [_literal_strings(branch) for branch in av[1]]
+            options = None if None in branches else set().union(*branches)
+        elif op is sre_constants.IN and all(kind is sre_constants.LITERAL for kind, _ in av):
+            options = {chr(code) for _, code in av}
+        else:
+            return None
+        
+        if options is None:
+            return None
+        strings = {string + option for string in strings for option in options}
+        if len(strings) > MAX_ALTERNATIVES:
+            return None
+    return strings
+
+def required_literals(pattern):
+    """
+    Literal parts every match of a pattern must contain.
+    
+    Args:
+        pattern (str): Regular expression
+        
+    Returns:
+        tuple: (required, leading) where required is a list of alternative
+        sets, one of each must occur in a match, and leading is the set a
+        match must start with, or None
+    """
+    required = []
+    leading = None
+    run = []
+    
+    def close_run(at_start):
+        nonlocal leading
+        if run:
+            strings = _literal_strings(run)
+            if strings and "" not in strings:
+                required.append(frozenset(strings))
+                if at_start:
+                    leading = required[-1]
+            run.clear()
+    
+    items = list(sre_parse.parse(pattern))
+    run_starts_pattern = True
+    for op, av in items:
+        if _literal_strings([(op, av)]) is None:
+            close_run(run_starts_pattern)
+            run_starts_pattern = False
+        else:
+            run.append((op, av))
+    close_run(run_starts_pattern)
+    
+    return required, leading
+
+class CompiledRule:
+    """
+    A rule with its precompiled pattern and prefilter literals.
+    """
+    
+    __slots__ = ("rule", "regex", "required", "leading")
+    
+    def __init__(self, rule, flags=re.IGNORECASE):
+        """
+        Compile a rule.
+        
+        Args:
+            rule (dict): Rule definition with a "pattern" key
+            flags (int): Regular expression flags
+        """
+        pattern = normalize_literal(rule["pattern"])
+        self.rule = rule
+        self.regex = re.compile(pattern, flags)
+        self.required, self.leading = required_literals(pattern)
+    
+    def literals(self):
+        """Every prefilter literal of the rule."""
+        return chain.from_iterable(self.required)
+    
+    def search(self, text, hits, aligned):
+        """
+        Whether the rule matches a text.
+        
+        Args:
+            text (str): Normalized contract text
+            hits (KeywordHits): Literal occurrences in the casefolded text
+            aligned (bool): Whether offsets into the casefolded text are
+                also offsets into text
+                
+        Returns:
+            bool: True if the pattern matches somewhere in text
+        """
+        if not all(hits.any(alternatives) for alternatives in self.required):
+            return False
+        
+        if self.leading is None or not aligned:
+            return self.regex.search(text) is not None
+        
+        starts = sorted(set(chain.from_iterable(hits.offsets(literal) for literal in self.leading)))
+        return any(self.regex.match(text, start) for start in starts)
+
+class CompiledRuleSet:
+    """
+    Rules of every contract type, compiled once with a shared literal index.
+    """
+    
+    def __init__(self, rules_by_type, keywords=(), flags=re.IGNORECASE):
+        """
+        Compile every rule.
+        
+        Args:
+            rules_by_type (dict): Lists of rule definitions by contract type
+            keywords (iterable): Further keywords to compile into the literal
+                index, so that keyword checks share its scan of a document
+            flags (int): Regular expression flags of every pattern
+        """
+        self.rules = {
+            contract_type: tuple(CompiledRule(rule, flags) for rule in rules)
+            for contract_type, rules in rules_by_type.items()
+        }
+        literals = chain.from_iterable(rule.literals() for rules in self.rules.values() for rule in rules)
+        self.index = KeywordIndex(chain(literals, keywords), fold=fold_keyword)
+    
+    def __len__(self):
+        return sum(len(rules) for rules in self.rules.values())
+    
+    def matches(self, prepared_text, contract_type):
+        """
+        Rules of a contract type that match a document.
+        
+        Args:
+            prepared_text (PreparedText): Contract text
+            contract_type (str): Contract type
+            
+        Returns:
+            list: Matching rule definitions, in rule order
+        """
+        rules = self.rules.get(contract_type, ())
+        if not rules:
+            return []
+        
+        hits = prepared_text.keyword_hits(self.index)
+        text = prepared_text.normalized
+        aligned = len(prepared_text.casefolded) == len(text)
+        
+        return [compiled.rule for compiled in rules if compiled.search(text, hits, aligned)]
@@ -0,0 +1,324 @@
+"""
+Section segmentation module for the Saudi AI Contracts system.
+
+Contracts are split into sections by a single pass over their lines. Each
+line is tested once against one header pattern that covers every supported
+style: numbered headers ("1.", "2.3"), the English markers (Article,
+Section, Clause, Chapter) and the Arabic markers (المادة, البند, الفقرة,
+الفصل) from NLP_SETTINGS["section_markers"]. Segmentation time is therefore
+linear in the length of the contract.
+
+Sections are indexed as a SectionTree: parallel arrays of levels and
+character offsets into the contract text, so no section text is copied
+until a caller asks for it.
+"""
+
+import re
+import logging
+from array import array
+from bisect import bisect_right
+
+from src.config import NLP_SETTINGS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def _compile_header_pattern(section_markers):
+    """
+    Build the section header pattern from the configured markers.
+    
+    Args:
+        section_markers (dict): Marker words by language
+        
+    Returns:
+        re.Pattern: Pattern matched at the start of each line
+    """
+    markers = [marker for language_markers in section_markers.values() for marker in language_markers]
+    # Longest first, so a marker is never shadowed by one of its prefixes
+    markers.sort(key=len, reverse=True)
+    marker_alternation = "|".join(re.escape(marker) for marker in markers)
+    
+    return re.compile(
+        r'[ \t]*(?:'
+        # Article 1 / ARTICLE (2) / المادة ٣ / البند الأول
+        rf'(?P<marker>{marker_alternation})\b[ \t]*[(\[]?[ \t]*(?:\d+|[٠-٩]+|ال\w+)'
+        r'|'
+        # 1. Title / 2) Title / 2.3 Title
+        r'(?P<number>\d+(?:\.\d+)+|\d+(?=[.)]))[.)]?[ \t]+\S'
+        r')',
+        re.IGNORECASE
+    )
+
+SECTION_HEADER = _compile_header_pattern(NLP_SETTINGS["section_markers"])
+
+# Nesting level of each header style; smaller levels contain larger ones
+MARKER_LEVELS = {
+    "chapter": 1,
+    "الفصل": 1,
+    "article": 2,
+    "المادة": 2,
+    "section": 3,
+    "clause": 3,
+    "البند": 3,
+    "الفقرة": 4
+}
+DEFAULT_MARKER_LEVEL = 2
+NUMBERED_LEVEL = 4
+
+def _header_level(match):
+    """Nesting level of a matched section header."""
+    marker = match.group("marker")
+    if marker is not None:
+        return MARKER_LEVELS.get(marker.lower(), DEFAULT_MARKER_LEVEL)
+    # 1. is one level above 1.1, which is one above 1.1.1
+    return NUMBERED_LEVEL + match.group("number").count(".")
+
+def iter_section_spans(text, start=0, end=None):
+    """
+    Find the sections of a contract in one pass over its lines.
+    
+    A section runs from its header line to the last non-blank line before
+    the next header. Text before the first header is not part of a section.
+    
+    Args:
+        text (str): Contract text
+        start (int): Offset of the first line to scan
+        end (int, optional): Offset where scanning stops
+        
+    Yields:
+        tuple: (level, title_start, title_end, start, end), the header level
+        and the character offsets of the header line and of the section body
+    """
+    match_header = SECTION_HEADER.match
+    length = len(text) if end is None else end
+    current = None
+    last_content_end = start
+    position = start
+    
+    while position <= length:
+        line_end = text.find('\n', position, length)
+        if line_end == -1:
+            line_end = length
+        
+        # Strip the line by moving offsets instead of copying it
+        line_start = position
+        while line_start < line_end and text[line_start].isspace():
+            line_start += 1
+        content_end = line_end
+        while content_end > line_start and text[content_end - 1].isspace():
+            content_end -= 1
+        
+        if content_end > line_start:
+            match = match_header(text, position, line_end)
+            if match:
+                if current is not None:
+                    yield current + (last_content_end,)
+                current = (_header_level(match), line_start, content_end, line_start)
+            last_content_end = content_end
+        
+        position = line_end + 1
+    
+    if current is not None:
+        yield current + (last_content_end,)
+
+class Section:
+    """
+    View of one node of a SectionTree.
+    
+    Holds only the tree and the node index; offsets, title and text are read
+    from the tree on access.
+    """
+    
+    __slots__ = ("tree", "index")
+    
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+    
+    @property
+    def level(self):
+        return self.tree._levels[self.index]
+    
+    @property
+    def start(self):
+        return self.tree._starts[self.index]
+    
+    @property
+    def end(self):
+        """End of the section including its subsections."""
+        return self.tree._ends[self.index]
+    
+    @property
+    def title_span(self):
+        return (self.tree._title_starts[self.index], self.tree._title_ends[self.index])
+    
+    @property
+    def title(self):
+        title_start, title_end = self.title_span
+        return self.tree.text[title_start:title_end]
+    
+    @property
+    def text(self):
+        return self.tree.text[self.start:self.end]
+    
+    @property
+    def parent(self):
+        parent = self.tree._parents[self.index]
+        return Section(self.tree, parent) if parent >= 0 else None
+    
+    @property
+    def children(self):
+        return self.tree.children(self.index)
+    
+    def __eq__(self, other):
+        return isinstance(other, Section) and other.tree is self.tree and other.index == self.index
+    
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+    
+    def __repr__(self):
+        return f"Section(level={self.level}, start={self.start}, end={self.end}, title={self.title!r})"
+
+class SectionTree:
+    """
+    Hierarchical index of the sections of a contract.
+    
+    Nodes are stored in document order in parallel arrays. A node's extent
+    (start, end) covers its own body and all of its subsections, so the text
+    of any section is a single slice of the contract text.
+    """
+    
+    __slots__ = ("text", "_levels", "_starts", "_ends", "_body_ends", "_title_starts", "_title_ends", "_parents")
+    
+    def __init__(self, text, headers=()):
+        """
+        Build the tree from section headers in document order.
+        
+        Args:
+            text (str): Contract text the offsets refer to
+            headers (iterable): (level, title_start, title_end, start, body_end)
+                tuples, as yielded by iter_section_spans()
+        """
+        self.text = text
+        self._levels = array('b')
+        self._starts = array('q')
+        self._ends = array('q')
+        self._body_ends = array('q')
+        self._title_starts = array('q')
+        self._title_ends = array('q')
+        self._parents = array('q')
+        
+        # Open ancestors of the current node, outermost first
+        stack = []
+        for level, title_start, title_end, start, body_end in headers:
+            index = len(self._levels)
+            while stack and self._levels[stack[-1]] >= level:
+                stack.pop()
+            
+            self._levels.append(level)
+            self._starts.append(start)
+            self._ends.append(body_end)
+            self._body_ends.append(body_end)
+            self._title_starts.append(title_start)
+            self._title_ends.append(title_end)
+            self._parents.append(stack[-1] if stack else -1)
+            
+            # Every open ancestor now extends at least to the end of this node
+            for ancestor in stack:
+                if self._ends[ancestor] < body_end:
+                    self._ends[ancestor] = body_end
+            stack.append(index)
+    
+    def __len__(self):
+        return len(self._levels)
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("section index out of range")
+        return Section(self, index)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Section(self, index)
+    
+    def __repr__(self):
+        return f"SectionTree({len(self)} sections)"
+    
+    def headers(self):
+        """
+        List the section headers in document order.
+        
+        Returns:
+            list: (level, title_start, title_end, start, body_end) tuples
+        """
+        return list(zip(self._levels, self._title_starts, self._title_ends, self._starts, self._body_ends))
+    
+    def roots(self):
+        """Top-level sections."""
+        return [Section(self, index) for index, parent in enumerate(self._parents) if parent < 0]
+    
+    def children(self, index):
+        """Direct subsections of the section at index."""
+        children = []
+        child = index + 1
+        while child < len(self) and self._starts[child] < self._ends[index]:
+            if self._parents[child] == index:
+                children.append(Section(self, child))
+            child += 1
+        return children
+    
+    def titles(self):
+        """Titles of all sections in document order; titles may repeat."""
+        return [self.text[self._title_starts[i]:self._title_ends[i]] for i in range(len(self))]
+    
+    def find(self, title):
+        """
+        Find sections by title.
+        
+        Args:
+            title (str): Section header line
+            
+        Returns:
+            list: Every section with this title, in document order
+        """
+        return [section for section in self if section.title == title]
+    
+    def section_at(self, offset):
+        """
+        Find the innermost section containing a character offset.
+        
+        Args:
+            offset (int): Character offset into the contract text
+            
+        Returns:
+            Section: Innermost containing section, or None
+        """
+        index = bisect_right(self._starts, offset) - 1
+        while index >= 0:
+            if offset < self._ends[index]:
+                return Section(self, index)
+            index = self._parents[index]
+        return None
+    
+    def to_list(self):
+        """Serialize the headers to JSON-compatible lists (the text is not included)."""
+        return [list(header) for header in self.headers()]
+    
+    @classmethod
+    def from_list(cls, text, headers):
+        """Rebuild a tree from to_list() output and the text it was built from."""
+        return cls(text, (tuple(header) for header in headers))
+
+def segment_text(text):
+    """
+    Segment a contract into a section tree.
+    
+    Args:
+        text (str): Contract text
+        
+    Returns:
+        SectionTree: Sections of the contract
+    """
+    return SectionTree(text, iter_section_spans(text))
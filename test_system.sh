@@ -43,4 +43,22 @@ run_test "rental" "sample_contracts/rental_contract_sample.txt"
 run_test "sales" "sample_contracts/sales_contract_sample.txt"
 run_test "partnership" "sample_contracts/partnership_contract_sample.txt"
 
+# Run the unit tests
+echo "Running unit tests..."
+if python -m pytest -q tests; then
+    echo "✅ Unit tests passed"
+else
+    echo "❌ Unit tests failed"
+fi
+echo "----------------------------------------"
+
+# Check that rules share one prepared copy of a large contract
+echo "Running PreparedText allocation benchmark..."
+if python -m src.benchmark --size-mb 1; then
+    echo "✅ Benchmark passed"
+else
+    echo "❌ Benchmark failed"
+fi
+echo "----------------------------------------"
+
 echo "All tests completed."
@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the Saudi AI Contracts tests.
+
+Run from the project directory with: python -m pytest tests
+"""
+
+import os
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+import pytest
+
+# The project is imported as the src package, as in main.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+def write_docx(path, paragraphs, parts=None):
+    """
+    Write a minimal DOCX archive.
+    
+    Args:
+        path (str): Path of the DOCX file
+        paragraphs (list): Text of each body paragraph
+        parts (dict, optional): Extra archive parts by name, e.g. headers
+    """
+    body = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(paragraph)}</w:t></w:r></w:p>'
+        for paragraph in paragraphs
+    )
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{W_NAMESPACE}"><w:body>{body}</w:body></w:document>')
+        for name, content in (parts or {}).items():
+            archive.writestr(name, content)
+
+@pytest.fixture
+def docx_path(tmp_path):
+    """Path of a DOCX file written with write_docx()."""
+    return str(tmp_path / "contract.docx")
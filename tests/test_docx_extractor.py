@@ -0,0 +1,98 @@
+"""
+Tests for streaming DOCX text extraction.
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from conftest import W_NAMESPACE, write_docx
+from src.extraction import MIME_DOCX, MIME_TEXT, detect_mime_type, extract_text
+from src.extraction.docx_extractor import is_docx, iter_docx_text
+
+def part(body, root="w:document"):
+    """WordprocessingML part with the given body XML."""
+    return f'<{root} xmlns:w="{W_NAMESPACE}">{body}</{root}>'
+
+def paragraph(*runs):
+    return "<w:p>" + "".join(f"<w:r>{run}</w:r>" for run in runs) + "</w:p>"
+
+def text(value):
+    return f'<w:t xml:space="preserve">{value}</w:t>'
+
+def cell(*paragraphs):
+    return "<w:tc>" + "".join(paragraphs) + "</w:tc>"
+
+def write_parts(path, parts):
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+
+def test_paragraphs(docx_path):
+    write_docx(docx_path, ["عقد عمل", "", "Article 1: Parties"])
+    assert list(iter_docx_text(docx_path)) == ["عقد عمل", "", "Article 1: Parties"]
+
+def test_runs_tabs_and_breaks(docx_path):
+    # Tab stop definitions in the paragraph properties are not text
+    body = (
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        f'<w:r>{text("Salary:")}<w:tab/>{text("5000")}</w:r>'
+        f'<w:r><w:br/>{text("SAR")}</w:r></w:p>'
+    )
+    write_parts(docx_path, {"word/document.xml": part(f"<w:body>{body}</w:body>")})
+    assert list(iter_docx_text(docx_path)) == ["Salary:\t5000\nSAR"]
+
+def test_tables(docx_path):
+    nested = "<w:tbl><w:tr>" + cell(paragraph(text("a"))) + cell(paragraph(text("b"))) + "</w:tr></w:tbl>"
+    table = (
+        "<w:tbl>"
+        "<w:tr>" + cell(paragraph(text("Name"))) + cell(paragraph(text("Value"))) + "</w:tr>"
+        "<w:tr>" + cell(paragraph(text("Wage")), paragraph(text("monthly"))) + cell(nested) + "</w:tr>"
+        "</w:tbl>"
+    )
+    body = paragraph(text("Before")) + table + paragraph(text("After"))
+    write_parts(docx_path, {"word/document.xml": part(f"<w:body>{body}</w:body>")})
+    assert list(iter_docx_text(docx_path)) == ["Before", "Name\tValue", "Wage monthly\ta\tb", "After"]
+
+def test_headers_and_footers(docx_path):
+    write_docx(docx_path, ["Body"], parts={
+        "word/header2.xml": part(paragraph(text("Header 2")), "w:hdr"),
+        "word/header1.xml": part(paragraph(text("Header 1")), "w:hdr"),
+        "word/footer1.xml": part(paragraph(text("Footer")), "w:ftr"),
+        "word/media/header3.xml": part(paragraph(text("Not a header")), "w:hdr")
+    })
+    assert list(iter_docx_text(docx_path)) == ["Header 1", "Header 2", "Body", "Footer"]
+
+def test_streams_blocks_before_the_end_of_the_part(docx_path):
+    # The body is cut off after its first paragraph
+    document = part(f"<w:body>{paragraph(text('First'))}{paragraph(text('Second'))}</w:body>")
+    truncated = document[:document.index("<w:p>", document.index("First"))]
+    write_parts(docx_path, {"word/document.xml": truncated})
+    
+    blocks = iter_docx_text(docx_path)
+    assert next(blocks) == "First"
+    with pytest.raises(ET.ParseError):
+        next(blocks)
+
+def test_is_docx(tmp_path, docx_path):
+    write_docx(docx_path, ["Body"])
+    assert is_docx(docx_path)
+    
+    archive_path = str(tmp_path / "archive.docx")
+    write_parts(archive_path, {"contract.txt": "not a document"})
+    assert not is_docx(archive_path)
+    
+    text_path = tmp_path / "contract.docx.txt"
+    text_path.write_text("plain text", encoding="utf-8")
+    assert not is_docx(str(text_path))
+
+def test_registry_routes_docx(tmp_path, docx_path):
+    write_docx(docx_path, ["عقد عمل", "Article 1"])
+    assert detect_mime_type(docx_path) == MIME_DOCX
+    assert extract_text(docx_path) == "عقد عمل\nArticle 1\n"
+    
+    # A zip archive that is not a DOCX document is not sent to the DOCX extractor
+    archive_path = str(tmp_path / "archive.txt")
+    write_parts(archive_path, {"contract.txt": "not a document"})
+    assert detect_mime_type(archive_path) == MIME_TEXT
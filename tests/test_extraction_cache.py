@@ -0,0 +1,89 @@
+"""
+Tests for the on-disk extraction cache.
+"""
+
+import os
+import json
+import zlib
+
+import pytest
+
+from src.extraction.cache import ExtractionCache
+
+RESULT = {"text": "عقد عمل\nEmployment contract", "pages": [0, 8], "truncated": False}
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / "cache"), 1024 * 1024, "1")
+
+def entries(cache):
+    return sorted(name for name in os.listdir(cache.cache_dir) if name.endswith(".json.z"))
+
+def test_round_trip(cache):
+    assert cache.get("1-missing") is None
+    cache.put("1-abc", RESULT)
+    assert cache.get("1-abc") == RESULT
+
+def test_keys_depend_on_contents_and_version(tmp_path, cache):
+    first = tmp_path / "first.txt"
+    first.write_bytes(b"contract")
+    second = tmp_path / "second.txt"
+    second.write_bytes(b"contract")
+    assert cache.key_for(str(first)) == cache.key_for(str(second))
+    
+    second.write_bytes(b"contract v2")
+    assert cache.key_for(str(first)) != cache.key_for(str(second))
+    
+    other_version = ExtractionCache(cache.cache_dir, cache.max_size_bytes, "2")
+    assert other_version.key_for(str(first)) != cache.key_for(str(first))
+
+def test_discards_unreadable_entries(cache):
+    cache.put("1-abc", RESULT)
+    with open(os.path.join(cache.cache_dir, "1-abc.json.z"), "wb") as file:
+        file.write(b"not zlib")
+    assert cache.get("1-abc") is None
+    assert entries(cache) == []
+
+def test_skips_entries_larger_than_the_limit(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"), 16, "1")
+    cache.put("1-abc", RESULT)
+    assert entries(cache) == []
+
+def test_evicts_least_recently_used(tmp_path):
+    entry_size = len(zlib.compress(json.dumps({"text": "0" * 100}, separators=(',', ':')).encode('utf-8')))
+    cache = ExtractionCache(str(tmp_path / "cache"), 3 * entry_size, "1")
+    for index in range(3):
+        cache.put(f"1-{index}", {"text": str(index) * 100})
+        path = os.path.join(cache.cache_dir, f"1-{index}.json.z")
+        os.utime(path, (index, index))
+    
+    # Reading entry 0 makes entry 1 the least recently used
+    assert cache.get("1-0") is not None
+    cache.put("1-3", {"text": "3" * 100})
+    assert entries(cache) == ["1-0.json.z", "1-2.json.z", "1-3.json.z"]
+
+def test_scans_only_when_over_the_limit(tmp_path, monkeypatch):
+    scans = []
+    scandir = os.scandir
+    
+    def counting_scandir(path):
+        scans.append(path)
+        return scandir(path)
+    
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    cache = ExtractionCache(str(tmp_path / "cache"), 1024 * 1024, "1")
+    for index in range(50):
+        cache.put(f"1-{index}", RESULT)
+    
+    # One scan measures the directory; the total is tracked from then on
+    assert len(scans) == 1
+    
+    # Rewriting an entry does not count it twice
+    for _ in range(10):
+        cache.put("1-0", RESULT)
+    assert cache._total_size == sum(os.path.getsize(os.path.join(cache.cache_dir, name)) for name in entries(cache))
+    
+    cache.max_size_bytes = cache._total_size
+    cache.put("1-50", RESULT)
+    assert len(scans) == 2
+    assert len(entries(cache)) == 50
@@ -0,0 +1,52 @@
+"""
+Tests for the multi-keyword index (KeywordIndex and KeywordHits).
+"""
+
+import random
+
+from src.keyword_index import KeywordIndex
+from src.normalization import PreparedText, fold_keyword
+
+def find_all(keyword, text):
+    """Offsets of every occurrence of a keyword, overlapping ones included."""
+    offsets = []
+    position = text.find(keyword)
+    while position != -1:
+        offsets.append(position)
+        position = text.find(keyword, position + 1)
+    return offsets
+
+def test_scan_matches_find():
+    keywords = ["he", "she", "his", "hers", "ه", "هه", "a", "aa"]
+    index = KeywordIndex(keywords)
+    generator = random.Random(0)
+    for _ in range(50):
+        text = "".join(generator.choice("hersa ه") for _ in range(generator.randint(0, 200)))
+        hits = index.scan(text)
+        for keyword in keywords:
+            assert list(hits.offsets(keyword)) == find_all(keyword, text)
+
+def test_lookups_fold_keywords():
+    index = KeywordIndex(["Working Hours", "فترة التجربة"], fold=fold_keyword)
+    hits = index.scan(PreparedText("WORKING HOURS and فترةُ التجربة").casefolded)
+    assert hits.any(["working hours"])
+    assert hits.first("فترة التجربة") == 18
+    assert hits.count(["Working Hours", "فترة التجربة", "annual leave"]) == 2
+    assert "annual leave" not in hits
+
+def test_word_offsets_skip_parts_of_words():
+    index = KeywordIndex(["trial", "leave"])
+    hits = index.scan("our industrial site; trial period; leaves; leave_days; (trial)")
+    assert list(hits.offsets("trial")) == [9, 21, 56]
+    assert list(hits.word_offsets("trial")) == [21, 56]
+    assert list(hits.word_offsets("leave")) == []
+
+def test_word_offsets_allow_arabic_proclitics():
+    keywords = ["الدوام", "تجربه"]
+    index = KeywordIndex(keywords, fold=fold_keyword)
+    text = PreparedText("بالدوام الرسمي، والتجربة، وتجربة، مستجربة").casefolded
+    hits = index.scan(text)
+    assert [text[offset - 1] for offset in hits.word_offsets("الدوام")] == ["ب"]
+    # "والتجربة" and "وتجربة" are the word with proclitics; "مستجربة" is another word
+    assert len(hits.offsets("تجربه")) == 3
+    assert len(hits.word_offsets("تجربه")) == 2
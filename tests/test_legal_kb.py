@@ -0,0 +1,103 @@
+"""
+Tests for the compiled legal knowledge base.
+"""
+
+import os
+
+import pytest
+
+from src.legal_kb import LegalKB, build_legal_kb, compile_legal_kb, load_legal_kb, open_legal_kb
+
+LABOR_LAW = """# Key Articles
+
+## Working Hours (Article 77)
+- Maximum working hours: 8 hours per day or 48 hours per week
+- During Ramadan: 6 hours per day
+
+## Probation Period Limitations (Articles 74-75)
+- Maximum probation period: 90 days
+
+## Contract Termination (Articles 74-83)
+- Notice period requirements
+"""
+
+WORK_DOCUMENT = """## Working Hours and Overtime
+- Overtime must be recorded
+"""
+
+@pytest.fixture
+def references(tmp_path):
+    labor_law = tmp_path / "labor_law.md"
+    labor_law.write_text(LABOR_LAW, encoding="utf-8")
+    work_document = tmp_path / "work_document.md"
+    work_document.write_text(WORK_DOCUMENT, encoding="utf-8")
+    return {
+        "employment": {
+            "labor_law": str(labor_law),
+            "unified_work_document": str(work_document)
+        },
+        "rental": {
+            "ejar": str(tmp_path / "missing.md")
+        }
+    }
+
+@pytest.fixture
+def kb(tmp_path, references):
+    path = str(tmp_path / "legal_kb.bin")
+    build_legal_kb(path, references)
+    kb = open_legal_kb(path)
+    yield kb
+    kb.close()
+
+def test_rules_round_trip(kb):
+    assert len(kb) == 5
+    assert kb.contract_types == ("employment", "rental")
+    assert kb.rule_count("employment") == 5
+    assert kb.rule_count("rental") == 0
+    assert kb.rule_count("sales") == 0
+    
+    rules = kb["employment"]
+    assert [rule["rule"] for rule in rules["unified_work_document"]] == ["Overtime must be recorded"]
+    assert rules["labor_law"][-1] == {"section": "Contract Termination (Articles 74-83)", "rule": "Notice period requirements"}
+    assert len(rules["labor_law"][1:3]) == 2
+    with pytest.raises(IndexError):
+        rules["labor_law"][4]
+
+def test_in_memory_matches_mapped(kb, references):
+    in_memory = LegalKB(compile_legal_kb(references))
+    assert in_memory.version == kb.version
+    assert list(in_memory["employment"]["labor_law"]) == list(kb["employment"]["labor_law"])
+
+@pytest.mark.parametrize("reference, expected", [
+    ("Labor Law Article 77", ["Maximum working hours: 8 hours per day or 48 hours per week", "During Ramadan: 6 hours per day"]),
+    ("Labor Law Articles 74-75", ["Maximum probation period: 90 days"]),
+    ("المادة 80 من نظام العمل السعودي", ["Notice period requirements"]),
+    ("Labor Law Article 12", []),
+    ("Unified Work Document Article 77", []),
+    ("Ejar Regulations", []),
+    (None, []),
+])
+def test_cited_rules(kb, reference, expected):
+    assert [rule["rule"] for rule in kb.cited_rules("employment", reference)] == expected
+
+def test_rejects_other_formats():
+    with pytest.raises(ValueError):
+        LegalKB(b"SAKB")
+    with pytest.raises(ValueError):
+        LegalKB(b"XXXX" + bytes(12))
+
+def test_rebuilds_when_source_changes(tmp_path, references):
+    path = str(tmp_path / "legal_kb.bin")
+    kb = load_legal_kb(path, references)
+    assert load_legal_kb(path, references) is kb
+    
+    labor_law = references["employment"]["labor_law"]
+    with open(labor_law, "a", encoding="utf-8") as file:
+        file.write("- Employers may exceed these limits with proper compensation\n")
+    stat = os.stat(labor_law)
+    os.utime(labor_law, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    rebuilt = load_legal_kb(path, references)
+    assert rebuilt is not kb
+    assert rebuilt.version != kb.version
+    assert rebuilt.rule_count("employment") == 6
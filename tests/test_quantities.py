@@ -0,0 +1,68 @@
+"""
+Tests for quantity extraction and threshold rules.
+"""
+
+import pytest
+
+from src.normalization import PreparedText
+from src.quantities import DIMENSIONS, PERIOD_CODES, ThresholdRules, extract_quantities
+from src.sections import segment_text
+from src.validation_rules import ValidationRules
+
+# Clauses separated by more than the anchor window
+FILLER = " The employer shall provide the employee with the tools required for the work." * 3
+
+def threshold_findings(text, contract_type="employment"):
+    """Threshold findings of a contract, description by finding ID."""
+    findings = ValidationRules.validate(contract_type, PreparedText(text), segment_text(text))
+    return {finding_id: finding["description"] for finding_id, finding in findings.items() if ".thresholds." in finding_id}
+
+def test_extract_quantities():
+    quantities = extract_quantities(PreparedText("10 hours per day, 15%, 1,500 riyals, ٤ أشهر, 2 weeks").casefolded)
+    assert list(quantities.values) == [10, 15, 1500, 120, 14]
+    assert [DIMENSIONS[dimension] for dimension in quantities.dimensions] == ["hours", "percent", "SAR", "days", "days"]
+    assert list(quantities.periods) == [PERIOD_CODES["day"], 0, 0, 0, 0]
+
+def test_numbers_inside_words_are_not_quantities():
+    assert len(extract_quantities("a12 days, v2.5 hours")) == 0
+
+@pytest.mark.parametrize("text, exceeds", [
+    ("يعمل الموظف 48 ساعة أسبوعياً", False),
+    ("The employee shall work 40 hours per week", False),
+    ("Working hours: 8 hours per day; overtime is paid at 150% for the first 10 hours", False),
+    ("Working hours: 10 hours per day", True),
+    ("ساعات العمل 50 ساعة أسبوعياً", True),
+    ("Working hours: the employee shall work 10 hours.", True),
+    ("The employee shall work 10 hours per day", True)
+])
+def test_working_hour_periods(text, exceeds):
+    assert ("employment.thresholds.working_hours" in threshold_findings(text)) == exceeds
+
+def test_every_occurrence_is_checked():
+    findings = threshold_findings("Probation 60 days." + FILLER + " Probation may be extended by 100 days.")
+    assert "(100 days)" in findings["employment.thresholds.probation_period"]
+
+def test_quantity_attributed_to_nearest_anchor():
+    findings = threshold_findings("Annual leave 30 days. Probation 100 days.")
+    assert set(findings) == {"employment.thresholds.probation_period"}
+
+def test_anchor_inside_word_is_ignored():
+    text = "Probation period: 60 days." + FILLER + " Work is performed at our industrial site. The notice is 120 days."
+    assert threshold_findings(text) == {}
+
+def test_anchor_with_arabic_proclitic():
+    assert "employment.thresholds.working_hours" in threshold_findings("يلتزم العامل بالدوام 10 ساعات يوميا")
+
+def test_description_quotes_original_text():
+    findings = threshold_findings("فترة التجربة ١٢٠ يوماً")
+    assert "(١٢٠ يوماً)" in findings["employment.thresholds.probation_period"]
+
+def test_section_scope():
+    text = "Article 1: Probation\nProbation lasts 60 days.\nArticle 2: Term\nThe probation clause above; the term is 365 days.\n"
+    assert threshold_findings(text) == {}
+
+def test_rule_validation():
+    with pytest.raises(ValueError):
+        ThresholdRules([{"id": "x", "anchor_keywords": ["x"], "unit": "minutes"}], 200)
+    with pytest.raises(ValueError):
+        ThresholdRules([{"id": "x", "anchor_keywords": ["x"], "unit": "hours", "periods": {"month": {"max": 1}}}], 200)
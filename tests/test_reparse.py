@@ -0,0 +1,85 @@
+"""
+Tests for incremental re-parsing of revised contracts (ContractParser.reparse).
+"""
+
+import random
+
+import pytest
+
+from conftest import write_docx
+from src.config import CACHE_SETTINGS
+from src.contract_parser import ContractParser
+
+PARAGRAPHS = [
+    "Article 1: Parties",
+    "The employer agrees to employ the employee.",
+    "",
+    "Article 2: Wages",
+    "The salary is paid monthly.",
+    "1. Allowances",
+    "  2.1 Housing allowance",
+    "Housing is paid with the salary.",
+    "المادة ٣ الإجازات",
+    "يستحق العامل إجازة سنوية.",
+    "Clause 4 Notice",
+    "Either party may terminate the contract.",
+    "   "
+]
+
+@pytest.fixture
+def parser(monkeypatch):
+    """Contract parser that does not read or write the extraction cache."""
+    monkeypatch.setitem(CACHE_SETTINGS, "enabled", False)
+    return ContractParser()
+
+def assert_reparse_matches_parse(parser, docx_path, old_paragraphs, new_paragraphs):
+    """Re-parse an edit and compare it with a full parse of the revised document."""
+    write_docx(docx_path, old_paragraphs)
+    previous = parser.parse(docx_path)
+    
+    write_docx(docx_path, new_paragraphs)
+    reparsed = parser.reparse(docx_path, previous)
+    parsed = parser.parse(docx_path)
+    
+    assert reparsed["text"] == parsed["text"]
+    assert reparsed["sections"].headers() == parsed["sections"].headers()
+
+def test_insert_at_section_end(parser, docx_path):
+    old = ["Article 1: Parties", "The employer.", "Article 2: Wages", "The salary."]
+    new = ["Article 1: Parties", "The employer.", "An added paragraph at the end.", "Article 2: Wages", "The salary."]
+    assert_reparse_matches_parse(parser, docx_path, old, new)
+
+def test_delete_at_section_end(parser, docx_path):
+    old = ["Article 1: Parties", "The employer.", "The last paragraph.", "Article 2: Wages", "The salary."]
+    new = ["Article 1: Parties", "The employer.", "Article 2: Wages", "The salary."]
+    assert_reparse_matches_parse(parser, docx_path, old, new)
+
+def test_edit_at_section_end(parser, docx_path):
+    old = ["Article 1: Parties", "The employer.", "Article 2: Wages", "The salary."]
+    new = ["Article 1: Parties", "The employer, a company.", "Article 2: Wages", "The salary."]
+    assert_reparse_matches_parse(parser, docx_path, old, new)
+
+def test_edit_adding_header(parser, docx_path):
+    old = ["Article 1: Parties", "The employer.", "Article 2: Wages", "The salary."]
+    new = ["Article 1: Parties", "Article 3: Term", "The employer.", "Article 2: Wages", "The salary."]
+    assert_reparse_matches_parse(parser, docx_path, old, new)
+
+def test_unchanged_document(parser, docx_path):
+    assert_reparse_matches_parse(parser, docx_path, PARAGRAPHS, PARAGRAPHS)
+
+@pytest.mark.parametrize("seed", range(100))
+def test_random_edits(parser, docx_path, seed):
+    generator = random.Random(seed)
+    old = [generator.choice(PARAGRAPHS) for _ in range(generator.randint(5, 25))]
+    new = list(old)
+    for _ in range(generator.randint(1, 3)):
+        index = generator.randrange(len(new) + 1)
+        operation = generator.choice("ide")
+        if operation == "i":
+            new.insert(index, generator.choice(PARAGRAPHS))
+        elif index < len(new):
+            if operation == "d":
+                del new[index]
+            else:
+                new[index] = generator.choice(PARAGRAPHS)
+    assert_reparse_matches_parse(parser, docx_path, old, new)
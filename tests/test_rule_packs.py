@@ -0,0 +1,114 @@
+"""
+Tests for loading and hot-reloading rule packs.
+"""
+
+import os
+import json
+
+import pytest
+
+from src.normalization import PreparedText
+from src.rule_packs import RulePackLoader, load_rule_packs
+
+EMPLOYMENT = {
+    "contract_type": "employment",
+    "required_clauses": [
+        {"name": "salary", "keywords": ["salary", "الراتب"], "description": "Salary must be stated", "risk_level": "high"}
+    ],
+    "violations": [
+        {"pattern": "فترة\\s+تجربة.{0,50}(سنة|سنتين)", "description": "Probation too long", "severity": "high"}
+    ]
+}
+
+RENTAL = {
+    "contract_type": "rental",
+    "required_clauses": [
+        {"name": "rent_amount", "keywords": ["rent amount"], "description": "Rent must be stated", "risk_level": "high"}
+    ]
+}
+
+def write_pack(directory, name, pack):
+    path = directory / name
+    path.write_text(json.dumps(pack, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    # Give every rewrite a distinct modification time, whatever the file system's resolution
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return path
+
+@pytest.fixture
+def rules_directory(tmp_path):
+    write_pack(tmp_path, "employment.json", EMPLOYMENT)
+    return tmp_path
+
+def test_load_rule_packs(rules_directory):
+    rule_packs = load_rule_packs(str(rules_directory))
+    assert rule_packs.contract_types == ("employment",)
+    assert rule_packs.section("employment", "required_clauses")[0]["name"] == "salary"
+    assert rule_packs.section("rental", "required_clauses") == ()
+    
+    # Pack data is frozen
+    with pytest.raises(TypeError):
+        rule_packs["employment"]["required_clauses"][0]["name"] = "wage"
+    
+    text = PreparedText("مدة فترة تجربة العامل سنة كاملة")
+    assert [rule["description"] for rule in rule_packs.violations(text, "employment")] == ["Probation too long"]
+    assert [clause["name"] for clause in rule_packs.unmatched(text, rule_packs.section("employment", "required_clauses"))] == ["salary"]
+
+def test_version_follows_contents(rules_directory):
+    version = load_rule_packs(str(rules_directory)).version
+    assert load_rule_packs(str(rules_directory)).version == version
+    
+    write_pack(rules_directory, "employment.json", {**EMPLOYMENT, "violations": []})
+    assert load_rule_packs(str(rules_directory)).version != version
+
+def test_rejects_invalid_packs(rules_directory):
+    write_pack(rules_directory, "duplicate.json", EMPLOYMENT)
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_rule_packs(str(rules_directory))
+    
+    os.remove(rules_directory / "duplicate.json")
+    write_pack(rules_directory, "untyped.json", {"required_clauses": []})
+    with pytest.raises(ValueError, match="no contract_type"):
+        load_rule_packs(str(rules_directory))
+
+def test_hot_reload(rules_directory):
+    loader = RulePackLoader(str(rules_directory), check_interval=0)
+    first = loader.current()
+    assert loader.current() is first
+    
+    # A new pack is picked up on the next call
+    write_pack(rules_directory, "rental.json", RENTAL)
+    second = loader.current()
+    assert second is not first
+    assert second.contract_types == ("employment", "rental")
+    assert second.version != first.version
+    
+    # Packs taken before the reload are unchanged
+    assert first.contract_types == ("employment",)
+    
+    # Edited packs are recompiled
+    write_pack(rules_directory, "employment.json", {**EMPLOYMENT, "violations": []})
+    third = loader.current()
+    assert third.violations(PreparedText("فترة تجربة سنة"), "employment") == []
+
+def test_failed_reload_keeps_previous_packs(rules_directory):
+    loader = RulePackLoader(str(rules_directory), check_interval=0)
+    first = loader.current()
+    
+    (rules_directory / "broken.json").write_text("{", encoding="utf-8")
+    assert loader.current() is first
+    
+    # Once fixed, the pack is loaded; packs load in file name order
+    write_pack(rules_directory, "broken.json", RENTAL)
+    assert loader.current().contract_types == ("rental", "employment")
+
+def test_checks_directory_at_most_once_per_interval(rules_directory):
+    loader = RulePackLoader(str(rules_directory), check_interval=3600)
+    first = loader.current()
+    write_pack(rules_directory, "rental.json", RENTAL)
+    assert loader.current() is first
+
+def test_first_load_failure_raises(tmp_path):
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    with pytest.raises(ValueError):
+        RulePackLoader(str(tmp_path), check_interval=0).current()
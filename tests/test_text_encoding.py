@@ -0,0 +1,61 @@
+"""
+Tests for plain-text encoding detection and decoding.
+"""
+
+import codecs
+
+import pytest
+
+from src.extraction.text_encoding import decode_buffer, detect_encoding, read_text_file
+
+ARABIC = "عقد عمل بين صاحب العمل والعامل، مدة فترة التجربة (90 يوماً).\n" * 20
+ENGLISH = "This employment contract is made between the Employer and the Employee.\n" * 20
+MIXED = "صاحب العمل: ACME Trading Ltd. - رقم السجل التجاري 1010123456\n" * 20
+
+@pytest.mark.parametrize("text", [ARABIC, ENGLISH, MIXED], ids=["arabic", "english", "mixed"])
+@pytest.mark.parametrize("encoding", ["utf-16-le", "utf-16-be"])
+def test_detects_bomless_utf16(text, encoding):
+    assert detect_encoding(text.encode(encoding)) == encoding
+
+@pytest.mark.parametrize("text", [ARABIC, ENGLISH, MIXED], ids=["arabic", "english", "mixed"])
+def test_detects_utf8(text):
+    assert detect_encoding(text.encode("utf-8")) == "utf-8"
+
+@pytest.mark.parametrize("text", [ARABIC, MIXED], ids=["arabic", "mixed"])
+def test_detects_cp1256(text):
+    assert detect_encoding(text.encode("cp1256")) == "cp1256"
+
+@pytest.mark.parametrize("bom, encoding", [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+])
+def test_detects_byte_order_marks(bom, encoding):
+    assert detect_encoding(bom + b"abc") == encoding
+
+def test_utf8_cut_by_sample_boundary():
+    # The sample ends in the middle of a two-byte Arabic character
+    sample = ARABIC.encode("utf-8")[:101]
+    assert detect_encoding(sample) == "utf-8"
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-16-be", "cp1256"])
+def test_decode_buffer_round_trip(encoding):
+    assert decode_buffer(MIXED.encode(encoding)) == MIXED
+
+def test_decode_buffer_falls_back_after_sample(monkeypatch):
+    # Valid UTF-8 in the sample, CP1256 further into the file
+    monkeypatch.setattr("src.extraction.text_encoding.SAMPLE_SIZE", 16)
+    buffer = ENGLISH.encode("utf-8") + ARABIC.encode("cp1256")
+    assert decode_buffer(buffer) == ENGLISH + ARABIC
+
+@pytest.mark.parametrize("mmap_threshold", [1, 1 << 30])
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16-le", "cp1256"])
+def test_read_text_file(tmp_path, encoding, mmap_threshold):
+    path = tmp_path / "contract.txt"
+    path.write_bytes(MIXED.encode(encoding))
+    assert read_text_file(str(path), mmap_threshold) == MIXED
+
+def test_read_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert read_text_file(str(path), 1) == ""
@@ -1,393 +1,252 @@
 """
 Validation rules module for the Saudi AI Contracts system.
+
+Every check of every contract type is registered in RULES under a stable ID,
+so ContractAnalyzer and ContractValidator run each of them exactly once per
+contract and receive its findings keyed by ID.
 """
 
-import re
 import logging
-from datetime import datetime
+
+from src.config import CONTRACT_TYPES, NLP_SETTINGS
+from src.normalization import REMOVED_CHARACTERS
+from src.rule_packs import current_rule_packs
+from src.rule_registry import RuleRegistry, RuleContext, finding
+from src.quantities import ThresholdRules
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-class ValidationRules:
-    """
-    Validation rules for different contract types based on Saudi laws.
+RULES = RuleRegistry()
+
+def _required_clauses(context):
     """
+    Required clauses and elements of the contract type, merged by name.
     
-    @staticmethod
-    def validate_employment_contract(contract_text, contract_sections):
-        """
-        Validate employment contract against Saudi Labor Law.
-        
-        Args:
-            contract_text (str): Full contract text
-            contract_sections (dict): Contract sections
-            
-        Returns:
-            list: Validation results
-        """
-        results = []
-        
-        # Check for required elements
-        required_elements = [
-            {
-                "name": "employee_details",
-                "keywords": ["employee name", "employee id", "اسم الموظف", "رقم هوية الموظف"],
-                "description": "Employee personal details",
-                "article": "Labor Law Article 8"
-            },
-            {
-                "name": "employer_details",
-                "keywords": ["employer name", "company name", "اسم صاحب العمل", "اسم الشركة"],
-                "description": "Employer details",
-                "article": "Labor Law Article 8"
-            },
-            {
-                "name": "job_title",
-                "keywords": ["job title", "position", "المسمى الوظيفي", "الوظيفة"],
-                "description": "Job title and description",
-                "article": "Labor Law Article 8"
-            },
-            {
-                "name": "salary",
-                "keywords": ["salary", "wage", "compensation", "راتب", "أجر"],
-                "description": "Salary amount",
-                "article": "Labor Law Article 8"
-            },
-            {
-                "name": "work_location",
-                "keywords": ["work location", "workplace", "مكان العمل", "موقع العمل"],
-                "description": "Work location",
-                "article": "Labor Law Article 8"
-            },
-            {
-                "name": "contract_duration",
-                "keywords": ["contract duration", "term", "مدة العقد", "فترة العقد"],
-                "description": "Contract duration",
-                "article": "Labor Law Article 8"
+    A clause listed in both required_clauses and required_elements is one
+    requirement, present if any keyword of either list occurs.
+    """
+    merged = {}
+    for requirement in (*context.section("required_clauses"), *context.section("required_elements")):
+        name = requirement["name"]
+        if name not in merged:
+            merged[name] = {
+                "name": name,
+                "keywords": list(requirement["keywords"]),
+                "description": requirement["description"],
+                "risk_level": requirement.get("risk_level", "high"),
+                "article": requirement.get("article")
             }
-        ]
-        
-        for element in required_elements:
-            found = False
-            for keyword in element["keywords"]:
-                if keyword in contract_text.lower():
-                    found = True
-                    break
-            
-            if not found:
-                results.append({
-                    "type": "missing_element",
-                    "element": element["name"],
-                    "description": f"Missing required element: {element['description']}",
-                    "article": element["article"],
-                    "severity": "high"
-                })
-        
-        # Validate working hours
-        if "working hours" in contract_text.lower() or "ساعات العمل" in contract_text.lower():
-            hours_pattern = r'(\d+)\s*(?:hours|hour|ساعة|ساعات)'
-            hours_match = re.search(hours_pattern, contract_text.lower())
-            
-            if hours_match:
-                hours = int(hours_match.group(1))
-                if hours > 8:
-                    results.append({
-                        "type": "illegal_provision",
-                        "element": "working_hours",
-                        "description": f"Working hours ({hours}) exceed the legal limit of 8 hours per day",
-                        "article": "Labor Law Article 77",
-                        "severity": "high"
-                    })
-        else:
-            results.append({
-                "type": "missing_element",
-                "element": "working_hours",
-                "description": "Working hours not specified",
-                "article": "Labor Law Article 77",
-                "severity": "medium"
-            })
-        
-        # Validate probation period
-        probation_pattern = r'(?:probation|trial|تجربة|اختبار).*?(\d+)\s*(?:days|day|months|month|يوم|أيام|شهر|أشهر)'
-        probation_match = re.search(probation_pattern, contract_text.lower())
-        
-        if probation_match:
-            period = int(probation_match.group(1))
-            unit = probation_match.group(2).lower() if len(probation_match.groups()) > 1 else ""
-            
-            if ('month' in unit or 'شهر' in unit) and period > 3:
-                results.append({
-                    "type": "illegal_provision",
-                    "element": "probation_period",
-                    "description": f"Probation period ({period} months) exceeds the legal limit of 3 months",
-                    "article": "Labor Law Articles 74-75",
-                    "severity": "high"
-                })
-            elif ('day' in unit or 'يوم' in unit) and period > 90:
-                results.append({
-                    "type": "illegal_provision",
-                    "element": "probation_period",
-                    "description": f"Probation period ({period} days) exceeds the legal limit of 90 days",
-                    "article": "Labor Law Articles 74-75",
-                    "severity": "high"
-                })
-        
-        # Validate annual leave
-        leave_pattern = r'(?:annual leave|vacation|إجازة سنوية).*?(\d+)\s*(?:days|day|يوم|أيام)'
-        leave_match = re.search(leave_pattern, contract_text.lower())
-        
-        if leave_match:
-            days = int(leave_match.group(1))
-            if days < 21:
-                results.append({
-                    "type": "illegal_provision",
-                    "element": "annual_leave",
-                    "description": f"Annual leave ({days} days) is less than the legal minimum of 21 days",
-                    "article": "Labor Law Article 84",
-                    "severity": "high"
-                })
-        else:
-            results.append({
-                "type": "missing_element",
-                "element": "annual_leave",
-                "description": "Annual leave entitlement not specified",
-                "article": "Labor Law Article 84",
-                "severity": "medium"
-            })
-        
-        # Validate non-compete clause
-        if "non-compete" in contract_text.lower() or "عدم المنافسة" in contract_text.lower():
-            # Check for excessive duration
-            duration_pattern = r'(?:non-compete|عدم المنافسة).*?(\d+)\s*(?:years|year|سنة|سنوات)'
-            duration_match = re.search(duration_pattern, contract_text.lower())
-            
-            if duration_match and int(duration_match.group(1)) > 2:
-                results.append({
-                    "type": "illegal_provision",
-                    "element": "non_compete",
-                    "description": f"Non-compete clause duration ({int(duration_match.group(1))} years) exceeds the legal limit of 2 years",
-                    "article": "Labor Law Article 83",
-                    "severity": "medium"
-                })
-        
-        return results
+            continue
+        existing = merged[name]
+        existing["keywords"].extend(keyword for keyword in requirement["keywords"] if keyword not in existing["keywords"])
+        existing["article"] = existing["article"] or requirement.get("article")
+    return list(merged.values())
+
+@RULES.rule("required_clauses", *CONTRACT_TYPES)
+def check_required_clauses(context):
+    """Required clauses of the contract type that are missing."""
+    return [
+        finding(
+            "missing_clause",
+            requirement["name"],
+            requirement["description"],
+            requirement["risk_level"],
+            reference=requirement["article"],
+            recommendation=f"Add a clause specifying {requirement['name']}",
+            key=requirement["name"]
+        )
+        for requirement in context.rule_packs.unmatched(context.prepared_text, _required_clauses(context))
+    ]
+
+def _original_text(prepared_text, start, end):
+    """Text of the contract as written at a span of its casefolded view."""
+    if len(prepared_text.casefolded) != len(prepared_text.normalized):
+        # Offsets of the two views differ only for rare characters, e.g. "ß"
+        return prepared_text.casefolded[start:end]
+    start, end = prepared_text.normalized_text.original_span(start, end)
+    # Keep the diacritics written on the last letter, e.g. the tanween of "يوماً"
+    marks = REMOVED_CHARACTERS.match(prepared_text.original, end)
+    return prepared_text.original[start:marks.end() if marks else end]
+
+@RULES.rule("thresholds", *CONTRACT_TYPES)
+def check_thresholds(context):
+    """Quantities outside the limits of the contract type's threshold rules, e.g. working hours above 8."""
+    rules = context.section("thresholds")
+    if not rules:
+        return []
     
-    @staticmethod
-    def validate_rental_contract(contract_text, contract_sections):
-        """
-        Validate rental contract against Ejar regulations.
-        
-        Args:
-            contract_text (str): Full contract text
-            contract_sections (dict): Contract sections
-            
-        Returns:
-            list: Validation results
-        """
-        results = []
-        
-        # Check for required elements
-        required_elements = [
-            {
-                "name": "landlord_details",
-                "keywords": ["landlord", "lessor", "المؤجر", "صاحب العقار"],
-                "description": "Landlord details",
-                "article": "Ejar Regulations"
-            },
-            {
-                "name": "tenant_details",
-                "keywords": ["tenant", "lessee", "المستأجر", "المستفيد"],
-                "description": "Tenant details",
-                "article": "Ejar Regulations"
-            },
-            {
-                "name": "property_description",
-                "keywords": ["property description", "premises", "وصف العقار", "المأجور"],
-                "description": "Property description",
-                "article": "Ejar Regulations"
-            },
-            {
-                "name": "rent_amount",
-                "keywords": ["rent amount", "rental value", "قيمة الإيجار", "مبلغ الإيجار"],
-                "description": "Rent amount",
-                "article": "Ejar Regulations"
-            },
-            {
-                "name": "contract_duration",
-                "keywords": ["duration", "term", "مدة العقد", "فترة الإيجار"],
-                "description": "Contract duration",
-                "article": "Ejar Regulations"
-            },
-            {
-                "name": "payment_terms",
-                "keywords": ["payment terms", "شروط الدفع", "طريقة السداد"],
-                "description": "Payment terms",
-                "article": "Ejar Regulations"
-            }
-        ]
-        
-        for element in required_elements:
-            found = False
-            for keyword in element["keywords"]:
-                if keyword in contract_text.lower():
-                    found = True
-                    break
-            
-            if not found:
-                results.append({
-                    "type": "missing_element",
-                    "element": element["name"],
-                    "description": f"Missing required element: {element['description']}",
-                    "article": element["article"],
-                    "severity": "high"
-                })
-        
-        # Check for Ejar registration
-        if "ejar" not in contract_text.lower() and "إيجار" not in contract_text:
-            results.append({
-                "type": "missing_element",
-                "element": "ejar_registration",
-                "description": "No mention of Ejar registration which is mandatory for all rental contracts",
-                "article": "Ejar Regulations",
-                "severity": "high"
-            })
-        
-        # Check for security deposit
-        deposit_pattern = r'(?:security deposit|damage deposit|تأمين|ضمان).*?(\d+)%'
-        deposit_match = re.search(deposit_pattern, contract_text.lower())
-        
-        if deposit_match:
-            percentage = int(deposit_match.group(1))
-            if percentage > 10:
-                results.append({
-                    "type": "illegal_provision",
-                    "element": "security_deposit",
-                    "description": f"Security deposit ({percentage}%) exceeds the legal limit of 10% of annual rent",
-                    "article": "Ejar Regulations",
-                    "severity": "medium"
-                })
-        
-        # Check for automatic renewal terms
-        if "automatic renewal" in contract_text.lower() or "تجديد تلقائي" in contract_text.lower():
-            if "notice" not in contract_text.lower() and "إشعار" not in contract_text.lower():
-                results.append({
-                    "type": "incomplete_provision",
-                    "element": "automatic_renewal",
-                    "description": "Automatic renewal clause does not specify notice period for non-renewal",
-                    "article": "Ejar Regulations",
-                    "severity": "medium"
-                })
-        
-        return results
+    thresholds = context.rule_packs.compiled(
+        ("thresholds", context.contract_type),
+        lambda: ThresholdRules(rules, NLP_SETTINGS["quantities"]["anchor_window"])
+    )
+    
+    # Rules targeting a section type only count quantities inside those sections, if the contract has any
+    scopes = {
+        index: context.rule_packs.section_spans(
+            context.prepared_text, context.contract_sections, context.contract_type, rule.get("section_type")
+        )
+        for index, rule in enumerate(thresholds.rules)
+    }
+    
+    hits = context.rule_packs.keyword_hits(context.prepared_text)
+    return [
+        finding(
+            "violation",
+            rule["name"],
+            rule["description"].format(
+                quantities=", ".join(_original_text(context.prepared_text, start, end) for start, end in spans)
+            ),
+            rule["risk_level"],
+            reference=rule.get("reference"),
+            recommendation=rule.get("recommendation"),
+            key=rule["id"]
+        )
+        for rule, spans in thresholds.violations(context.prepared_text, hits, scopes)
+    ]
+
+@RULES.rule("ejar_registration", "rental")
+def check_ejar_registration(context):
+    """Rental contract with no mention of Ejar registration."""
+    if context.mentions("ejar"):
+        return []
+    return [finding(
+        "violation",
+        "Ejar registration",
+        "No mention of Ejar registration which is mandatory for all rental contracts",
+        "high",
+        reference="Ejar Regulations",
+        recommendation="Add a clause stating that the contract will be registered in the Ejar platform"
+    )]
+
+@RULES.rule("automatic_renewal", "rental")
+def check_automatic_renewal(context):
+    """Automatic renewal without a notice period for non-renewal."""
+    if context.mentions("automatic_renewal") and not context.mentions("renewal_notice"):
+        return [finding(
+            "risk",
+            "Automatic renewal terms",
+            "Automatic renewal clause does not specify notice period for non-renewal",
+            "medium",
+            reference="Ejar Regulations",
+            recommendation="Specify the notice period required for non-renewal"
+        )]
+    return []
+
+@RULES.rule("vat_disclosure", "sales")
+def check_vat_disclosure(context):
+    """Sales contract with no mention of VAT."""
+    if context.mentions("vat"):
+        return []
+    return [finding(
+        "violation",
+        "VAT disclosure",
+        "No mention of VAT which is mandatory for sales contracts",
+        "high",
+        reference="VAT Regulations",
+        recommendation="Add a clause stating the VAT amount or exemption status"
+    )]
+
+@RULES.rule("vat_registration_number", "sales")
+def check_vat_registration_number(context):
+    """Sales contract without a 15-digit VAT registration number."""
+    if context.search("vat_registration_number"):
+        return []
+    return [finding(
+        "missing_clause",
+        "vat_registration_number",
+        "No VAT registration number provided",
+        "medium",
+        reference="VAT Regulations",
+        recommendation="Add the seller's VAT registration number"
+    )]
+
+@RULES.rule("invoice_requirements", "sales")
+def check_invoice_requirements(context):
+    """Invoice clause missing elements required by the VAT regulations."""
+    if not context.mentions("invoice"):
+        return []
+    
+    missing_requirements = [
+        requirement["name"]
+        for requirement in context.rule_packs.unmatched(context.prepared_text, context.section("invoice_requirements"))
+    ]
+    if not missing_requirements:
+        return []
+    
+    return [finding(
+        "risk",
+        "Invoice requirements",
+        f"Invoice clause does not specify required elements: {', '.join(missing_requirements)}",
+        "medium",
+        reference="VAT Regulations",
+        recommendation="Complete the invoice clause with every element required by the VAT regulations"
+    )]
+
+@RULES.rule("commercial_registration", "partnership")
+def check_commercial_registration(context):
+    """Partnership contract with no mention of commercial registration."""
+    if context.mentions("commercial_registration"):
+        return []
+    return [finding(
+        "missing_clause",
+        "commercial_registration",
+        "No mention of commercial registration which is mandatory for partnerships",
+        "medium",
+        reference="Companies Law",
+        recommendation="Add the commercial registration of the partnership"
+    )]
+
+@RULES.rule("profit_loss_participation", "partnership")
+def check_profit_loss_participation(context):
+    """Partner excluded from profits or exempted from losses."""
+    if not context.search("partner_exclusion"):
+        return []
+    return [finding(
+        "violation",
+        "Profit and loss participation",
+        "A partner appears to be excluded from profits or exempted from losses",
+        "high",
+        reference="Companies Law",
+        recommendation="Ensure every partner shares in profits and losses"
+    )]
+
+@RULES.rule("commercial_concealment", "partnership")
+def check_commercial_concealment(context):
+    """Partner possibly acting on behalf of another person."""
+    if not context.mentions("on_behalf_of"):
+        return []
+    return [finding(
+        "risk",
+        "Commercial concealment",
+        "Contract suggests a partner may be acting on behalf of another person",
+        "high",
+        reference="Anti-Concealment Law",
+        recommendation="Confirm that all partners are genuine owners of their shares"
+    )]
+
+class ValidationRules:
+    """
+    Validation rules for different contract types based on Saudi laws.
+    """
     
     @staticmethod
-    def validate_sales_contract(contract_text, contract_sections):
+    def validate(contract_type, prepared_text, contract_sections, rule_packs=None):
         """
-        Validate sales contract against VAT regulations.
+        Run every rule of a contract type once.
         
         Args:
-            contract_text (str): Full contract text
-            contract_sections (dict): Contract sections
-            
+            contract_type (str): Type of contract
+            prepared_text (PreparedText): Full contract text
+            contract_sections (SectionTree): Contract sections
+            rule_packs (RulePacks, optional): Rule packs to apply; defaults
+                to the current ones
+                
         Returns:
-            list: Validation results
+            dict: Findings by finding ID, in rule order
         """
-        results = []
-        
-        # Check for required elements
-        required_elements = [
-            {
-                "name": "seller_details",
-                "keywords": ["seller", "vendor", "البائع", "المورد"],
-                "description": "Seller details",
-                "article": "VAT Regulations"
-            },
-            {
-                "name": "buyer_details",
-                "keywords": ["buyer", "purchaser", "المشتري", "المستهلك"],
-                "description": "Buyer details",
-                "article": "VAT Regulations"
-            },
-            {
-                "name": "goods_description",
-                "keywords": ["goods description", "product description", "وصف البضاعة", "وصف المنتج"],
-                "description": "Description of goods or services",
-                "article": "VAT Regulations"
-            },
-            {
-                "name": "price",
-                "keywords": ["price", "cost", "سعر", "تكلفة"],
-                "description": "Price",
-                "article": "VAT Regulations"
-            },
-            {
-                "name": "delivery",
-                "keywords": ["delivery", "shipping", "تسليم", "شحن"],
-                "description": "Delivery terms",
-                "article": "VAT Regulations"
-            },
-            {
-                "name": "payment_terms",
-                "keywords": ["payment terms", "شروط الدفع", "طريقة السداد"],
-                "description": "Payment terms",
-                "article": "VAT Regulations"
-            }
-        ]
-        
-        for element in required_elements:
-            found = False
-            for keyword in element["keywords"]:
-                if keyword in contract_text.lower():
-                    found = True
-                    break
-            
-            if not found:
-                results.append({
-                    "type": "missing_element",
-                    "element": element["name"],
-                    "description": f"Missing required element: {element['description']}",
-                    "article": element["article"],
-                    "severity": "high"
-                })
-        
-        # Check for VAT disclosure
-        if "vat" not in contract_text.lower() and "ضريبة القيمة المضافة" not in contract_text.lower() and "ضريبة" not in contract_text.lower():
-            results.append({
-                "type": "missing_element",
-                "element": "vat_disclosure",
-                "description": "No mention of VAT which is mandatory for sales contracts",
-                "article": "VAT Regulations",
-                "severity": "high"
-            })
-        
-        # Check for VAT registration number
-        vat_reg_pattern = r'(?:vat registration|tax registration|الرقم الضريبي|تسجيل ضريبي)\s*(?:number|no|رقم)?\s*:?\s*(\d{15})'
-        vat_reg_match = re.search(vat_reg_pattern, contract_text.lower())
-        
-        if not vat_reg_match:
-            results.append({
-                "type": "missing_element",
-                "element": "vat_registration_number",
-                "description": "No VAT registration number provided",
-                "article": "VAT Regulations",
-                "severity": "medium"
-            })
+        if contract_type not in CONTRACT_TYPES:
+            logger.warning(f"No specific validation rules for contract type: {contract_type}")
         
-        # Check for invoice requirements
-        if "invoice" in contract_text.lower() or "فاتورة" in contract_text.lower():
-            invoice_requirements = ["date", "number", "description", "price", "vat amount", "total"]
-            arabic_requirements = ["تاريخ", "رقم", "وصف", "سعر", "مبلغ الضريبة", "الإجمالي"]
-            
-            missing_requirements = []
-            
-            for i, req in enumerate(invoice_requirements):
-                if req not in contract_text.lower() and arabic_requirements[i] not in contract_text.lower():
-                    missing_requirements.append(req)
-            
-            if missing_requirements:
-                results.append({
-                    "type": "incomplete_provision",
-                    "element": "invoice_requirements",
-                    "description": f"Invoice clause does not specify required elements: {', '.join(missing_re
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+        context = RuleContext(contract_type, prepared_text, contract_sections, rule_packs or current_rule_packs())
+        return RULES.run(context)
@@ -4,8 +4,10 @@ Integration module for the Saudi AI Contracts system.
 
 import os
 import logging
-from src.validation_rules import ValidationRules
 from src.analyzer import ContractAnalyzer
+from src.normalization import PreparedText
+from src.rule_packs import current_rule_packs
+from src.config import NLP_SETTINGS
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -20,82 +22,34 @@ class ContractValidator:
         logger.info("Initializing ContractValidator")
         self.analyzer = ContractAnalyzer()
     
-    def validate(self, contract_data, contract_type):
+    def validate(self, contract_data, contract_type, prepared_text=None, rule_packs=None):
         """
         Validate a contract against Saudi legal requirements.
         
         Args:
             contract_data (dict): Parsed contract data
             contract_type (str): Type of contract
+            prepared_text (PreparedText, optional): Prepared contract text, e.g.
+                the one already scanned by contract type detection
+            rule_packs (RulePacks, optional): Rule packs to apply, e.g. the
+                snapshot used by contract type detection
             
         Returns:
             dict: Validation results
         """
         logger.info(f"Validating {contract_type} contract")
         
-        # Get contract text and sections
-        contract_text = contract_data["text"]
-        contract_sections = contract_data["sections"]
+        # Prepare the contract text once; every rule reads its normalized and casefolded views
+        if prepared_text is None:
+            prepared_text = PreparedText(contract_data["text"])
         
-        # Apply validation rules based on contract type
-        validation_results = []
+        # One snapshot of the rule packs for the whole document, even if they are reloaded meanwhile
+        rule_packs = rule_packs or current_rule_packs()
         
-        if contract_type == "employment":
-            validation_results = ValidationRules.validate_employment_contract(contract_text, contract_sections)
-        elif contract_type == "rental":
-            validation_results = ValidationRules.validate_rental_contract(contract_text, contract_sections)
-        elif contract_type == "sales":
-            validation_results = ValidationRules.validate_sales_contract(contract_text, contract_sections)
-        elif contract_type == "partnership":
-            validation_results = ValidationRules.validate_partnership_contract(contract_text, contract_sections)
-        else:
-            logger.warning(f"No specific validation rules for contract type: {contract_type}")
+        # Analyze the contract; every validation rule runs once, inside the analyzer
+        analysis_results = self.analyzer.analyze(contract_data, contract_type, prepared_text, rule_packs)
         
-        # Analyze the contract using the analyzer
-        analysis_results = self.analyzer.analyze(contract_data, contract_type)
-        
-        # Integrate validation results with analysis results
-        for result in validation_results:
-            if result["type"] == "missing_element":
-                analysis_results["missing_clauses"].append({
-                    "clause": result["element"],
-                    "description": result["description"],
-                    "risk_level": "high" if result["severity"] == "high" else "medium"
-                })
-            elif result["type"] == "illegal_provision":
-                analysis_results["violations"].append({
-                    "rule": result["element"],
-                    "description": result["description"],
-                    "risk_level": "high" if result["severity"] == "high" else "medium",
-                    "reference": result["article"]
-                })
-            elif result["type"] == "incomplete_provision" or result["type"] == "potential_violation":
-                analysis_results["risks"].append({
-                    "rule": result["element"],
-                    "description": result["description"],
-                    "risk_level": "high" if result["severity"] == "high" else "medium",
-                    "reference": result["article"]
-                })
-        
-        # Generate recommendations based on validation results
-        for result in validation_results:
-            if result["type"] == "missing_element":
-                analysis_results["recommendations"].append(f"Add {result['element']} to the contract")
-            elif result["type"] == "illegal_provision":
-                analysis_results["recommendations"].append(f"Modify {result['element']} to comply with {result['article']}")
-            elif result["type"] == "incomplete_provision":
-                analysis_results["recommendations"].append(f"Complete {result['element']} by adding required information")
-            elif result["type"] == "potential_violation":
-                analysis_results["recommendations"].append(f"Review {result['element']} for compliance with {result['article']}")
-        
-        # Recalculate compliance score
-        total_issues = (
-            len(analysis_results["violations"]) + 
-            len(analysis_results["missing_clauses"]) + 
-            len(analysis_results["risks"])
-        )
-        
-        # Base score is 100, deduct points for issues
+        # Recalculate compliance score; base score is 100, deduct points for issues
         base_score = 100
         deduction_per_violation = 10
         deduction_per_missing = 5
@@ -111,3 +65,52 @@ class ContractValidator:
         analysis_results["compliance_score"] = max(0, min(100, compliance_score))
         
         return analysis_results
+    
+    def validate_ranked(self, contract_data, ranking, prepared_text=None, rule_packs=None, top_types=1):
+        """
+        Validate a contract as the type it most likely is, from a ranking of
+        every type scored by one keyword scan.
+        
+        Every candidate type is validated against the same prepared text and
+        rule packs, so the keyword hits, casefolded text and section spans are
+        computed once for all of them.
+        
+        Args:
+            contract_data (dict): Parsed contract data
+            ranking (list): (contract_type, score) pairs, best first, as
+                returned by ContractParser.rank_contract_types
+            prepared_text (PreparedText, optional): Prepared contract text
+                the ranking was scored on
+            rule_packs (RulePacks, optional): Rule packs the ranking was scored with
+            top_types (int): Number of types to validate if the document is
+                ambiguous between several types
+            
+        Returns:
+            dict: Validation results of the best type, with "type_scores" and,
+            for an ambiguous document, "alternatives" holding the results of
+            the runner-up types
+        """
+        if prepared_text is None:
+            prepared_text = PreparedText(contract_data["text"])
+        rule_packs = rule_packs or current_rule_packs()
+        
+        # Documents without evidence for any type default to the first type
+        contract_type, best_score = ranking[0]
+        analysis_results = self.validate(contract_data, contract_type, prepared_text, rule_packs)
+        analysis_results["type_scores"] = dict(ranking)
+        
+        # Runner-up types scoring close to the best one are validated too
+        ambiguity_ratio = NLP_SETTINGS["type_detection"]["ambiguity_ratio"]
+        alternatives = []
+        for alternative_type, score in ranking[1:top_types]:
+            if score == 0 or score < ambiguity_ratio * best_score:
+                break
+            logger.info(f"Contract is ambiguous, also validating as {alternative_type}")
+            alternatives.append({
+                "contract_type": alternative_type,
+                "analysis_results": self.validate(contract_data, alternative_type, prepared_text, rule_packs)
+            })
+        if alternatives:
+            analysis_results["alternatives"] = alternatives
+        
+        return analysis_results